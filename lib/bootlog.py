@@ -0,0 +1,54 @@
+# Boot timing for the Onkyo keypad.
+#
+# Nothing works until main.py has imported its modules and set up its peripherals, and a
+# key pressed before the keypad is scanning is lost. BootLog stamps monotonic_ns after
+# each step of startup so report() can show what each one cost, how long it took to get to
+# a usable keypad, and whether that's within budget.
+#
+# monotonic_ns counts from power up, so on a cold start the first stamp also says how long
+# CircuitPython took before it got to main.py (USB, the filesystem, boot.py). After a soft
+# reload it only counts up from the last one, so main.py says which it was.
+#
+# Import this first and make the BootLog before anything else, so its clock starts as close
+# to the top of main.py as possible.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import time
+
+
+class BootLog:
+    def __init__(self):
+        self.start_ns = time.monotonic_ns()
+        self.names = []
+        self.times = []
+
+    # Stamp the end of a startup step.
+    def mark(self, name):
+        self.names.append(name)
+        self.times.append(time.monotonic_ns())
+
+    # Time from the top of main.py to the last step, in ms.
+    @property
+    def total_ms(self):
+        return (self.times[-1] - self.start_ns) // 1000000 if self.times else 0
+
+    # Print each step's time and the running total, and the total against budget_ms. cold
+    # says whether this was a power up, when the time before main.py is worth printing.
+    def report(self, budget_ms, cold=False, out=print):
+        if cold:
+            out("boot: {} ms before main.py".format(self.start_ns // 1000000))
+        last = self.start_ns
+        for i in range(len(self.names)):
+            t = self.times[i]
+            out("boot: {:<14}{:>6} ms{:>6} ms".format(
+                self.names[i], (t - last) // 1000000, (t - self.start_ns) // 1000000))
+            last = t
+        total = self.total_ms
+        if total > budget_ms:
+            out("boot: {} ms, over the {} ms budget by {} ms".format(
+                total, budget_ms, total - budget_ms))
+        else:
+            out("boot: {} ms, within the {} ms budget".format(total, budget_ms))
@@ -0,0 +1,67 @@
+# Garbage collection on our schedule instead of the allocator's.
+#
+# Left to itself, CircuitPython collects whenever an allocation finds the heap full, and on
+# the M4 that's a pause of a few ms at whatever moment it happens: halfway through a fade,
+# or right after a key press. The collector runs gc.collect() itself when the keypad is
+# idle, long before the heap fills, so the pauses land where nobody can see them. If memory
+# runs low while things are busy it collects anyway, since that beats running out.
+#
+# Automatic collection stays on. With it off a full heap is a MemoryError, not a collection,
+# and nothing here can promise service() gets called in time on every path (light sleep, a
+# long fade). It's only the backstop: as long as service() gets its turn, the heap never
+# gets full enough for it to run.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import gc
+import time
+
+
+class Collector:
+    def __init__(self, low_water=16384, interval_ms=10000, low_gap_ms=2000):
+        self.low_water = low_water
+        self.interval_ns = interval_ms * 1000000
+        self.low_gap_ns = low_gap_ms * 1000000
+        self.last_ns = 0
+        self.collections = 0    # collections we ran while idle
+        self.forced = 0         # collections we ran while busy because memory was low
+        self.total_ns = 0
+        self.worst_ns = 0
+        self.free = gc.mem_free()
+
+    # Call every so often. Collects if the keypad is idle and it's been interval_ms since the
+    # last collection, or if free memory is below low_water and it's been low_gap_ms. The gap
+    # matters when what's left is mostly live data: collecting again wouldn't free much, and
+    # doing it on every call in the middle of a fade would be the jitter this is here to
+    # avoid. Returns True if it collected.
+    def service(self, now_ns, idle):
+        free = self.free = gc.mem_free()
+        if free < self.low_water and now_ns - self.last_ns >= self.low_gap_ns:
+            if not idle:
+                self.forced += 1
+            self.collect(now_ns)
+            return True
+        if idle and now_ns - self.last_ns >= self.interval_ns:
+            self.collect(now_ns)
+            return True
+        return False
+
+    def collect(self, now_ns):
+        start = time.monotonic_ns()
+        gc.collect()
+        pause = time.monotonic_ns() - start
+        self.collections += 1
+        self.total_ns += pause
+        if pause > self.worst_ns:
+            self.worst_ns = pause
+        self.last_ns = now_ns
+        self.free = gc.mem_free()
+
+    def report(self, out=print):
+        count = self.collections
+        out("gc: {} collections ({} while busy), pause avg {} us max {} us, "
+            "{} bytes free".format(count, self.forced,
+                                   self.total_ns // count // 1000 if count else 0,
+                                   self.worst_ns // 1000, self.free))
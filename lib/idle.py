@@ -0,0 +1,72 @@
+# Light sleep for the Onkyo keypad while nothing's going on.
+#
+# With the receiver off and nobody near the keypad, the tasks in main.py still wake up
+# hundreds of times a second to poll the keypad, the UART, the prox sensor and the dimmer
+# button, only to find nothing there. IdleSleep puts the M4 into CircuitPython's light sleep
+# instead, with pin alarms on the prox and dimmer inputs and a time alarm every wake_ms.
+# The pin alarms wake it the moment either input goes active. The keypad keeps scanning in
+# the background and the UART keeps receiving while asleep, but neither one can wake the
+# board, so the time alarm is how those get noticed: the caller checks them at each wake and
+# goes back to sleep if nothing's there. wake_ms has to be short enough that the UART's
+# receive buffer can't fill up in between (64 bytes is about 66 ms at 9600 baud).
+#
+# Pins used for alarms can't be in use, so deinit their DigitalInOuts before sleep() and
+# make new ones after it returns. report() prints how much of the time was spent asleep, to
+# go with an idle current reading from a USB power meter.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import time
+import alarm
+
+
+class IdleSleep:
+    # pins is a tuple of (pin, value, pull) for the pin alarms: wake when pin goes to value,
+    # with pull=True to pull it the other way while asleep.
+    def __init__(self, pins, wake_ms=50):
+        self.pins = pins
+        self.wake_s = wake_ms / 1000
+        self.since_ns = time.monotonic_ns()
+        self.asleep_ns = 0      # total time in light sleep
+        self.sleeps = 0         # times we went to sleep (each one can be many wakes)
+        self.wakes = 0          # time alarm wakes
+        self.pin_wakes = 0      # wakes from a pin alarm
+
+    # Light sleep until a pin alarm goes off, or until waiting() says the keypad or the UART
+    # has something for us, which gets checked every wake_ms. Returns True if it was a pin.
+    def sleep(self, waiting):
+        self.sleeps += 1
+        # Pin alarms check that their pin is free when they're made, so they're made here.
+        pin_alarms = tuple(alarm.pin.PinAlarm(pin, value=value, pull=pull)
+                           for pin, value, pull in self.pins)
+        while not self._nap(pin_alarms):
+            if waiting():
+                return False
+        return True
+
+    # One light sleep, until a pin alarm or the time alarm. Returns True if it was a pin.
+    def _nap(self, pin_alarms):
+        start = time.monotonic_ns()
+        timer = alarm.time.TimeAlarm(monotonic_time=time.monotonic() + self.wake_s)
+        woke = alarm.light_sleep_until_alarms(timer, *pin_alarms)
+        self.asleep_ns += time.monotonic_ns() - start
+        if woke is timer or woke is None:
+            self.wakes += 1
+            return False
+        self.pin_wakes += 1
+        return True
+
+    def reset(self):
+        self.since_ns = time.monotonic_ns()
+        self.asleep_ns = 0
+        self.sleeps = 0
+        self.wakes = 0
+        self.pin_wakes = 0
+
+    def report(self, out=print):
+        total = time.monotonic_ns() - self.since_ns
+        out("idle: asleep {}% of {} s, {} sleeps, {} timer wakes, {} pin wakes".format(
+            self.asleep_ns * 100 // total if total else 0, total // 1000000000, self.sleeps,
+            self.wakes, self.pin_wakes))
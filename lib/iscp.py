@@ -0,0 +1,254 @@
+# ISCP (Integra Serial Control Protocol) helpers for the Onkyo keypad.
+#
+# Messages from the receiver look like "!1SLI10<EOF>", where "!" is the start character,
+# "1" is the unit type (receiver), "SLI" is the command and "10" is the parameter. The
+# receiver terminates its messages with an EOF (0x1A), sometimes followed by CR/LF, and
+# commands sent to the receiver are terminated with a CR.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+START = 0x21   # '!'
+EOF = 0x1A
+CR = 0x0D
+LF = 0x0A
+
+# Shortest useful frame is the unit type plus a 3-letter command, e.g. "1PWR".
+MIN_FRAME = 4
+
+
+# 3-letter command code packed into an int, so codes can be compared and looked up without
+# making a bytes object. code_key(b"1SLI10", 1) == code_key(b"SLI").
+def code_key(data, i=0):
+    return (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+
+
+# Parameter at data[i:] as a number, e.g. 0x2B for b"1SLI2B" (i=4) or 8750 for b"1TUN08750"
+# with base=10. Returns -1 if the parameter isn't a number, like "QSTN" or "N/A".
+def param_int(data, i=4, base=16):
+    n = len(data)
+    if i >= n:
+        return -1
+    value = 0
+    while i < n:
+        c = data[i] | 0x20   # lower case
+        if 0x30 <= c <= 0x39:
+            digit = c - 0x30
+        elif 0x61 <= c <= 0x66:
+            digit = c - 0x57
+        else:
+            return -1
+        if digit >= base:
+            return -1
+        value = value * base + digit
+        i += 1
+    return value
+
+
+# Incremental ISCP frame parser.
+#
+# Bytes are fed in as they come off the UART and each frame is handed to the callback the
+# moment its terminator arrives, so a burst of status messages gets processed message by
+# message instead of waiting for the whole burst. The frame is collected in a fixed-size
+# bytearray, so nothing is allocated per byte and memory use stays bounded even if a
+# terminator gets lost. Garbage and overlong frames are dropped and the parser resyncs on
+# the next "!".
+#
+# The callback gets a memoryview of the frame without the "!" and the terminator, e.g.
+# b"1SLI10". The view is only valid until the callback returns. Slicing a memoryview makes a
+# new object, so there's one ready-made view for every frame length instead, and one of the
+# parameter part of the frame (b"10") for the Dispatcher below.
+class FrameParser:
+    def __init__(self, size=64):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.views = tuple(self.view[:n] for n in range(size + 1))
+        self.params = tuple(self.view[MIN_FRAME:max(n, MIN_FRAME)] for n in range(size + 1))
+        self.length = -1   # -1 means we're hunting for the next start character
+        self.dropped = 0   # frames thrown away because they were too short or too long
+
+    def reset(self):
+        self.length = -1
+
+    # Feed count bytes from data (count defaults to all of it) and call on_frame(frame)
+    # for every complete frame.
+    def feed(self, data, count=-1, on_frame=None):
+        if count < 0:
+            count = len(data)
+        buffer = self.buffer
+        size = len(buffer)
+        length = self.length
+        for i in range(count):
+            b = data[i]
+            if b == START:
+                # A start character always begins a new frame. If we were in the middle
+                # of one, it was missing its terminator, so drop it and resync here.
+                if length > 0:
+                    self.dropped += 1
+                length = 0
+            elif length < 0:
+                # Garbage between frames.
+                pass
+            elif b == EOF or b == CR or b == LF:
+                if length >= MIN_FRAME:
+                    if on_frame is not None:
+                        on_frame(self.views[length])
+                elif length > 0:
+                    self.dropped += 1
+                length = -1
+            elif length < size:
+                buffer[length] = b
+                length += 1
+            else:
+                # Frame is longer than anything the receiver sends. Drop it and wait for
+                # the next start character.
+                self.dropped += 1
+                length = -1
+        self.length = length
+
+
+# Hands each status message to the handlers subscribed to its 3-letter code.
+#
+# One dict lookup on the code finds everything that wants a message, so adding a feature
+# that watches, say, MVL doesn't add a comparison to every other message, and messages
+# nobody wants are dropped after that one lookup. Handlers are called in the order they
+# subscribed, as handler(params, now_ns), where params is the parameter part of the frame,
+# e.g. b"10" for b"1SLI10" (see param_int()). For a frame straight from the parser it's one
+# of the parser's ready-made views, only valid until the handler returns, so dispatching
+# allocates nothing. A frame from anywhere else (a replay, a test) is sliced instead, which
+# costs an allocation but gets that frame's own parameters.
+#
+# Use dispatch() as the parser's callback, or call it from one with the frame.
+class Dispatcher:
+    def __init__(self, parser):
+        self.views = parser.views
+        self.params = parser.params
+        self.handlers = {}
+        self.dropped = 0   # messages no handler wanted
+
+    # Call handler(params, now_ns) with every message with the code, as code_key(b"SLI").
+    def subscribe(self, code, handler):
+        self.handlers[code] = self.handlers.get(code, ()) + (handler,)
+
+    def dispatch(self, frame, now_ns=0):
+        handlers = self.handlers.get(code_key(frame, 1))
+        if handlers is None:
+            self.dropped += 1
+            return
+        n = len(frame)
+        params = self.params[n] if frame is self.views[n] else frame[MIN_FRAME:]
+        for handler in handlers:
+            handler(params, now_ns)
+
+
+# Transmit queue for commands going to the receiver.
+#
+# Mashing buttons used to send every input select straight to the UART, and the receiver
+# would work through them one at a time, visibly cycling through the inputs. Commands now go
+# through this queue instead. A command replaces any pending command with the same 3-letter
+# code, so only the last input select goes out, and commands are released one at a time:
+# the next one waits until the receiver echoes the previous command back (or ack_timeout_ms
+# goes by) and at least gap_ms has passed since the last write.
+#
+# link is anything with a write() method: the UART or one of the links in transport.py.
+# Frames are complete encoded commands, e.g. b"!1SLI12\r". put() never blocks. Call
+# service() from a task to do the writing and acknowledge() with each status message.
+class TxQueue:
+    def __init__(self, link, size=8, gap_ms=50, ack_timeout_ms=500, on_ready=None):
+        self.link = link
+        self.size = size
+        self.gap_ns = gap_ms * 1000000
+        self.ack_timeout_ns = ack_timeout_ms * 1000000
+        self.on_ready = on_ready
+        self.pending = []
+        self.urgent = 0        # number of urgent commands at the front of pending
+        self.awaiting = None   # last command sent, until the receiver echoes it back
+        self.sent_ns = -self.gap_ns
+        self.coalesced = 0
+        self.dropped = 0
+        self.timeouts = 0
+
+    def __len__(self):
+        return len(self.pending)
+
+    # Queue a command. Urgent commands (key presses) go ahead of anything that isn't, like
+    # the status queries, but stay in order among themselves.
+    def put(self, frame, urgent=False):
+        pending = self.pending
+        for i in range(len(pending)):
+            if _same_code(pending[i], 2, frame, 2):
+                self.coalesced += 1
+                # The echo of a pending command answers a query for the same thing.
+                if _is_query(frame) and not _is_query(pending[i]):
+                    return
+                del pending[i]
+                if i < self.urgent:
+                    self.urgent -= 1
+                break
+        else:
+            if len(pending) >= self.size:
+                self.dropped += 1
+                return
+        if urgent:
+            pending.insert(self.urgent, frame)
+            self.urgent += 1
+        else:
+            pending.append(frame)
+        if self.on_ready is not None:
+            self.on_ready()
+
+    # Call with every status message from the receiver (e.g. b"1SLI12").
+    def acknowledge(self, frame):
+        awaiting = self.awaiting
+        if awaiting is not None and _same_code(frame, 1, awaiting, 2):
+            self.awaiting = None
+            if self.pending and self.on_ready is not None:
+                self.on_ready()
+
+    # Write the next command if the receiver is ready for it. Returns 0 when the queue is
+    # empty, otherwise the number of ns until the next command can go out at the latest (an
+    # acknowledgement can release it sooner).
+    def service(self, now_ns):
+        wait_ns = self._expire(now_ns)
+        if not self.pending:
+            return 0
+        if wait_ns:
+            return wait_ns
+        ready_ns = self.sent_ns + self.gap_ns
+        if now_ns < ready_ns:
+            return ready_ns - now_ns
+        frame = self.pending.pop(0)
+        if self.urgent:
+            self.urgent -= 1
+        self.link.write(frame)
+        self.awaiting = frame
+        self.sent_ns = now_ns
+        return self.ack_timeout_ns if self.pending else 0
+
+    # True while the last command sent can still be acknowledged. A command the receiver
+    # never answers stops counting after ack_timeout, even with nothing else to send.
+    def awaiting_ack(self, now_ns):
+        return self._expire(now_ns) > 0
+
+    # Give up on the last command if it's gone unacknowledged for ack_timeout. Returns the
+    # ns left to wait for it, or 0.
+    def _expire(self, now_ns):
+        if self.awaiting is None:
+            return 0
+        timeout_ns = self.sent_ns + self.ack_timeout_ns
+        if now_ns < timeout_ns:
+            return timeout_ns - now_ns
+        self.awaiting = None
+        self.timeouts += 1
+        return 0
+
+
+# True if frame is a query like b"!1SLIQSTN\r".
+def _is_query(frame):
+    return len(frame) > 6 and frame[5] == 0x51 and frame[6] == 0x53   # "QS"
+
+
+# True if the 3-letter command code at a[i:] matches the one at b[j:].
+def _same_code(a, i, b, j):
+    return a[i] == b[j] and a[i + 1] == b[j + 1] and a[i + 2] == b[j + 2]
@@ -0,0 +1,166 @@
+# Generated by tools/gen_iscp_codec.py from ISCP_AVR_134.xlsx and ISCP_AVR_118.xls.
+# Don't edit by hand.
+#
+# Every ISCP command in the spreadsheets, packed into a handful of bytes objects instead of
+# thousands of strings. Look up a code with find(), describe a status message with
+# decode() and build a command with encode(). Code and literal parameter lookups are
+# binary searches straight over the bytes and don't allocate.
+#
+#   >>> iscp_codec.decode(b"1PWR01")
+#   ('System Power', 'sets System On')
+#   >>> iscp_codec.encode(b"SLI", b"2B")
+#   b'!1SLI2B\r'
+
+COUNT = 212
+
+# Command codes, 3 bytes each, sorted
+CODES = b'AALAATACEADQADVADYAEQAMTAPDARCASCASTATIATMAVSBL3CCDCCMCCRCDTCDVCECCEQCMDCMTCPTCT1CT2CTICTLCTSCTWDGFDIFDIMDLCDMNDMSDVLECOFLDFWVFXPHAOHASHATHBLHBTHCNHDOHDSHOIHPRHSTHTIHTSIALIATIFAIFVILSIMDIRNISFISTITIITMITRITVIVOLDMLFELMDLMZLPSLTNLTZMCCMCMMEMMFBMOTMT3MT4MVLNAFNALNATNBTNCPNDSNJANKYNLANLSNLTNMDNMSNP3NP4NPBNPRNPUNPZNRFNRINSBNSDNSTNSVNT3NT4NTCNTINTMNTRNTSNTZOSDPAMPCPPCTPMBPNRPOPPQLPR3PR4PRMPRSPRZPTSPW3PW4PWRRASRAZRDSRESRSTSATSCDSCHSCNSCTSL3SL4SLASLCSLISLKSLPSLRSLZSPASPBSPDSPISPLSPRSTISTWSW2SWLTCLTCTTFHTFRTFWTGATGBTGCTN3TPSTSBTSRTSWTU3TU4TUNTUZUDDUDSUHAUHBUHCUHDUHPUHSUHTUPDUPMUPRUPSUTNVL3VL4VOSVPMVWMXATXCHXCNXCTXTIZBLZMTZPAZPBZPWZTNZVL'
+
+# Command names and their offsets (16-bit little endian, COUNT + 1 of them)
+NAMES = b'Airplay Album Name Info (Airplay Model Only)Airplay Artist Name Info (Airplay Model Only)All Channel EQAudyssey Dynamic EQAudyssey Dynamic VolumeAudyssey 2EQ/MultEQ/MultEQ XTAccuEQAudio MutingAuto Power DownAudio Return ChannelAudio ScalarAirplay Play Status (Airplay Model Only)Airplay Title Name (Airplay Model Only)Airplay Time Info (Airplay Model Only)A/V SyncZone3 BalanceCD Player OperationHDMI CEC Control MonitorCD-R Recorder OperationDAT Recorder OperationDVD Player OperationHDMI CECGraphics Equalizer OperationMD Recorder OperationAudio Muting by ChannelUniversal PORT OperationTAPE1(A) OperationTAPE2(B) OperationCenter Image for Neo:6 MusicCenter (temporary) LevelCener Spread for Dolby SurroundCenter Width for PLII MusicDigital FilterDisplay InformationDimmer LevelDialog ControlInput Channel (Multiplex) / Dual MonoDimension for PLII MusicDolby Volumefor Smart GridFL Display InfomationFirmware VersionPCM Fixed Mode / Fixed PCM ModeHDMI Audio Out (Main)HDMI Audio Out (Sub)HD Radio Artist Name Info (HD Radio Model Only)HD Radio Blend Mode (HD Radio Model Only)Hi-BitHD Radio Channel Name Info (HD Radio Model Only)HDMI Output SelectorHD Radio Detail Info (HD Radio Model Only)HDMI Out InformationHD Radio Channel Program (HD Radio Model Only)HDMI Standby ThroughHD Radio Title Info (HD Radio Model Only)HD Radio Tuner Status (HD Radio Model Only)iPod Album Name Info (Universal Port Dock Only)iPod Artist Name Info (Universal Port Dock Only)Audio InfomationVideo InfomationiPod List Info (Universal Port Dock Extend Mode Only)iPod Mode Change (Universal Port Dock Only)Input Selector Rename / Input Function RenameISF ModeiPod Play Status (Universal Port Dock Only)iPod Title Name (Universal Port Dock Only)iPod Time Info (Universal Port Dock Only)iPod Track Info (Universal Port Dock Only)IntelliVolume / Input Level AbsorberiPod Video Out (Universal Port Dock Only)Loudness ManagementLFE Level / LFE Mute LevelListening ModeListening ModeLip Sync / Auto DelayLate NightLate NightMCACC CalibrationMCACC MEMORYMemory SetupFullband MCACC CalibrationMusic Optimizer / Sound RetrieverZone3 MutingZone4 MutingMaster VolumeNET/USB Add Favorite List in List ViewNET/USB Album Name InfoNET/USB Artist Name InfoBluetooth(Internal) OperationNET Custom Popup Message (for Network Control Only)NET Connection/USB Device StatusNET/USB Jacket Art (When Jacket Art is available and OutputNET Keyboard(for Network Control Only)NET/USB List Info(All item, need processing XML data, forNET/USB List InfoNET/USB List Title Info(for Network Control Only)iPod Mode Change (with USB Connection Only)NET/USB Menu StatusInternet Radio Preset (Network Model Only)Internet Radio Preset (Network Model Only)NET/USB Playback view ButtonInternet Radio PresetNET Popup Message(for Network Control Only)Internet Radio Preset (Network Model Only)NET/USB Remove Favorite ListReceiver Information (for Network Control Only)Network Standby Settings (for Network Control Only andNET/USB Music Server(DLNA) Search ListNET/USB Play StatusNET Service(for Network Control Only)Net-Tune/Network Operation(Network Model Only)Net-Tune/Network Operation(Network Model Only)Net-Tune/Network Operation(Net-Tune Model Only)NET/USB Title NameNET/USB Time InfoNET/USB Track InfoNET/USB Time SeekNet-Tune/Network Operation(Network Model Only)Setup OperationPre Amp Mode / AMP ModePhase Control PlusPhase ControlPhase Matching BassPanorama for PLII MusicPopup MessagePQLSPresetPresetPreset Memory (Include Tuner Pack Model Only)Preset (Include Tuner Pack Model Only)PresetPTY Scan (RDS Model Only)Zone3 PowerZone4 PowerSystem PowerRe-EQ/Academy FilterRe-EQ/Academy FilterRDS Information (RDS Model Only)Monitor Out ResolutionResetSIRIUS Artist Name Info (SIRIUS Model Only)Screen Centered Dialog / Dialog EnahncementSIRIUS Channel Number (SIRIUS Model Only)SIRIUS Channel Name Info (SIRIUS Model Only)SIRIUS Category (SIRIUS Model Only)ZONE3 SelectorZONE4 SelectorAudio SelectorSpeaker Level CalibrationInput SelectorSIRIUS Parental Lock (SIRIUS Model Only)Sleep SetRECOUT SelectorZONE2 SelectorSpeaker A/BSpeaker A/BSpeaker DistanceSpeaker InformationSpeaker LayoutSuper ResolutionSIRIUS Title Info (SIRIUS Model Only)EQ for Standing Wave / Standing WaveSubwoofer 2 (temporary) LevelSubwoofer (temporary) LevelTemporary Channel LevelTone(Center)Tone(Front High)Tone(Front)Tone(Front Wide)12V Trigger A12V Trigger B12V Trigger CZone3 ToneTP Scan (RDS Model Only)Tone(Surround Back)Tone(Surround)Tone(Subwoofer)TuningTuningTuning (Include Tuner Pack Model Only)TuningDAB Display Info (Universal Port Dock Only)DAB Sation Name (Universal Port Dock Only)HD Radio Artist Name Info (Universal Port Dock Only)HD Radio Blend Mode (Universal Port Dock Only)HD Radio Channel Name Info (Universal Port Dock Only)HD Radio Detail Info (Universal Port Dock Only)HD Radio Channel Program (Universal Port Dock Only)HD Radio Tuner Status (Universal Port Dock Only)HD Radio Title Info (Universal Port Dock Only)UpdatePreset Memory (Universal Port Dock Only)Preset (Universal Port Dock Only)UpsamplingTuning (Universal Port Dock Only)Zone3 VolumeZone4 VolumeVideo Output Selector (Japanese Model Only)Video Picture ModeVideo Wide ModeXM Artist Name Info (XM Model Only)XM Channel Number (XM Model Only)XM Channel Name Info (XM Model Only)XM Category (XM Model Only)XM Title Info (XM Model Only)Zone2 BalanceZone2 MutingZone 2 A/BZone 2 A/BZone2 PowerZone2 ToneZone2 Volume'
+NAME_AT = b'\x00\x00,\x00Y\x00g\x00z\x00\x91\x00\xae\x00\xb4\x00\xc0\x00\xcf\x00\xe3\x00\xef\x00\x17\x01>\x01d\x01l\x01y\x01\x8c\x01\xa4\x01\xbb\x01\xd1\x01\xe5\x01\xed\x01\t\x02\x1e\x025\x02M\x02_\x02q\x02\x8d\x02\xa5\x02\xc4\x02\xdf\x02\xed\x02\x00\x03\x0c\x03\x1a\x03?\x03W\x03c\x03q\x03\x86\x03\x96\x03\xb5\x03\xca\x03\xde\x03\r\x046\x04<\x04l\x04\x80\x04\xaa\x04\xbe\x04\xec\x04\x00\x05)\x05T\x05\x83\x05\xb3\x05\xc3\x05\xd3\x05\x08\x063\x06`\x06h\x06\x93\x06\xbd\x06\xe6\x06\x10\x074\x07]\x07p\x07\x8a\x07\x98\x07\xa6\x07\xbb\x07\xc5\x07\xcf\x07\xe0\x07\xec\x07\xf8\x07\x12\x083\x08?\x08K\x08X\x08~\x08\x95\x08\xad\x08\xca\x08\xfd\x08\x1d\tX\t~\t\xb7\t\xc8\t\xf9\t$\n7\na\n\x8b\n\xa7\n\xbc\n\xe7\n\x11\x0b-\x0b\\\x0b\x92\x0b\xb8\x0b\xcb\x0b\xf0\x0b\x1e\x0cL\x0c{\x0c\x8d\x0c\x9e\x0c\xb0\x0c\xc1\x0c\xef\x0c\xfe\x0c\x15\r\'\r4\rG\r^\rk\ro\ru\r{\r\xa8\r\xce\r\xd4\r\xed\r\xf8\r\x03\x0e\x0f\x0e#\x0e7\x0eW\x0em\x0er\x0e\x9d\x0e\xc8\x0e\xf1\x0e\x1d\x0f@\x0fN\x0f\\\x0fj\x0f\x83\x0f\x91\x0f\xb9\x0f\xc2\x0f\xd1\x0f\xdf\x0f\xea\x0f\xf5\x0f\x05\x10\x18\x10&\x106\x10[\x10\x7f\x10\x9c\x10\xb7\x10\xce\x10\xda\x10\xea\x10\xf5\x10\x05\x11\x12\x11\x1f\x11,\x116\x11N\x11a\x11o\x11~\x11\x84\x11\x8a\x11\xb0\x11\xb6\x11\xe1\x11\x0b\x12?\x12m\x12\xa2\x12\xd1\x12\x04\x134\x13b\x13h\x13\x90\x13\xb1\x13\xbb\x13\xdc\x13\xe8\x13\xf4\x13\x1f\x141\x14@\x14c\x14\x84\x14\xa8\x14\xc3\x14\xe0\x14\xed\x14\xf9\x14\x03\x15\r\x15\x18\x15"\x15.\x15'
+
+# Parameter entries: kind (b'L' literal, b'R' range, b'S' signed
+# range, b'P' pattern), the parameter, a zero byte and the description. Command i's
+# entries run from FIRST[i] to FIRST[i + 1] (16-bit), with its LITERALS[i] literal
+# parameters first, sorted.
+ENTRIES = b'LQSTN\x00gets iPod Album NameP"nnnnnnn"\x00NET/USB Album Name (variable-length, 64 ASCII letters max)LQSTN\x00gets iPod Artist NameP"nnnnnnnnnn"\x00NET/USB Artist Name (variable-length, 64 ASCII letters max)LQSTN\x00gets The Phase ControlPaaabbbcccdddeeefffggghhhiii\x00sets All Channel EQL00\x00sets Audyssey Dynamic EQ OffL01\x00sets Audyssey Dynamic EQ OnLQSTN\x00gets The Audyssey Dynamic EQ StateLUP\x00sets Audyssey Dynamic EQ State Wrap-Around UpL00\x00sets Audyssey Dynamic Volume OffL01\x00sets Audyssey Dynamic Volume LightL02\x00sets Audyssey Dynamic Volume MediumL03\x00sets Audyssey Dynamic Volume HeavyLQSTN\x00gets The Audyssey Dynamic Volume StateLUP\x00sets Audyssey Dynamic Volume State Wrap-Around UpL00\x00sets Audyssey 2EQ/MultEQ/MultEQ XT OffL01\x00sets Audyssey 2EQ/MultEQ/MultEQ XT On/MovieL02\x00sets Audyssey 2EQ/MultEQ/MultEQ XT MusicLQSTN\x00gets The Audyssey 2EQ/MultEQ/MultEQ XT StateLUP\x00sets Audyssey 2EQ/MultEQ/MultEQ XT State Wrap-Around UpL00\x00sets AccuEQ OffL01\x00sets AccuEQ On On(All Ch)L02\x00sets AccuEQ On(ex. Front L/R)LQSTN\x00gets The AccuEQ StateLUP\x00sets AccuEQ State Wrap-Around UpL00\x00sets Audio Muting OffL01\x00sets Audio Muting OnLQSTN\x00gets the Audio Muting StateLTG\x00sets Audio Muting Wrap-AroundL00\x00sets Auto Power Down OffL01\x00sets Auto Power Down OnLQSTN\x00gets The Auto Power Down StateLUP\x00sets Auto Power Down Wrap-AroundL00\x00sets Audio Return Channel OffL01\x00sets Audio Return Channel AutoLQSTN\x00gets The Audio Return Channel StateLUP\x00sets Audio Return Channel Wrap-AroundL00\x00sets Audio Scalar AutoL01\x00sets Audio Scalar ManualLQSTN\x00gets The Audio Scalar StateLUP\x00sets Audio Scalar Wrap-AroundLQSTN\x00gets the Net/USB StatusP"prs"\x00NET/USB Play Status (3 letters)LQSTN\x00gets HD Radio TitleP"nnnnnnnnnn"\x00NET/USB Title Name (variable-length, 64 ASCII letters max)LQSTN\x00gets iPod Time InfoP"mm:ss/mm:ss"\x00NET/USB Time Info (Elapsed time/Track Time Max 99:59)LDOWN\x00sets A/V Sync is decreased (step is depend on model)LQSTN\x00gets A/V Sync ValueLUP\x00sets A/V Sync is increased (step is depend on model)P"snnn"\x00sets A/V SyncLDOWN\x00sets Balance Down (to L 2 Step)LQSTN\x00gets Zone3 BalanceLUP\x00sets Balance Up (to R 2 Step)P"xx"\x00Zone3 Balance (xx is "-A"..."00"..."+A"[L+10...0...R+10 2L+10\x00+10L0\x000.0L1\x001.0L10\x0010.0L2\x002.0L3\x003.0L4\x004.0L5\x005.0L6\x006.0L7\x007.0L8\x008.0L9\x009.0LCLEAR\x00CLEARLD.MODE\x00D.MODELD.SKIP\x00DISC +LDISC.F\x00DISC +LDISC.R\x00DISC -LDISC1\x00DISC1LDISC2\x00DISC2LDISC3\x00DISC3LDISC4\x00DISC4LDISC5\x00DISC5LDISC6\x00DISC6LDISP\x00DISPLAYLFF\x00FF >>LMEMORY\x00MEMORYLOP/CL\x00OPEN/CLOSELPAUSE\x00PAUSELPLAY\x00PLAYLPON\x00POWER ONLPOWER\x00POWER ON/OFFLRANDOM\x00RANDOMLREPEAT\x00REPEATLREW\x00REW <<LSKIP.F\x00>>ILSKIP.R\x00I<<LSTBY\x00STANDBYLSTOP\x00STOPLTRACK\x00TRACK+L01\x00sets MainL02\x00sets Zone2L10\x00sets SubLQSTN\x00gets Control MonitorLUP\x00sets Control Monitor Wrap-Around UpL1\x001.0L10/0\x0010/0L2\x002.0L3\x003.0L4\x004.0L5\x005.0L6\x006.0L7\x007.0L8\x008.0L9\x009.0LCLEAR\x00CLEARLDISP\x00DISPLAYLFF\x00FFLMEMORY\x00MEMORYLOP/CL\x00OPEN/CLOSELP.MODE\x00PLAY MODELPAUSE\x00PAUSELPLAY\x00PLAYLPOWER\x00POWER ON/OFFLRANDOM\x00RANDOMLREC\x00RECLREPEAT\x00REPEATLREW\x00REWLSCROLL\x00SCROLLLSKIP.F\x00>>ILSKIP.R\x00I<<LSTBY\x00STANDBYLSTOP\x00STOPP"nn/nnn"\x00--/---LFF\x00FF >>LPLAY\x00PLAYLRC/PAU\x00REC/PAUSELREW\x00REW <<LSKIP.F\x00>>ILSKIP.R\x00I<<LSTOP\x00STOPL0\x000.0L1\x001.0L10\x0010.0L2\x002.0L3\x003.0L4\x004.0L5\x005.0L6\x006.0L7\x007.0L8\x008.0L9\x009.0LABR\x00A-B REPEATLANGLE\x00ANGLELASCTG\x00ASPECT(Toggle)LAUDIO\x00AUDIOLCDPCD\x00CD CHAIN REPEATLCLEAR\x00CLEARLCONMEM\x00CONDITION MEMORYLDISC.F\x00DISC +LDISC.R\x00DISC -LDISC1\x00DISC1LDISC2\x00DISC2LDISC3\x00DISC3LDISC4\x00DISC4LDISC5\x00DISC5LDISC6\x00DISC6LDISP\x00DISPLAYLDOWN\x00DOWNLENTER\x00ENTERLFF\x00FF >>LFOLDDN\x00FOLDER DOWNLFOLDUP\x00FOLDER UPLFUNMEM\x00FUNCTION MEMORYLINIT\x00Return to Factory SettingsLLASTPLAY\x00LAST PLAYLLEFT\x00LEFTLMEMORY\x00MEMORYLMENU\x00MENULMSPDN\x00MULTI SPEED DOWNLMSPUP\x00MULTI SPEED UPLOP/CL\x00OPEN/CLOSELP.MODE\x00PLAY MODELPAUSE\x00PAUSELPCT\x00PICTURE CONTROLLPLAY\x00PLAYLPOWER\x00POWER ON/OFFLPROGRE\x00PROGRESSIVELPWROFF\x00POWER OFFLPWRON\x00POWER ONLRANDOM\x00RANDOMLREPEAT\x00REPEATLRETURN\x00RETURNLREW\x00REW <<LRIGHT\x00RIGHTLRSCTG\x00RESOLUTION(Toggle)LSEARCH\x00SEARCHLSETUP\x00SETUPLSKIP.F\x00>>ILSKIP.R\x00I<<LSLOW.F\x00SLOWLSLOW.R\x00SLOW BACKLSTEP.F\x00STEPLSTEP.R\x00STEP BACKLSTOP\x00STOPLSUBTITLE\x00SUBTITLELSUBTON/OFF\x00SUBTITLE ON/OFFLTOPMENU\x00TOPMENULUP\x00UPLVDOFF\x00VIDEO ON/OFFLZOOMDN\x00ZOOM DOWNLZOOMTG\x00ZOOMLZOOMUP\x00ZOOM UPL00\x00sets OffL01\x00sets OnLQSTN\x00gets HDMI CECLUP\x00sets HDMI CEC Wrap-Around UpLPOWER\x00POWER ON/OFFLPRESET\x00PRESETL1\x001.0L10/0\x0010/0L2\x002.0L3\x003.0L4\x004.0L5\x005.0L6\x006.0L7\x007.0L8\x008.0L9\x009.0LCLEAR\x00CLEARLDISP\x00DISPLAYLEJECT\x00EJECTLENTER\x00ENTERLFF\x00FF >>LGROUP\x00GROUPLM.SCAN\x00MUSIC SCANLMEMORY\x00MEMORYLNAME\x00NAMELP.MODE\x00PLAY MODELPAUSE\x00PAUSELPLAY\x00PLAYLPOWER\x00POWER ON/OFFLRANDOM\x00RANDOMLREC\x00RECLREPEAT\x00REPEATLREW\x00REW <<LSCROLL\x00SCROLLLSKIP.F\x00>>ILSKIP.R\x00I<<LSTBY\x00STANDBYLSTOP\x00STOPP"nn/nnn"\x00--/---LQSTN\x00gets the Audio Muting StatePaabbccddeeffgghhiijjkkllmm\x00sets Audio Muting by ChannelL0\x000.0L1\x001.0L10\x0010/+10/Direct TuningL2\x002.0L3\x003.0L4\x004.0L5\x005.0L6\x006.0L7\x007.0L8\x008.0L9\x009.0LDISP\x00DISPLAYLDOWN\x00DOWN/Tuning DownLENTER\x00ENTERLFF\x00FF >>LLEFT\x00LEFT/Multicast DownLMODE\x00MODELPAUSE\x00PAUSELPLAY\x00PLAY/BANDLPRSDN\x00PRESET DOWNLPRSUP\x00PRESET UPLREPEAT\x00REPEATLRETURN\x00RETURNLREW\x00REW <<LRIGHT\x00RIGHT/Multicast UpLSETUP\x00SETUPLSHUFFLE\x00SHUFFLELSKIP.F\x00>>ILSKIP.R\x00I<<LSTOP\x00STOPLUP\x00UP/Tuning UpLFF\x00FF >>LPLAY.F\x00PLAY >LPLAY.R\x00PLAY <LRC/PAU\x00REC/PAUSELREW\x00REW <<LSTOP\x00STOPLFF\x00FF >>LOP/CL\x00OPEN/CLOSELPLAY.F\x00PLAY >LPLAY.R\x00PLAY <LRC/PAU\x00REC/PAUSELREC\x00RECLREW\x00REW <<LSKIP.F\x00>>ILSKIP.R\x00I<<LSTOP\x00STOPLDOWN\x00sets Center Image DownLQSTN\x00gets The Center Image StateLUP\x00sets Center Image UpR00-0A\x00sets Center ImageLDOWN\x00LEVEL - KEYLQSTN\x00gets the Subwoofer LevelLUP\x00LEVEL + KeyS-18-000-+18\x00sets Center Level -12.0dB - 0.0dB - +12.0dB(0.5dB Step)S-0C-000-+0C\x00sets Subwoofer Level -12.0dB - 0.0dB - +12.0dBS-C-00-+C\x00sets Center Level -12dB - 0dB - +12dBL00\x00sets Center Spread OffL01\x00sets Center Spread OnLQSTN\x00gets The Center Spread StateLTG\x00sets Center Spread Wrap-AroundLDOWN\x00sets Center Width DownLQSTN\x00gets The Center Width StateLUP\x00sets Center Width UpR00-07\x00sets Center WidthL00\x00sets Digital Filter SlowL01\x00sets Digital Filter SharpLQSTN\x00gets The Digital Filter StateLUP\x00sets Digital Filter Wrap-AroundL00\x00Display Program FormatL01\x00Display Digital Input PositionL02\x00Display Digital Format PositionL03\x00Display Bass LevelL04\x00Display Treble LevelL00\x00sets Dimmer Level "Bright"L01\x00sets Dimmer Level "Dim"L02\x00sets Dimmer Level "Dark"L03\x00sets Dimmer Level "Shut-Off"L08\x00sets Dimmer Level "Bright & LED OFF"LDIM\x00sets Dimmer Level Wrap-Around UpLQSTN\x00gets The Dimmer LevelLDOWN\x00sets Dialog Control DownLQSTN\x00gets The Dialog Control StateLUP\x00sets Dialog Control UpP"00"-"+6"\x00sets Dialog ControlL00\x00sets DUAL MONO MAINL01\x00sets DUAL MONO SUBL02\x00sets DUAL MONO MAIN+SUBLQSTN\x00gets The Panorama StateLUP\x00sets Panorama Wrap-AroundLDOWN\x00sets Dimension DownLQSTN\x00gets The Dimension StateLUP\x00sets Dimension UpS-3-00-+3\x00sets DimensionL00\x00sets Dolby Volume OffL01\x00sets Dolby Volume Low/OnL02\x00sets Dolby Volume MidL03\x00sets Dolby Volume HighLQSTN\x00gets The Dolby Volume StateLUP\x00sets Dolby Volume State Wrap-Around UpL01\x00sets Volume 1dB down and Dimmer Level "Dark"L03\x00sets Volume 3dB down and Dimmer Level "Dark"L06\x00sets Volume 6dB down and Dimmer Level "Dark"LQSTN\x00gets FL Display InformationP"xxxxxxxxxxx"\x00FL Display InformationLQSTN\x00gets The Firmware Version StatePabce-fhik-lmno-qrtu\x00sets Firmware VersionL00\x00sets PCM Fixed Mode OffL01\x00sets PCM Fixed Mode OnLQSTN\x00gets The PCM Fixed Mode StateLUP\x00sets PCM Fixed Mode Wrap-AroundL00\x00sets OffL01\x00sets OnL02\x00sets AutoLQSTN\x00gets HDMI Audio OutLUP\x00sets HDMI Audio Out Wrap-Around UpL00\x00sets OffL01\x00sets OnLQSTN\x00gets HDMI Audio OutLUP\x00sets HDMI Audio Out Wrap-Around UpLQSTN\x00gets HD Radio Artist NameP"nnnnnnnnnn"\x00HD Radio Artist Name (variable-length, 64 digits max)L00\x00sets HD Radio Blend Mode "Auto"L01\x00sets HD Radio Blend Mode "Analog"LQSTN\x00gets the HD Radio Blend Mode StatusL00\x00sets Hi-Bit OffL01\x00sets Hi-Bit OnLQSTN\x00gets The Hi-Bit StateLUP\x00sets Hi-Bit Wrap-Around UpLQSTN\x00gets HD Radio Channel NameP"nnnnnnnnnn"\x00HD Radio Channel Name (Station Name) (7 digits)L00\x00sets No AnalogL01\x00sets Yes/Out Main HDMI Main HDMIL02\x00sets Out Sub HDMI Sub HDBaseTL03\x00sets Both Main+SubL04\x00sets Both(Main)L05\x00sets Both(Sub)LQSTN\x00gets The HDMI Out SelectorLUP\x00sets HDMI Out Selector Wrap-Around UpLQSTN\x00gets HD Radio TitleP"nnnnnnnnnn"\x00HD Radio TitleLQSTN\x00gets The HDMI Out Information StatePab\x00sets HDMI InformationLQSTN\x00gets HD Radio Channel ProgramR01-08\x00sets directly HD Radio Channel ProgramLAT\x00sets HDMI Standby Throguh AutoLATE\x00sets HDMI Standby Through Auto(Eco)LLAST\x00sets HDMI Standby Through LastLOFF\x00sets HDMI Standby Through OffLQSTN\x00gets The HDMI Standby Through StateLUP\x00sets HDMI Standby Through Wrap-AroundPxx\x00sets HDMI Standby Through xx=SLI NumberLQSTN\x00gets HD Radio TitleP"nnnnnnnnnn"\x00HD Radio Title (variable-length, 64 digits max)LQSTN\x00gets the HD Radio Tuner StatusP"mmnnoo"\x00HD Radio Tuner Status (3 bytes)LQSTN\x00gets iPod Album NameP"nnnnnnn"\x00iPod Album Name (variable-length, 64 letters max ASCIILQSTN\x00gets iPod Artist NameP"nnnnnnnnnn"\x00iPod Artist Name (variable-length, 64 letters max ASCIILQSTN\x00gets Infomation of AudioP"a..a,b..b,c?c,d..d,e?e,f?f,"\x00Infomation of Audio(Same Immediate Display \',\' is separatorP"a..a,b..b,c?c,d..d,e?e,f?f,g?g,h?h,i?I,j?j"\x00Infomation of Audio(Same Immediate Display \',\' is separatorLQSTN\x00gets Infomation of VideoP"a..a,b..b,c?c,d..d,e?e,f?f,g?g,h?h,i?i,"\x00infomation of Video(Same Immediate Display \',\' is separatorP"tlpnnnnnnnnnn"\x00iPod List InfoLEXT\x00Extend Mode(If available)LQSTN\x00gets iPod Mode StatusLSTD\x00Standerd ModeLVDC\x00Video Contents in Extended ModePiixxxxxxxxxx\x00sets Input Selector Name (10 characters)L00\x00sets ISF Mode CustomL01\x00sets ISF Mode DayL02\x00sets ISF Mode NightLQSTN\x00gets The ISF Mode StateLUP\x00sets ISF Mode State Wrap-Around UpLQSTN\x00gets the iPod Play StatusP"prs"\x00iPod Play Status (3 letters)LQSTN\x00gets iPod Title NameP"nnnnnnnnnn"\x00iPod Title Name (variable-length, 64 letters max ASCIILQSTN\x00gets iPod Time InfoP"mm:ss/mm:ss"\x00iPod Time Info (Elapsed time/Track Time Max 99:59)LQSTN\x00gets iPod Time InfoP"cccc/tttt"\x00iPod Track Info (Current Track/Toral Track Max 9999)LDOWN\x00sets IntelliVolume DownLQSTN\x00gets The IntelliVolume StateLUP\x00sets IntelliVolume UpS-18-00-+18\x00sets IntelliVolume -12.0dB~0dB~+12.0dB(0.5dB Step)LCMP\x00Component Out(If available)LQSTN\x00gets iPod Video Out StatusLS/V\x00S/Composite OutL00\x00sets Loudness Management OffL01\x00sets Loudness management OnLQSTN\x00gets The Panorama StateLUP\x00sets Panorama Wrap-AroundLDOWN\x00sets LFE Mute Level DownLQSTN\x00gets The LFE Mute LevelLUP\x00sets LFE Mute Level UpPxx\x00sets LFE Mute LevelL00\x00sets STEREOL01\x00sets DIRECTL02\x00sets SURROUNDL03\x00sets FILM Game-RPGL04\x00sets THXL05\x00sets ACTION Game-ActionL06\x00sets MUSICAL Game-RockL07\x00sets MONO MOVIEL08\x00sets ORCHESTRAL09\x00sets UNPLUGGEDL0A\x00sets STUDIO-MIXL0B\x00sets TV LOGICL0C\x00sets ALL CH STEREOL0D\x00sets THEATER-DIMENSIONALL0E\x00sets ENHANCED 7/ENHANCE Game-SportsL0F\x00sets MONOL11\x00sets PURE AUDIOL12\x00sets MULTIPLEXL13\x00sets FULL MONOL14\x00sets DOLBY VIRTUALL15\x00sets DTS Surround SensationL16\x00sets Audyssey DSXL1F\x00sets Whole House ModeL23\x00sets Stage (when Genre Control is Enable in Japan Model)L25\x00sets Action (when Genre Control is Enable in Japan Model)L26\x00sets Music (when Genre Contorl is Enable in Japan Model)L2E\x00sets Sports (when Genre Control is Enable in Japan Model)L40\x00sets 5.1ch SurroundL41\x00sets Dolby EX/DTS ESL42\x00sets THX CinemaL43\x00sets THX Surround EXL44\x00sets THX MusicL45\x00sets THX GamesL50\x00sets THX U2/S2/I/S Cinema/Cinema2L51\x00sets THX MusicMode,THX U2/S2/I/S MusicL52\x00sets THX Games Mode,THX U2/S2/I/S GamesL80\x00sets PLII/PLIIx Movie Dolby Atmos/Dolby SurroundL81\x00sets PLII/PLIIx MusicL82\x00sets Neo:6 Cinema/Neo:X Cinema DTS:X/Neural:XL83\x00sets Neo:6 Music/Neo:X MusicL84\x00sets PLII/PLIIx THX Cinema Dolby Surround THX CinemaL85\x00sets Neo:6/Neo:X THX Cinema DTS Neural:X THX CinemaL86\x00sets PLII/PLIIx GameL87\x00sets Neural Surr*3L88\x00sets Neural THX/Neural SurroundL89\x00sets PLII/PLIIx THX Games Dolby Surround THX GamesL8A\x00sets Neo:6/Neo:X THX Games DTS Neural:X THX GamesL8B\x00sets PLII/PLIIx THX Music Dolby Surround THX MusicL8C\x00sets Neo:6/Neo:X THX Music DTS Neural:X THX MusicL8D\x00sets Neural THX CinemaL8E\x00sets Neural THX MusicL8F\x00sets Neural THX GamesL90\x00sets PLIIz HeightL91\x00sets Neo:6 Cinema DTS Surround SensationL92\x00sets Neo:6 Music DTS Surround SensationL93\x00sets Neural Digital MusicL94\x00sets PLIIz Height + THX CinemaL95\x00sets PLIIz Height + THX MusicL96\x00sets PLIIz Height + THX GamesL97\x00sets PLIIz Height + THX U2/S2 CinemaL98\x00sets PLIIz Height + THX U2/S2 MusicL99\x00sets PLIIz Height + THX U2/S2 GamesL9A\x00sets Neo:X GameLA0\x00sets PLIIx/PLII Movie + Audyssey DSXLA1\x00sets PLIIx/PLII Music + Audyssey DSXLA2\x00sets PLIIx/PLII Game + Audyssey DSXLA3\x00sets Neo:6 Cinema + Audyssey DSXLA4\x00sets Neo:6 Music + Audyssey DSXLA5\x00sets Neural Surround + Audyssey DSXLA6\x00sets Neural Digital Music + Audyssey DSXLA7\x00sets Dolby EX + Audyssey DSXLAUTO\x00sets Listening Mode Wrap-Around UpLDOWN\x00sets Listening Mode Wrap-Around DownLFF\x00sets Auto SurroundLGAME\x00sets Listening Mode Wrap-Around UpLMOVIE\x00sets Listening Mode Wrap-Around UpLMUSIC\x00sets Listening Mode Wrap-Around UpLQSTN\x00gets The Listening ModeLSTEREO\x00sets Listening Mode Wrap-Around UpLSURR\x00sets Listening Mode Wrap-Around UpLTHX\x00sets Listening Mode Wrap-Around UpLUP\x00sets Listening Mode Wrap-Around UpL00\x00sets STEREOL01\x00sets DIRECTL0F\x00sets MONOL12\x00sets MULTIPLEXL87\x00sets DVS(Pl2)L88\x00sets DVS(NEO6)L00\x00sets Lip Sync OffL01\x00sets Lip Sync OnLQSTN\x00gets The Lip Sync StateLUP\x00sets Lip Sync Wrap-AroundL00\x00sets Late Night OffL01\x00sets Late Night Low@DolbyDigital,On@Dolby TrueHDL02\x00sets Late Night High@DolbyDigital,(On@Dolby TrueHD)L03\x00sets Late Night Auto@Dolby TrueHDLQSTN\x00gets The Late Night LevelLUP\x00sets Late Night State Wrap-Around UpL00\x00sets Late Night OffL01\x00sets Late Night LowL02\x00sets Late Night HighLQSTN\x00gets The Late Night LevelLUP\x00sets Late Night State Wrap-Around UpL00\x00not complete MCACC calibrationL01\x00complete MCACC calibrationLQSTN\x00gets The MCACC calibrationL01\x00sets MCACC MEMORY 1L02\x00sets MCACC MEMORY 2L03\x00sets MCACC MEMORY 3L04\x00sets MCACC MEMORY 4L05\x00sets MCACC MEMORY 5L06\x00sets MCACC MEMORY 6LDOWN\x00sets MCACC MEMORY Wrap-Around DownLQSTN\x00gets The MCACC MEMORYLUP\x00sets MCACC MEMORY Wrap-Around UpLLOCK\x00locks memoryLRCL\x00recalls memoryLSTR\x00stores memoryLUNLK\x00unlocks memoryL00\x00not complete Fullband MCACC calibration orL01\x00complete Fullband MCACC calibrationLQSTN\x00gets The Fullband MCACC calibrationL00\x00sets Music Optimizer OffL01\x00sets Music Optimizer OnLQSTN\x00gets The Music Optimizer StateLUP\x00sets Music Optimizer State Wrap-Around UpL00\x00sets Zone3 Muting OffL01\x00sets Zone3 Muting OnLQSTN\x00gets the Zone3 Muting StatusLTG\x00sets Zone3 Muting Wrap-AroundL00\x00sets Zone4 Muting OffL01\x00sets Zone4 Muting OnLQSTN\x00gets the Zone4 Muting StatusLTG\x00sets Zone4 Muting Wrap-AroundLDOWN\x00sets Volume Level DownLDOWN1\x00sets Volume Level Down 1dB StepLQSTN\x00gets the Volume LevelLUP\x00sets Volume Level UpLUP1\x00sets Volume Level Up 1dB StepR00-C8\x00Volume Level 0.0 - 100.0 ( 0.5 Step In hexadecimalR00-64\x00Volume Level 0 - 100 ( In hexadecimal representation)R00-50\x00Volume Level 0 - 80 ( In hexadecimal representation)P"xxxx"\x00Add Favorite Lsit in List View (from Network Control Only)LQSTN\x00gets NET/USB Album NameP"nnnnnnn"\x00NET/USB Album Name (variable-length, 64 ASCII letters max)LQSTN\x00gets NET/USB Artist NameP"nnnnnnnnnn"\x00NET/USB Artist Name (variable-length, 64 ASCII letters max)LCLEAR\x00CLEAR PAIRING INFORMATIONLPAIRING\x00PAIRINGP"t----<.....>"\x00t -> message type \'X\' : XMLP"Ullt<.....>"\x00U : UI TypeP"xxxxyyyy"\x00xxxx -> index of update item (0000-FFFF : 1st to 65536thLQSTN\x00gets the Net/USB StatusP"nfr"\x00NET Connection/USB Device Status (3 letters)LBMP\x00sets Jacket Art enable and Image type BMPLDIS\x00sets Jacket Art disableLENA\x00sets Jacket Art enableLLINK\x00sets Jacket Art enable and Image type LINKLQSTN\x00gets Jacket Art enable/disableLREQ\x00gets Jacket Art dataLUP\x00sets Jacket Art Wrap-Around UpP"tpxxxxxxxxxxxx"\x00NET/USB Jacket Art/Album Art DataP"ll"\x00waiting Keyboard InputP"nnnnnnnnn"\x00set Keyboard Input letterP"tzzzzsurr<.....>"\x00t -> responce type \'X\' : XMLP"Lzzzzllxxxxyyyy"\x00specifiy to get the listed data (from Network Control Only)P"Izzzzllxxxx----"\x00select the listed item (from Network Control Only)P"tlpnnnnnnnnnn"\x00NET/USB List InfoP"ti"\x00select the listed itemLQSTN\x00gets List Title InfoP"xxuycccciiiillrraabbssnnn...nnn"\x00NET/USB List Title InfoP"xxuycccciiiillsraabbssnnn...nnn"\x00NET/USB List Title InfoLEXT\x00Extend Mode(If available)LQSTN\x00gets iPod Mode StatusLSTD\x00Standerd ModeLVDC\x00Video Contents in Extended ModeLQSTN\x00gets the Net/USB Menu StatusP"maabbstii"\x00NET/USB Menu Status (9 letters)R01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)R01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)LQSTN\x00gets the Net/USB Playback view ButtonP"pudtsrrr"\x00NET/USB Playback view Status (5 letters)LSET\x00preset memory current stationR01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)P"xaaa?aaaybbb?bbb"\x00x -> Popup Display TypeR01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)R01-28\x00Remove Item from Favorite List ( In hexadecimalLQSTN\x00gets the Receiver Information StatusP"<?>"\x00<?>: XML Data <?xml?>LOFF\x00sets Network Standby is OffLON\x00sets Network Standby is OnLQSTN\x00gets Network Standby SettingP"xxxxxxxxxxx"\x00Search Word (Max 128 Character)LQSTN\x00gets the Net/USB Play StatusP"prs"\x00NET/USB Play Status (3 letters)P"ssiaaaa?aaaabbbb?bbbb"\x00select Network Service directlyLCHDN\x00CH DOWNP(for iRadio)LCHUP\x00CH UP(for iRadio)LDISPLAY\x00DISPLAY KEY(for iPod 1wire)LDOWN\x00DOWN KEY(for iPod 1wire)LFF\x00FF KEY (CONTINUOUS*) (for iPod 1wire)LLEFT\x00LEFT KEY(for iPod 1wire)LMEMORY\x00MEMORY KEYLP/P\x00PLAY / PAUSE KEYLPAUSE\x00PAUSE KEYLPLAY\x00PLAY KEYLRANDOM\x00RANDOM KEY(for iPod 1wire)LREP/SHF\x00REPEAT / SHUFFLE KEYLREPEAT\x00REPEAT KEY(for iPod 1wire)LRETURN\x00RETURN KEY(for iPod 1wire)LREW\x00REW KEY (CONTINUOUS*) (for iPod 1wire)LRIGHT\x00RIGHT KEY(for iPod 1wire)LSELECT\x00SELECT KEY(for iPod 1wire)LSTOP\x00STOP KEYLTRDN\x00TRACK DOWN KEYLTRUP\x00TRACK UP KEYLUP\x00UP KEY(for iPod 1wire)LDISPLAY\x00DISPLAY KEY(for iPod 1wire)LDOWN\x00DOWN KEY(for iPod 1wire)LFF\x00FF KEY (CONTINUOUS*) (for iPod 1wire)LLEFT\x00LEFT KEY(for iPod 1wire)LPAUSE\x00PAUSE KEYLPLAY\x00PLAY KEYLRANDOM\x00RANDOM KEY(for iPod 1wire)LREPEAT\x00REPEAT KEY(for iPod 1wire)LRETURN\x00RETURN KEY(for iPod 1wire)LREW\x00REW KEY (CONTINUOUS*) (for iPod 1wire)LRIGHT\x00RIGHT KEY(for iPod 1wire)LSELECT\x00SELECT KEY(for iPod 1wire)LSTOP\x00STOP KEYLTRDN\x00TRACK DOWN KEYLTRUP\x00TRACK UP KEYLUP\x00UP KEY(for iPod 1wire)P"PLAYz"\x00PLAY KEYP"STOPz"\x00STOP KEYP"PAUSEz"\x00PAUSE KEYP"TRUPz"\x00TRACK UP KEYP"TRDNz"\x00TRACK DOWN KEYLQSTN\x00gets NET/USB Title NameP"nnnnnnnnnn"\x00NET/USB Title Name (variable-length, 64 ASCII letters max)LQSTN\x00gets NET/USB Time InfoP"mm:ss/mm:ss"\x00NET/USB Time Info (Elapsed time/Track Time Max 99:59. IfP"hh:mm:ss/hh:mm:ss"\x00NET/USB Time Info (Elapsed time/Track Time Max 99:59:59. IfLQSTN\x00gets NET/USB Track InfoP"cccc/tttt"\x00NET/USB Track Info (Current Track/Toral Track Max 9999. IfP"mm:ss"\x00mm: munites (00-99)P"hh:mm:ss"\x00hh: hours(00-99)LCHDN\x00CH DOWN(for iRadio)LCHUP\x00CH UP(for iRadio)LDISPLAY\x00DISPLAY KEY(for iPod 1wire)LDOWN\x00DOWN KEY(for iPod 1wire)LFF\x00FF KEY (CONTINUOUS*) (for iPod 1wire)LLEFT\x00LEFT KEY(for iPod 1wire)LMEMORY\x00MEMORY KEYLMODE\x00MODE KEYLP/P\x00PLAY / PAUSE KEYLPAUSE\x00PAUSE KEYLPLAY\x00PLAY KEYLRANDOM\x00RANDOM KEY(for iPod 1wire)LREP/SHF\x00REPEAT / SHUFFLE KEYLREPEAT\x00REPEAT KEY(for iPod 1wire)LRETURN\x00RETURN KEY(for iPod 1wire)LREW\x00REW KEY (CONTINUOUS*) (for iPod 1wire)LRIGHT\x00RIGHT KEY(for iPod 1wire)LSELECT\x00SELECT KEY(for iPod 1wire)LSTOP\x00STOP KEYLTRDN\x00TRACK DOWN KEYLTRUP\x00TRACK UP KEYLUP\x00UP KEY(for iPod 1wire)LAUDIO\x00Audio Adjust KeyLDOWN\x00Down KeyLENTER\x00Enter KeyLEXIT\x00Exit KeyLHOME\x00Home KeyLIPV\x00Instaprevue KeyLLEFT\x00Left KeyLMENU\x00Menu KeyLQUICK\x00Quick Setup KeyLRIGHT\x00Right KeyLUP\x00Up KeyLVIDEO\x00Video Adjust KeyL00\x00sets Pre Amp Mode OffL01\x00sets Pre Amp Mode FrontL03\x00sets Pre Amp Mode Front+CenterL07\x00sets Pre Amp Mode AllLQSTN\x00gets The Auto Power Down StateLUP\x00sets Auto Power Down Wrap-AroundLAT\x00sets Auto Phase Control PlusLDOWN\x00sets Phase Control Plus DownLQSTN\x00gets The Phase Control PlusLUP\x00sets Phase Control Plus UpR00-10\x00sets Phase Control Plus 0msec - 16msecL00\x00sets Phase Control OffL01\x00sets Phase Control OnL02\x00sets Full Band Phase Control OnLQSTN\x00gets The Phase ControlLUP\x00sets Phase Control Wrap-Around UpL00\x00sets OffL01\x00sets OnLQSTN\x00gets Phase Matching BassLTG\x00sets Phase Matching Bass Wrap-Around UpL00\x00sets Panorama OffL01\x00sets Panorama OnLQSTN\x00gets The Panorama StateLTG\x00sets Panorama Wrap-AroundP"t----<.....>"\x00t -> message type \'X\' : XMLP"Ullt<.....>"\x00U : UI TypeL00\x00sets PQLS OffL01\x00sets PQLS OnLQSTN\x00gets The PQLS StateLUP\x00sets PQLS Wrap-AroundLDOWN\x00sets Preset No. Wrap-Around DownLQSTN\x00gets The Preset No.LUP\x00sets Preset No. Wrap-Around UpR01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)R01-1E\x00sets Preset No. 1 - 30 ( In hexadecimal representation)LDOWN\x00sets Preset No. Wrap-Around DownLQSTN\x00gets The Preset No.LUP\x00sets Preset No. Wrap-Around UpR01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)R01-1E\x00sets Preset No. 1 - 30 ( In hexadecimal representation)R01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)R01-1E\x00sets Preset No. 1 - 30 ( In hexadecimal representation)LDOWN\x00sets Preset No. Wrap-Around DownLQSTN\x00gets The Preset No.LUP\x00sets Preset No. Wrap-Around UpR01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)R01-1E\x00sets Preset No. 1 - 30 ( In hexadecimal representation)LDOWN\x00sets Preset No. Wrap-Around DownLQSTN\x00gets The Preset No.LUP\x00sets Preset No. Wrap-Around UpR01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)R01-1E\x00sets Preset No. 1 - 30 ( In hexadecimal representation)LENTER\x00Finish PTY ScanR01-1D\x00sets PTY No ?1 - 29? ( In hexadecimal representation)L00\x00sets Zone3 StandbyL01\x00sets Zone3 OnLQSTN\x00gets the Zone3 Power StatusL00\x00sets Zone4 StandbyL01\x00sets Zone4 OnLQSTN\x00gets the Zone4 Power StatusL00\x00sets System StandbyL01\x00sets System OnLQSTN\x00gets the System Power StatusL00\x00sets Both OffL01\x00sets Re-EQ OnL02\x00sets Academy OnLQSTN\x00gets The Re-EQ/Academy StateLUP\x00sets Re-EQ/Academy State Wrap-Around UpL00\x00sets Both OffL01\x00sets Re-EQ OnL02\x00sets Academy OnLQSTN\x00gets The Re-EQ/Academy StateLUP\x00sets Re-EQ/Academy State Wrap-Around UpL00\x00Display RT Information*1L01\x00Display PTY InformationL02\x00Display TP InformationLUP\x00Display RDS Information Wrap-Around ChangeL00\x00sets ThroughL01\x00sets Auto(HDMI Output Only)L02\x00sets 480pL03\x00sets 720pL04\x00sets 1080iL05\x00sets 1080p(HDMI Output Only)L06\x00sets SourceL07\x00sets 1080p/24fs(HDMI Output Only)L08\x00sets 4K Upcaling(HDMI Output Only) 4K(HDMI Output Only)L13\x00sets 1680x720pL15\x00sets 2560x1080pLQSTN\x00gets The Monitor Out ResolutionLUP\x00sets Monitor Out Resolution Wrap-Around UpLALL\x00Reset AllLQSTN\x00gets SIRIUS Artist NameP"nnnnnnnnnn"\x00SIRIUS Artist NameL00\x00sets Dialog Enhancement OffL01\x00sets Dialog Enhancement OnLQSTN\x00gets The Dialog Enhancement StateLUP\x00sets Dialog Enhancement Wrap-AroundR02-05\x00sets Dialog Enahncement UP1-UP4LDOWN\x00sets SIRIUS Channel Wrap-Around DownLQSTN\x00gets SIRIUS Channel NumberLUP\x00sets SIRIUS Channel Wrap-Around UpR000-255\x00SIRIUS Channel Number ?000 - 255?LQSTN\x00gets SIRIUS Channel NameP"nnnnnnnnnn"\x00SIRIUS Channel NameLDOWN\x00sets SIRIUS Category Wrap-Around DownLQSTN\x00gets SIRIUS CategoryLUP\x00sets SIRIUS Category Wrap-Around UpP"nnnnnnnnnn"\x00SIRIUS Category InfoL00\x00sets VIDEO1 VCR/DVR STB/DVRL01\x00sets VIDEO2 CBL/SATL02\x00sets VIDEO3 GAME/TV GAME GAME1L03\x00sets VIDEO4 AUX1(AUX)L04\x00sets VIDEO5 AUX2 GAME2L05\x00sets VIDEO6 PCL06\x00sets VIDEO7L07\x00sets Hidden1 EXTRA1L08\x00sets Hidden2 EXTRA2L09\x00sets Hidden3 EXTRA3L10\x00sets DVDL11\x00sets STRM BOXL12\x00sets TVL20\x00sets TAPE(1)L21\x00sets TAPE2L22\x00sets PHONOL23\x00sets CD TV/CDL24\x00sets FML25\x00sets AML26\x00sets TUNERL27\x00sets MUSIC SERVER P4S DLNA*2L28\x00sets INTERNET RADIO iRadio Favorite*3L29\x00sets USB/USB(Front)L2A\x00sets USB(Rear)L2B\x00sets NETWORK NETL2C\x00sets USB(toggle)L2D\x00sets AirplayL2E\x00sets BluetoothL30\x00sets MULTI CHL31\x00sets XM*1L32\x00sets SIRIUS*1L33\x00sets DAB *5L40\x00sets Universal PORTL80\x00sets SOURCELDOWN\x00sets Selector Position Wrap-Around DownLQSTN\x00gets The Selector PositionLUP\x00sets Selector Position Wrap-Around UpL00\x00sets VIDEO1 VCR/DVR STB/DVRL01\x00sets VIDEO2 CBL/SATL02\x00sets VIDEO3 GAME/TV GAME GAME1L03\x00sets VIDEO4 AUX1(AUX)L04\x00sets VIDEO5 AUX2 GAME2L05\x00sets VIDEO6 PCL06\x00sets VIDEO7L07\x00sets Hidden1 EXTRA1L08\x00sets Hidden2 EXTRA2L09\x00sets Hidden3 EXTRA3L10\x00sets DVD BD/DVDL20\x00sets TAPE(1) TV/TAPEL21\x00sets TAPE2L22\x00sets PHONOL23\x00sets CD TV/CDL24\x00sets FML25\x00sets AML26\x00sets TUNERL27\x00sets MUSIC SERVER P4S DLNA*2L28\x00sets INTERNET RADIO iRadio Favorite*3L29\x00sets USB/USB(Front)L2A\x00sets USB(Rear)L2B\x00sets NETWORK NETL2C\x00sets USB(toggle)L2D\x00sets AirplayL2E\x00sets BluetoothL30\x00sets MULTI CHL31\x00sets XM*1L32\x00sets SIRIUS*1L33\x00sets DAB *5L40\x00sets Universal PORTL80\x00sets SOURCELDOWN\x00sets Selector Position Wrap-Around DownLQSTN\x00gets The Selector PositionLUP\x00sets Selector Position Wrap-Around UpL00\x00sets AUTOL01\x00sets MULTI-CHANNELL02\x00sets ANALOGL03\x00sets iLINKL04\x00sets HDMIL05\x00sets COAX/OPTL06\x00sets BALANCEL07\x00sets ARCL0F\x00sets NoneLQSTN\x00gets The Audio Selector StatusLUP\x00sets Audio Selector Wrap-Around UpLCHSEL\x00CH SEL KeyLDOWN\x00LEVEL - KEYLOFF\x00sets TEST TONE OFFLTEST\x00TEST KeyLUP\x00LEVEL + KeyL00\x00sets VIDEO1 VCR/DVR STB/DVRL01\x00sets VIDEO2 CBL/SATL02\x00sets VIDEO3 GAME/TV GAME GAME1L03\x00sets VIDEO4 AUX1(AUX)L04\x00sets VIDEO5 AUX2 GAME2L05\x00sets VIDEO6 PCL06\x00sets VIDEO7L07\x00Hidden1 EXTRA1L08\x00Hidden2 EXTRA2L09\x00Hidden3 EXTRA3L10\x00sets DVD BD/DVDL11\x00sets STRM BOXL12\x00sets TVL20\x00sets TAPE(1) TV/TAPEL21\x00sets TAPE2L22\x00sets PHONOL23\x00sets CD TV/CDL24\x00sets FML25\x00sets AML26\x00sets TUNERL27\x00sets MUSIC SERVER P4S DLNA*2L28\x00sets INTERNET RADIO iRadio Favorite*3L29\x00sets USB/USB(Front)L2A\x00sets USB(Rear)L2B\x00sets NETWORK NETL2C\x00sets USB(toggle)L2D\x00sets AiplayL2E\x00sets BluetoothL30\x00sets MULTI CHL31\x00sets XM*1L32\x00sets SIRIUS*1L33\x00sets DAB *5L40\x00sets Universal PORTL55\x00sets HDMI 5L56\x00sets HDMI 6L57\x00sets HDMI 7LDOWN\x00sets Selector Position Wrap-Around DownLQSTN\x00gets The Selector PositionLUP\x00sets Selector Position Wrap-Around UpLINPUT\x00displays "Please input the Lock password"LWRONG\x00displays "The Lock password is wrong"P"nnnn"\x00Lock Password (4Digits)LOFF\x00sets Sleep Time OffLQSTN\x00gets The Sleep TimeLUP\x00sets Sleep Time Wrap-Around UPR01-5A\x00sets Sleep Time 1 - 90min ( In hexadecimal representation)L00\x00sets VIDEO1L01\x00sets VIDEO2L02\x00sets VIDEO3L03\x00sets VIDEO4L04\x00sets VIDEO5L05\x00sets VIDEO6L06\x00sets VIDEO7L10\x00sets DVDL20\x00sets TAPE(1)L21\x00sets TAPE2L22\x00sets PHONOL23\x00sets CDL24\x00sets FML25\x00sets AML26\x00sets TUNERL27\x00sets MUSIC SERVERL28\x00sets INTERNET RADIOL30\x00sets MULTI CHL31\x00sets XML7F\x00sets OFFL80\x00sets SOURCELQSTN\x00gets The Selector PositionL00\x00sets VIDEO1 VCR/DVR STB/DVRL01\x00sets VIDEO2 CBL/SATL02\x00sets VIDEO3 GAME/TV GAME GAME1L03\x00sets VIDEO4 AUX1(AUX)L04\x00sets VIDEO5 AUX2 GAME2L05\x00sets VIDEO6 PCL06\x00sets VIDEO7L07\x00sets Hidden1 EXTRA1L08\x00sets Hidden2 EXTRA2L09\x00sets Hidden3 EXTRA3L10\x00sets DVD BD/DVDL11\x00sets STRM BOXL12\x00sets TVL20\x00sets TAPE(1)L21\x00sets TAPE2L22\x00sets PHONOL23\x00sets CD TV/CDL24\x00sets FML25\x00sets AML26\x00sets TUNERL27\x00sets MUSIC SERVER P4S DLNA*4L28\x00sets INTERNET RADIO iRadio Favorite*5L29\x00sets USB/USB(Front)L2A\x00sets USB(Rear)L2B\x00sets NETWORK NETL2C\x00sets USB(toggle)L2D\x00sets AirplayL2E\x00sets BluetoothL30\x00sets MULTI CHL31\x00sets XM*3L32\x00sets SIRIUS*3L33\x00sets DAB *5L40\x00sets Universal PORTL55\x00sets HDMI 5L56\x00sets HDMI 6L57\x00sets HDMI 7L7F\x00sets OFFL80\x00sets SOURCELDOWN\x00sets Selector Position Wrap-Around DownLQSTN\x00gets The Selector PositionLUP\x00sets Selector Position Wrap-Around UpL00\x00sets Speaker OffL01\x00sets Speaker OnLQSTN\x00gets the Speaker StateLUP\x00sets Speaker Switch Wrap-AroundL00\x00sets Speaker OffL01\x00sets Speaker OnLQSTN\x00gets the Speaker StateLUP\x00sets Speaker Switch Wrap-AroundLQSTN\x00gets the Speaker DistancePMuaaabbbcccdddeeefffggghhhiiijjjkkklllmmm\x00sets Speaker DistanceLQSTN\x00gets The Speaker InformationPabcdefghhhijk\x00sets Speaker InformationLA\x00sets Speakers ALAB\x00sets Speakers A+BLB\x00sets Speakers BLBH\x00sets Back+Height1 SpeakersLBW\x00sets Back+Wide SpeakersLFH\x00sets Front High Speaker / SurrBack+Front High SpeakersLFW\x00sets Front Wide Speaker / SurrBack+Front Wide SpeakersLH1\x00sets Height1 SpeakersLH2\x00sets Height2 SpeakersLHH\x00sets Height1+Height2 SpeakersLHW\x00sets Front High+Front Wide SpeakersLQSTN\x00gets the Speaker StateLSB\x00sets SurrBack SpeakerLUP\x00sets Speaker Switch Wrap-AroundLDOWN\x00sets Super Resolution Wrap-Around DOWNLQSTN\x00gets The Super Resolution StateLUP\x00sets Super Resolution Wrap-Around UpR00-03\x00sets Super ResolutionLQSTN\x00gets SIRIUS TitleP"nnnnnnnnnn"\x00SIRIUS TitleL00\x00sets Standing Wave OffL01\x00sets Standing Wave OnLQSTN\x00gets The Standing WaveLUP\x00sets Standing Wave Wrap-Around UpLDOWN\x00LEVEL - KEYLQSTN\x00gets the Subwoofer LevelLUP\x00LEVEL + KeyS-1E-000-+18\x00sets Subwoofer 2 Level -15.0dB - 0.0dB - +12.0dB(0.5dB Step)S-0F-000-+0C\x00sets Subwoofer Level -15.0dB - 0.0dB - +12.0dBS-F-00-+C\x00sets Subwoofer 2 Level -15dB - 0dB - +12dBLDOWN\x00LEVEL - KEYLQSTN\x00gets the Subwoofer LevelLUP\x00LEVEL + KeyS-1E-000-+18\x00sets Subwoofer Level -15.0dB - 0.0dB - +12.0dB(0.5dB Step)S-0F-000-+0C\x00sets Subwoofer Level -15.0dB - 0.0dB - +12.0dBS-F-00-+C\x00sets Subwoofer Level -15dB - 0dB - +12dBLQSTN\x00gets the Subwoofer LevelPaaabbbcccdddeeefffggghhhiiijjjkkklllmmm\x00sets Temporary Channel LevelLBDOWN\x00sets Center Bass down(2 step)LBUP\x00sets Center Bass up(2 step)LQSTN\x00gets Cetner Tone ("BxxTxx")LTDOWN\x00sets Center Treble down(2 step)LTUP\x00sets Center Treble up(2 step)P"Bxx"\x00Center Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2 step]P"Txx"\x00Center Treble (xx is "-A"..."00"..."+A"[-10...0...+10 2LBDOWN\x00sets Front High Bass down(2 step)LBUP\x00sets Front High Bass up(2 step)LQSTN\x00gets Front High Tone ("BxxTxx")LTDOWN\x00sets Front High Treble down(2 step)LTUP\x00sets Front High Treble up(2 step)P"Bxx"\x00Front High Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2P"Txx"\x00Front High Treble (xx is "-A"..."00"..."+A"[-10...0...+10 2LBDOWN\x00sets Front Bass down(2 step)LBUP\x00sets Front Bass up(2 step)LQSTN\x00gets Front Tone ("BxxTxx")LTDOWN\x00sets Front Treble down(2 step)LTUP\x00sets Front Treble up(2 step)P"Bxx"\x00Front Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2 step]P"Txx"\x00Front Treble (xx is "-A"..."00"..."+A"[-10...0...+10 2 step]LBDOWN\x00sets Front Wide Bass down(2 step)LBUP\x00sets Front Wide Bass up(2 step)LQSTN\x00gets Front Wide Tone ("BxxTxx")LTDOWN\x00sets Front Wide Treble down(2 step)LTUP\x00sets Front Wide Treble up(2 step)P"Bxx"\x00Front Wide Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2P"Txx"\x00Front Wide Treble (xx is "-A"..."00"..."+A"[-10...0...+10 2L00\x00sets 12V Trigger A OffL01\x00sets 12V Trigger A OnLQSTN\x00gets 12V Trigger A StatusL00\x00sets 12V Trigger B OffL01\x00sets 12V Trigger B OnLQSTN\x00gets 12V Trigger B StatusL00\x00sets 12V Trigger C OffL01\x00sets 12V Trigger C OnLQSTN\x00gets 12V Trigger C StatusLBDOWN\x00sets Bass Down (2 Step)LBUP\x00sets Bass Up (2 Step)LQSTN\x00gets Zone3 Tone ("BxxTxx")LTDOWN\x00sets Treble Down (2 Step)LTUP\x00sets Treble Up (2 Step)P"Bxx"\x00Zone3 Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2 step])P"Txx"\x00Zone3 Treble (xx is "-A"..."00"..."+A"[-10...0...+10 2LENTER\x00Finish TP ScanP""\x00Start TP Scan (When Don?t Have Parameter)LBDOWN\x00sets Surround Back Bass down(2 step)LBUP\x00sets Surround Back Bass up(2 step)LQSTN\x00gets Surround Back Tone ("BxxTxx")LTDOWN\x00sets Surround Back Treble down(2 step)LTUP\x00sets Surround Back Treble up(2 step)P"Bxx"\x00Surround Back Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2P"Txx"\x00Surround Back Treble (xx is "-A"..."00"..."+A"[-10...0...+10LBDOWN\x00sets Surround Bass down(2 step)LBUP\x00sets Surround Bass up(2 step)LQSTN\x00gets Surround Tone ("BxxTxx")LTDOWN\x00sets Surround Treble down(2 step)LTUP\x00sets Surround Treble up(2 step)P"Bxx"\x00Surround Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2P"Txx"\x00Surround Treble (xx is "-A"..."00"..."+A"[-10...0...+10 2LBDOWN\x00sets Subwoofer Bass down(2 step)LBUP\x00sets Subwoofer Bass up(2 step)LQSTN\x00gets Subwoofer Tone ("BxxTxx")P"Bxx"\x00Subwoofer Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2L0\x00sets 0 in Direct Tuning ModeL1\x00sets 1 in Direct Tuning ModeL2\x00sets 2 in Direct Tuning ModeL3\x00sets 3 in Direct Tuning ModeL4\x00sets 4 in Direct Tuning ModeL5\x00sets 5 in Direct Tuning ModeL6\x00sets 6 in Direct Tuning ModeL7\x00sets 7 in Direct Tuning ModeL8\x00sets 8 in Direct Tuning ModeL9\x00sets 9 in Direct Tuning ModeLBAND\x00Change BANDLDIRECT\x00starts/restarts Direct Tuning ModeLDOWN\x00sets Tuning Frequency Wrap-Around DownLQSTN\x00gets The Tuning FrequencyLUP\x00sets Tuning Frequency Wrap-Around UpP"nnnnn"\x00sets Directly Tuning Frequency (FM nnn.nn MHz / AM nnnnn kHzL0\x00sets 0 in Direct Tuning ModeL1\x00sets 1 in Direct Tuning ModeL2\x00sets 2 in Direct Tuning ModeL3\x00sets 3 in Direct Tuning ModeL4\x00sets 4 in Direct Tuning ModeL5\x00sets 5 in Direct Tuning ModeL6\x00sets 6 in Direct Tuning ModeL7\x00sets 7 in Direct Tuning ModeL8\x00sets 8 in Direct Tuning ModeL9\x00sets 9 in Direct Tuning ModeLDIRECT\x00starts/restarts Direct Tuning ModeLDOWN\x00sets Tuning Frequency Wrap-Around DownLQSTN\x00gets The Tuning FrequencyLUP\x00sets Tuning Frequency Wrap-Around UpP"nnnnn"\x00sets Directly Tuning Frequency (FM nnn.nn MHz / AM nnnnnL0\x00sets 0 in Direct Tuning ModeL1\x00sets 1 in Direct Tuning ModeL2\x00sets 2 in Direct Tuning ModeL3\x00sets 3 in Direct Tuning ModeL4\x00sets 4 in Direct Tuning ModeL5\x00sets 5 in Direct Tuning ModeL6\x00sets 6 in Direct Tuning ModeL7\x00sets 7 in Direct Tuning ModeL8\x00sets 8 in Direct Tuning ModeL9\x00sets 9 in Direct Tuning ModeLBAND\x00Change BANDLDIRECT\x00starts/restarts Direct Tuning ModeLDOWN\x00sets Tuning Frequency Wrap-Around DownLQSTN\x00gets The Tuning FrequencyLUP\x00sets Tuning Frequency Wrap-Around UpP"nnnnn"\x00sets Directly Tuning Frequency (FM nnn.nn MHz / AM nnnnn kHzL0\x00sets 0 in Direct Tuning ModeL1\x00sets 1 in Direct Tuning ModeL2\x00sets 2 in Direct Tuning ModeL3\x00sets 3 in Direct Tuning ModeL4\x00sets 4 in Direct Tuning ModeL5\x00sets 5 in Direct Tuning ModeL6\x00sets 6 in Direct Tuning ModeL7\x00sets 7 in Direct Tuning ModeL8\x00sets 8 in Direct Tuning ModeL9\x00sets 9 in Direct Tuning ModeLBAND\x00Change BANDLDIRECT\x00starts/restarts Direct Tuning ModeLDOWN\x00sets Tuning Frequency Wrap-Around DownLQSTN\x00gets The Tuning FrequencyLUP\x00sets Tuning Frequency Wrap-Around UpP"nnnnn"\x00sets Directly Tuning Frequency (FM nnn.nn MHz / AM nnnnn kHzLAT\x00gets & display DAB Bitrate & Audio TypeLMF\x00gets & display DAB Multicast Band & Freq InfoLMN\x00gets & display DAB Multicast NameLPT\x00gets & display DAB Program InfoLUP\x00gets & dispaly DAB Infomation Wrap-Around UpP"PT:nnnnnnnn"\x00DAB Program Type (8 letters)P"AT:mmmkbps/nnnnnn"\x00DAB Bitrate & Audio Type (m:Bitrate xxxkbps,n:Audio TypeP"MN:nnnnnnnnn"\x00DAB Multiplex Name (9 letters)P"MF:mmm/nnnn.nnMHz"\x00DAB Multiplex Band ID(mmm) & Freq(nnnn.nnMHz) InfoLQSTN\x00gets The Tuning FrequencyP"nnnnnnnnn"\x00Sation Name (9 letters)LQSTN\x00gets HD Radio Artist NameP"nnnnnnnnnn"\x00HD Radio Artist Name (variable-length, 64 letters max)L00\x00sets HD Radio Blend Mode "Auto"L01\x00sets HD Radio Blend Mode "Analog"LQSTN\x00gets the HD Radio Blend Mode StatusLQSTN\x00gets HD Radio Channel NameP"nnnnnnn"\x00HD Radio Channel Name (Station Name) (7lettters)LQSTN\x00gets HD Radio TitleP"nnnnnnnnnn"\x00HD Radio TitleLQSTN\x00gets HD Radio Channel ProgramR01-08\x00sets directly HD Radio Channel ProgramLQSTN\x00gets the HD Radio Tuner StatusP"mmnnoo"\x00HD Radio Tuner Status (3 bytes)LQSTN\x00gets HD Radio TitleP"nnnnnnnnnn"\x00HD Radio Title (variable-length, 64 letters max)L00\x00not exist new firmwareL01\x00exist new firmwareLCMP\x00Device Update is completedLNET\x00start Device Update via NetworkLQSTN\x00gets exist new firmwareLUSB\x00start Device Update via USBP"D**-nn"\x00nn Progress (%)P"Exx-yy"\x00xx=ErrorCode1R01-28\x00Memory Preset No. 1 - 40 ( In hexadecimal representation)LDOWN\x00sets Preset No. Wrap-Around DownLQSTN\x00gets The Preset No.LUP\x00sets Preset No. Wrap-Around UpR01-28\x00sets Preset No. 1 - 40 ( In hexadecimal representation)L00\x00sets Upsampling x1L01\x00sets Upsampling x2L02\x00sets Upsampling x4LQSTN\x00gets The Upscaling StateLUP\x00sets Upsampling Wrap-AroundLDOWN\x00sets Tuning Frequency Wrap-Around DownLQSTN\x00gets The Tuning FrequencyLUP\x00sets Tuning Frequency Wrap-Around UpP"nnnnn"\x00sets Directly Tuning Frequency (FM nnn.nn MHz / AM nnnnnLDOWN\x00sets Volume Level DownLDOWN1\x00sets Volume Level Down 1dB StepLQSTN\x00gets the Volume LevelLUP\x00sets Volume Level UpLUP1\x00sets Volume Level Up 1dB StepR00-C8\x00Volume Level 0.0 - 100.0 ( In hexadecimal representation)R00-64\x00Volume Level 0 - 100 ( In hexadecimal representation)R00-50\x00Volume Level 0 - 80 ( In hexadecimal representation)LDOWN\x00sets Volume Level DownLQSTN\x00gets the Volume LevelLUP\x00sets Volume Level UpR00-64\x00Volume Level 0 - 100 ( In hexadecimal representation)R00-50\x00Volume Level 0 - 80 ( In hexadecimal representation)L00\x00sets D4L01\x00sets ComponentLQSTN\x00gets The Selector PositionL00\x00sets Through StandardL01\x00sets CustomL02\x00sets CinemaL03\x00sets GameL05\x00sets ISF DayL06\x00sets ISF NightL07\x00sets StreamingL08\x00sets Direct BypassLQSTN\x00gets Video Zoom ModeLUP\x00sets Video Zoom Mode Wrap-Around UpL00\x00sets AutoL01\x00sets 4:3L02\x00sets FullL03\x00sets ZoomL04\x00sets Wide ZoomL05\x00sets Smart ZoomLQSTN\x00gets Video Zoom ModeLUP\x00sets Video Zoom Mode Wrap-Around UpLQSTN\x00gets XM Artist NameP"nnnnnnnnnn"\x00XM Artist NameLDOWN\x00sets XM Channel Wrap-Around DownLQSTN\x00gets XM Channel NumberLUP\x00sets XM Channel Wrap-Around UpR000-255\x00XM Channel Number ?000 - 255?LQSTN\x00gets XM Channel NameP"nnnnnnnnnn"\x00XM Channel NameLDOWN\x00sets XM Category Wrap-Around DownLQSTN\x00gets XM CategoryLUP\x00sets XM Category Wrap-Around UpP"nnnnnnnnnn"\x00XM Category InfoLQSTN\x00gets XM TitleP"nnnnnnnnnn"\x00XM TitleLDOWN\x00sets Balance Down (to L 2 Step)LQSTN\x00gets Zone2 BalanceLUP\x00sets Balance Up (to R 2 Step)P"xx"\x00sets Zone2 Balance (xx is "-A"..."00"..."+A"[L+10...0...R+10L00\x00sets Zone2 Muting OffL01\x00sets Zone2 Muting OnLQSTN\x00gets the Zone2 Muting StatusLTG\x00sets Zone2 Muting Wrap-AroundL00\x00sets Zone 2 A/B OffL01\x00sets Zone 2 A/B OnLQSTN\x00gets the Speaker StateL00\x00sets Zone 2 A/B OffL01\x00sets Zone 2 A/B OnLQSTN\x00gets the Speaker StateL00\x00sets Zone2 StandbyL01\x00sets Zone2 OnLQSTN\x00gets the Zone2 Power StatusLBDOWN\x00sets Bass Down (2 Step)LBUP\x00sets Bass Up (2 Step)LQSTN\x00gets Zone2 Tone ("BxxTxx")LTDOWN\x00sets Treble Down (2 Step)LTUP\x00sets Treble Up (2 Step)P"Bxx"\x00sets Zone2 Bass (xx is "-A"..."00"..."+A"[-10...0...+10 2P"Txx"\x00sets Zone2 Treble (xx is "-A"..."00"..."+A"[-10...0...+10 2LDOWN\x00sets Volume Level DownLDOWN1\x00sets Volume Level Down 1dB StepLQSTN\x00gets the Volume LevelLUP\x00sets Volume Level UpLUP1\x00sets Volume Level Up 1dB StepR00-C8\x00Volume Level 0.0 - 100.0 ( In hexadecimal representation)R00-64\x00Volume Level 0 - 100 ( In hexadecimal representation)R00-50\x00Volume Level 0 - 80 ( In hexadecimal representation)'
+ENTRY_AT = b'\x00\x00\x1a\x00_\x00z\x00\xc3\x00\xdf\x00\x0f\x01/\x01N\x01v\x01\xa7\x01\xcb\x01\xf1\x01\x18\x02>\x02j\x02\x9f\x02\xc9\x02\xf8\x02$\x03V\x03\x91\x03\xa4\x03\xc1\x03\xe2\x03\xfd\x03!\x04:\x04R\x04s\x04\x94\x04\xb0\x04\xcb\x04\xef\x04\x13\x054\x05V\x05\x7f\x05\xa8\x05\xc2\x05\xde\x05\xff\x05 \x06=\x06c\x06|\x06\xc4\x06\xdd\x06!\x07[\x07t\x07\xac\x07\xc1\x07\xe6\x07\xfe\x07\x1f\x08^\x08f\x08l\x08r\x08z\x08\x80\x08\x86\x08\x8c\x08\x92\x08\x98\x08\x9e\x08\xa4\x08\xaa\x08\xb6\x08\xc4\x08\xd2\x08\xe0\x08\xee\x08\xfa\x08\x06\t\x12\t\x1e\t*\t6\tC\tL\tZ\tk\tw\t\x81\t\x8e\t\xa1\t\xaf\t\xbd\t\xc8\t\xd3\t\xde\t\xeb\t\xf5\t\x02\n\x0f\n\x1d\n)\nC\nj\np\nz\n\x80\n\x86\n\x8c\n\x92\n\x98\n\x9e\n\xa4\n\xaa\n\xb6\n\xc3\n\xc9\n\xd7\n\xe8\n\xf9\n\x05\x0b\x0f\x0b"\x0b0\x0b8\x0bF\x0bN\x0b\\\x0bg\x0br\x0b\x7f\x0b\x89\x0b\x99\x0b\xa2\x0b\xac\x0b\xbd\x0b\xc8\x0b\xd3\x0b\xde\x0b\xe8\x0b\xee\x0b\xf4\x0b\xfc\x0b\x02\x0c\x08\x0c\x0e\x0c\x14\x0c\x1a\x0c \x0c&\x0c,\x0c;\x0cG\x0c\\\x0ch\x0c~\x0c\x8a\x0c\xa2\x0c\xb0\x0c\xbe\x0c\xca\x0c\xd6\x0c\xe2\x0c\xee\x0c\xfa\x0c\x06\r\x13\r\x1d\r)\r2\rE\rV\rm\r\x8d\r\xa0\r\xaa\r\xb8\r\xc2\r\xd9\r\xee\r\xff\r\x10\x0e\x1c\x0e0\x0e:\x0eM\x0e`\x0eq\x0e\x80\x0e\x8e\x0e\x9c\x0e\xaa\x0e\xb5\x0e\xc1\x0e\xda\x0e\xe8\x0e\xf4\x0e\xff\x0e\n\x0f\x16\x0f\'\x0f3\x0fD\x0fN\x0f`\x0f{\x0f\x8b\x0f\x91\x0f\xa4\x0f\xb5\x0f\xc1\x0f\xd0\x0f\xdc\x0f\xe7\x0f\xfa\x0f\x1a\x10-\x10;\x10A\x10K\x10Q\x10W\x10]\x10c\x10i\x10o\x10u\x10{\x10\x87\x10\x94\x10\xa0\x10\xac\x10\xb5\x10\xc1\x10\xd3\x10\xe1\x10\xeb\x10\xfc\x10\x08\x11\x12\x11%\x113\x11;\x11I\x11T\x11b\x11m\x11x\x11\x85\x11\x8f\x11\x9f\x11\xc0\x11\xf8\x11\xfe\x11\x04\x12\x1c\x12"\x12(\x12.\x124\x12:\x12@\x12F\x12L\x12Y\x12o\x12{\x12\x84\x12\x9d\x12\xa7\x12\xb3\x12\xc2\x12\xd4\x12\xe4\x12\xf2\x12\x00\x13\x0b\x13$\x130\x13@\x13K\x13V\x13`\x13p\x13y\x13\x87\x13\x95\x13\xa6\x13\xb1\x13\xbb\x13\xc4\x13\xd5\x13\xe3\x13\xf1\x13\x02\x14\n\x14\x15\x14 \x14+\x145\x14Q\x14r\x14\x8a\x14\xa2\x14\xb3\x14\xd1\x14\xe0\x14$\x15_\x15\x8e\x15\xa8\x15\xc1\x15\xe3\x15\x05\x16!\x16B\x16Z\x16r\x16\x8e\x16\xab\x16\xce\x16\xf1\x16\x0b\x17-\x17P\x17f\x17~\x17\x9c\x17\xb7\x17\xd3\x17\xf3\x17\x1b\x18@\x18[\x18y\x18\x9c\x18\xb6\x18\xd4\x18\xeb\x18\x01\x19\x1c\x199\x19V\x19o\x19\x8d\x19\xa2\x19\xba\x19\xd3\x19\xef\x19\x08\x1a"\x1aC\x1am\x1a\x9d\x1a\xcd\x1a\xfd\x1a\x1e\x1bC\x1bh\x1b\x92\x1b\xad\x1b\xc7\x1b\xea\x1b\r\x1c\x19\x1c$\x1c1\x1cJ\x1cp\x1c|\x1c\x87\x1c\xa0\x1c\xc6\x1c\xe5\x1c(\x1dK\x1dp\x1d\x99\x1d\xac\x1d\xbe\x1d\xd9\x1d\xf7\x1d\x17\x1eT\x1ef\x1e\x8a\x1e\xab\x1e\xc1\x1e\xd4\x1e\xe6\x1e\x06\x1f/\x1fH\x1fd\x1f\x8d\x1f\xa6\x1f\xc9\x1f\xf6\x1f\x18 @ d \x86 \xaf \xd8 \x03!\x1c!Y!}!\xa6!\xc0!\x01"\x1c"a"\x7f"\xd9"B#`#\xc6#\xe5#\x03$\x1e$0$T$\x8a$\xa2$\xb7$\xce$\xeb$\x11%0%S%m%\xb1%\xca%\x0b&$&e&\x82&\xa4&\xbd&\xfb&\x1b\';\'O\'o\'\x8e\'\xab\'\xc8\'\xe6\'\x03(\x1d(4(C(R(c(y(\x85(\xa0(\xba(\xcd(\xdf(\xf1(\x04)\x15)+)G)n){)\x8e)\xa0)\xb2)\xc8)\xe7)\xfc)\x15*Q*\x8e*\xca*\x07+\x1e+6+I+a+s+\x85+\xaa+\xd4+\xff+3,L,},\x9d,\xd5,\x0c-$-:-]-\x93-\xc8-\xfe-3.M.f.\x7f.\x94.\xc0.\xeb.\x08/*/K/l/\x94/\xbb/\xe2/\xf5/\x1d0E0l0\x900\xb30\xda0\x061&1N1x1\x8e1\xb61\xdf1\x082%2O2w2\x9e2\xc42\xd32\xe22\xef2\x013\x123$393M3j3\x873\x9e3\xd23\t4.4M4u4\x8c4\xa34\xbb4\xda4\x025$5B5b5y5\x905\xa75\xbe5\xd55\xec5\x146/6S6e6x6\x8a6\x9e6\xcc6\xf36\x1c787S7w7\xa47\xbd7\xd57\xf77\x18818I8k8\x8c8\xa88\xce8\xe98\x019#9\\9\x989\xd39\x15:2:w:\x95:\xde:\xfe:\x0e;9;S;\x97;\xb4;\xe7;\x15<1<L<|<\xa0<\xb9<\xdb<\x0e=*=P=\x80=\xce=\x13>5>Q>k>\xa5>\xdf>\xfd>\x18?*?N?p?\x9c?\xda?\x18@C@w@\x99@\xd7@\x02A@AvA\xa0A\xbcA\xdcA\xfaA\x1cBJBlB\x92B\xcaB\xe4B\xfbB\x1fC=CfC\x84C\x96C\xabC\xbbC\xc9C\xebC\x08D*DLDwD\x97D\xb9D\xc7D\xdbD\xedD\x07E+EIErE\x90E\xa0E\xaeE\xd0E\xf2E\x14F?F_F\x81F\x8fF\xa3F\xb5F\xcfF\xe0F\xf1F\x04G\x19G0GMG\x95G\xb1G\xf8GHHeH\xacH\xc8H\xe4H\xfdH\x14I8IVI\x7fI\x9dI\xafI\xbdI\xd2I\xe2I\xf0I\x12J/JQJsJ\x9eJ\xbeJ\xe0J\xeeJ\x02K\x14K.KEKSKcKqK\x7fK\x93K\xa1K\xafK\xc5K\xd5K\xdfK\xf6K\x0fL*LLLeL\x89L\xadL\xcdL\xefL\x10M.M[MuM\x8eM\xb1M\xcdM\xf2M\xfeM\tN\'NRNgN{N\x98N\xb5N\xe0N\xfaN\x0bO\x1bO4OMOsO\x8cO\xaeO\xecO*PPPiP\x8bP\xc9P\x07QEQ\x83Q\xa9Q\xc2Q\xe4Q"R`R\x86R\x9fR\xc1R\xffR=SSS\x8fS\xa5S\xb6S\xd7S\xedS\xfeS\x1fT6THTjT{T\x8cT\x9fT\xc1T\xecT\xfdT\x0eU!UCUnU\x8aU\xa5U\xbfU\xedU\xfdU\x1cV)V6VDVdVsV\x98V\xd3V\xe5V\xf8V\x1dWKWYWvW\x96W\xb5W\xd3W\xfaW!XGXqX\x91X\xb7X\xe1X\xffX YKYeY\x8cY\xaeY\xcdY\xe4Y\x06Z\x1fZ9ZKZZZqZ\x88Z\x9fZ\xabZ\xbcZ\xc7Z\xd7Z\xe5Z\xf3Z\x04[\x0f[\x1a[([H[q[\x88[\x9a[\xae[\xc2[\xd2[\xe4[\xf5[\x02\\\x13\\"\\9\\H\\u\\\x95\\\xbe\\\xdd\\\xf4\\\x16]/]I][]j]\x81]\x98]\xaf]\xc2]\xda]\xe8]\xf6]\x07^\x12^\x1d^+^K^t^\x8b^\x9d^\xb1^\xc5^\xd5^\xe7^\xf8^\x05_\x16_%_<_K_x_\x98_\xc1_\xce_\xe4_\xf3_\x01`\x0e`\x1f`/`;`H`l`\x92`\xa3`\xb4`\xcb`\xd9`\xe8`\x07a\x1ea@aYasa\x85a\x94a\xa6a\xb8a\xcaa\xdda\xeea\xf9a\x11b\x1fb-b>bIbTbbb\x82b\xabb\xc2b\xd4b\xe8b\xfcb\x0bc\x1dc.c;cLc[crc\x81c\x90c\x9fc\xccc\xecc\x15dEdqd\x90d\xa8d\xc1d\xe3d$e3eBeQe`eoe~e\x8de\x99e\xa9e\xb7e\xc5e\xd0e\xdbe\xe6e\xf4e\tf f1f<fHfWfwf\x96f\xadf\xcff\xe8f\x02g\x14g#g:gQghg{g\x8cg\x97g\xa7g\xb5g\xc3g\xd4g\xdfg\xeag\xf8g\x18hAhXhjh~h\x92h\xa2h\xb4h\xc5h\xd2h\xe3h\xf2h\ti\x18i\'i6iBiQi~i\x9ei\xc7i\xdbi\xeei\nj-jAjTjpj\x93j\xb2j\xf2j\x14k;kMkbktk\x92k\xadk\xe7k!l:lSltl\x9bl\xb7l\xd0l\xf3l\x1fmDmlm\x88m\x9fm\xb9m\xd3m\xecm\x08n-n>n\\nkn\xb4n\xefn#o4oRoao\xa8o\xe3o\x15p3pxp\x9cp\xbcp\xddp\x03q%qgq\xa5q\xcdq\xf1q\x16r@rfr\xa6r\xe8r\x0bs*sJsos\x90s\xd1s\x14t<t`t\x85t\xaft\xd5t\x15uWuqu\x8au\xa9u\xc3u\xdcu\xfbu\x15v.vMvkv\x85v\xa5v\xc5v\xe1v#w`wuw\xa2w\xcdw\xf4w\x1cxIxrx\xb5x\xf8x\x1ey@ycy\x8by\xafy\xedy-zTzwz\x9bz\xdaz\xf9z\x18{7{V{u{\x94{\xb3{\xd2{\xf1{\x10|!|K|w|\x96|\xbe|\x03}"}A}`}\x7f}\x9e}\xbd}\xdc}\xfb}\x1a~9~c~\x8f~\xae~\xd6~\x17\x7f6\x7fU\x7ft\x7f\x93\x7f\xb2\x7f\xd1\x7f\xf0\x7f\x0f\x80.\x80M\x80^\x80\x88\x80\xb4\x80\xd3\x80\xfb\x80@\x81_\x81~\x81\x9d\x81\xbc\x81\xdb\x81\xfa\x81\x19\x828\x82W\x82v\x82\x87\x82\xb1\x82\xdd\x82\xfc\x82$\x83i\x83\x94\x83\xc5\x83\xea\x83\r\x84=\x84h\x84\xb5\x84\xe3\x84*\x85I\x85m\x85\x8c\x85\xd0\x85\xf3\x85\x18\x86A\x86a\x86\x9c\x86\xb5\x86\xd1\x86\xf4\x86!\x87E\x87n\x87\x87\x87\xc5\x87\xdf\x87\xf5\x87\x14\x888\x88U\x88u\x88\x8e\x88\xa5\x88\xe5\x88\x0b\x89$\x89F\x89\x84\x89\x9a\x89\xb0\x89\xc6\x89\xe4\x89\x03\x8a/\x8aN\x8av\x8a\xb7\x8a\xd3\x8a\xf9\x8a\x14\x8b,\x8bN\x8b\x8e\x8b\xca\x8b\x05\x8c!\x8c<\x8cT\x8c\x90\x8c\xcb\x8c\xd6\x8c\xe8\x8c\x08\x8d!\x8d0\x8d?\x8dL\x8d\\\x8dn\x8d\x80\x8d\x96\x8d\xb0\x8d\xd7\x8d\xe4\x8d\xf0\x8d\xfd\x8d\n\x8e\x1c\x8e/\x8eI\x8ep\x8e\x89\x8e\xa5\x8e\xcb\x8e\xe7\x8e\t\x8f/\x8fI\x8ff\x8f\x8d\x8f\xa3\x8f\xc6\x8f\xe4\x8f\xf7\x8f\r\x902\x90J\x90k\x90\xad\x90\xc6\x90\xde\x90\x00\x91!\x918\x91N\x91j\x91\x81\x91\x97\x91\xb3\x91\xc9\x91\xda\x91\xfb\x91\x19\x923\x92S\x92s\x92\x8f\x92\xcf\x92\x11\x93-\x93S\x93n\x93\x86\x93\xa8\x93\xe8\x93$\x94_\x94'
+_ENTRY_WIDTH = 2
+FIRST = b'\x00\x00\x02\x00\x04\x00\x06\x00\n\x00\x10\x00\x15\x00\x1a\x00\x1e\x00"\x00&\x00*\x00,\x00.\x000\x004\x008\x00_\x00d\x00\x81\x00\x88\x00\xd0\x00\xd4\x00\xd6\x00\xf7\x00\xf9\x00\x18\x01\x1e\x01(\x01,\x012\x016\x01:\x01>\x01C\x01J\x01N\x01S\x01W\x01]\x01`\x01b\x01d\x01h\x01m\x01q\x01s\x01v\x01z\x01|\x01\x84\x01\x86\x01\x88\x01\x8a\x01\x91\x01\x93\x01\x95\x01\x97\x01\x99\x01\x9c\x01\x9e\x01\x9f\x01\xa3\x01\xa4\x01\xa9\x01\xab\x01\xad\x01\xaf\x01\xb1\x01\xb5\x01\xb8\x01\xbc\x01\xc0\x01\x12\x02\x18\x02\x1c\x02"\x02\'\x02*\x023\x027\x02:\x02>\x02B\x02F\x02N\x02O\x02Q\x02S\x02U\x02X\x02Z\x02b\x02d\x02g\x02i\x02l\x02p\x02r\x02s\x02t\x02v\x02x\x02y\x02z\x02{\x02}\x02\x80\x02\x81\x02\x83\x02\x84\x02\x99\x02\xa9\x02\xae\x02\xb0\x02\xb3\x02\xb5\x02\xb7\x02\xcd\x02\xd9\x02\xdf\x02\xe4\x02\xe9\x02\xed\x02\xf1\x02\xf3\x02\xf7\x02\xfc\x02\x01\x03\x03\x03\x08\x03\r\x03\x0f\x03\x12\x03\x15\x03\x18\x03\x1d\x03"\x03&\x033\x034\x036\x03;\x03?\x03A\x03E\x03j\x03\x8d\x03\x98\x03\x9d\x03\xc4\x03\xc7\x03\xcb\x03\xe1\x03\n\x04\x0e\x04\x12\x04\x14\x04\x16\x04$\x04(\x04*\x04.\x044\x04:\x04<\x04C\x04J\x04Q\x04X\x04[\x04^\x04a\x04h\x04j\x04q\x04x\x04|\x04\x8c\x04\x9b\x04\xab\x04\xbb\x04\xc4\x04\xc6\x04\xc8\x04\xcb\x04\xcd\x04\xcf\x04\xd1\x04\xd3\x04\xd5\x04\xdd\x04\xde\x04\xe2\x04\xe7\x04\xeb\x04\xf3\x04\xf8\x04\xfb\x04\x05\x05\r\x05\x0f\x05\x13\x05\x15\x05\x19\x05\x1b\x05\x1f\x05#\x05&\x05)\x05,\x053\x05;\x05'
+LITERALS = b"\x01\x01\x01\x04\x06\x05\x05\x04\x04\x04\x04\x01\x01\x01\x03\x03'\x05\x1c\x07H\x04\x02 \x01\x1f\x06\n\x03\x03\x04\x03\x04\x05\x07\x03\x05\x03\x06\x03\x01\x01\x04\x05\x04\x01\x03\x04\x01\x08\x01\x01\x01\x06\x01\x01\x01\x01\x01\x01\x00\x04\x00\x05\x01\x01\x01\x01\x03\x03\x04\x03R\x06\x04\x06\x05\x03\t\x04\x03\x04\x04\x04\x05\x00\x01\x01\x02\x00\x01\x07\x00\x00\x00\x01\x04\x01\x00\x00\x01\x01\x00\x00\x00\x01\x03\x00\x01\x00\x15\x10\x00\x01\x01\x01\x00\x16\x0c\x06\x04\x05\x04\x04\x00\x04\x03\x03\x00\x03\x03\x01\x03\x03\x03\x05\x05\x04\r\x01\x01\x04\x03\x01\x03%#\x0b\x05'\x02\x03\x16)\x04\x04\x01\x01\x0e\x03\x01\x04\x03\x03\x01\x05\x05\x05\x05\x03\x03\x03\x05\x01\x05\x05\x03\x0f\x0e\x0f\x0f\x05\x01\x01\x03\x01\x01\x01\x01\x01\x06\x00\x03\x05\x03\x05\x03\x03\n\x08\x01\x03\x01\x03\x01\x03\x04\x03\x03\x03\x05\x05"
+
+
+def _u16(table, i):
+    return table[2 * i] | (table[2 * i + 1] << 8)
+
+
+def _entry_at(i):
+    if _ENTRY_WIDTH == 2:
+        return _u16(ENTRY_AT, i)
+    i *= 4
+    return ENTRY_AT[i] | (ENTRY_AT[i + 1] << 8) | (ENTRY_AT[i + 2] << 16) | (ENTRY_AT[i + 3] << 24)
+
+
+# Compare data[i:j] with the parameter of entry e: <0, 0 or >0.
+def _compare(e, data, i, j):
+    k = _entry_at(e) + 1
+    while True:
+        a = ENTRIES[k]
+        if a == 0:
+            return 0 if i == j else 1
+        if i == j:
+            return -1
+        if data[i] != a:
+            return data[i] - a
+        i += 1
+        k += 1
+
+
+# Index of the 3-letter command code at data[i:], or -1.
+def find(data, i=0):
+    key = (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+    lo = 0
+    hi = COUNT
+    while lo < hi:
+        mid = (lo + hi) // 2
+        k = mid * 3
+        code = (CODES[k] << 16) | (CODES[k + 1] << 8) | CODES[k + 2]
+        if code == key:
+            return mid
+        if code < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return -1
+
+
+def name(index):
+    return NAMES[_u16(NAME_AT, index):_u16(NAME_AT, index + 1)].decode()
+
+
+def code(index):
+    return CODES[index * 3:index * 3 + 3]
+
+
+# Does data[i:j] (same width, digits or capital hex) fall between the two bounds?
+def _between(data, i, j, low, high):
+    if j - i != len(low):
+        return False
+    ge = le = True
+    for k in range(j - i):
+        c = data[i + k]
+        if ge and c != low[k]:
+            if c < low[k]:
+                return False
+            ge = False
+        if le and c != high[k]:
+            if c > high[k]:
+                return False
+            le = False
+    return True
+
+
+# Entry index for the parameter data[i:j] of command index, or -1 if the spreadsheet
+# doesn't allow it. Literals are found with a binary search, then ranges and patterns are
+# checked in order.
+def find_param(index, data, i, j):
+    first = _u16(FIRST, index)
+    lo = first
+    hi = first + LITERALS[index]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        c = _compare(mid, data, i, j)
+        if c == 0:
+            return mid
+        if c < 0:
+            hi = mid
+        else:
+            lo = mid + 1
+    for e in range(first + LITERALS[index], _u16(FIRST, index + 1)):
+        start = _entry_at(e)
+        kind = ENTRIES[start]
+        if kind == 0x50:   # pattern: can't check it, so take it
+            return e
+        bounds = ENTRIES[start + 1:ENTRIES.index(b"\0", start)].split(b"-")
+        if kind == 0x52 and _between(data, i, j, bounds[0], bounds[1]):
+            return e
+        if kind == 0x53 and j > i:
+            # bounds are b"", b"1E", b"000", b"+18" for "-1E"-"000"-"+18"
+            if data[i] == 0x2D and _between(data, i + 1, j, b"0" * len(bounds[1]), bounds[1]):
+                return e
+            if data[i] == 0x2B and _between(data, i + 1, j, b"0" * (len(bounds[3]) - 1), bounds[3][1:]):
+                return e
+            if _between(data, i, j, bounds[2], bounds[2]):
+                return e
+    return -1
+
+
+# Parameter and description of an entry.
+def param(entry):
+    start = _entry_at(entry)
+    end = ENTRIES.index(b"\0", start)
+    return ENTRIES[start + 1:end], ENTRIES[end + 1:_entry_at(entry + 1)].decode()
+
+
+# (command name, parameter description) for a status message like b"1MVL28", with None
+# for the description if the parameter isn't in the spreadsheet. None if the command isn't.
+def decode(frame):
+    if len(frame) < 4:
+        return None
+    index = find(frame, 1)
+    if index < 0:
+        return None
+    entry = find_param(index, frame, 4, len(frame))
+    return name(index), (param(entry)[1] if entry >= 0 else None)
+
+
+# Complete command ready for the UART, e.g. encode(b"MVL", b"28") == b"!1MVL28\r".
+# Raises ValueError if the spreadsheet doesn't have the command or the parameter.
+def encode(code, parameter):
+    index = find(code)
+    if index < 0:
+        raise ValueError("unknown ISCP command")
+    if find_param(index, parameter, 0, len(parameter)) < 0:
+        raise ValueError("bad parameter for " + name(index))
+    return b"!1" + bytes(code) + bytes(parameter) + b"\r"
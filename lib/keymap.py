@@ -0,0 +1,104 @@
+# Generated by tools/build_keymap.py from layout.toml. Don't edit by hand.
+
+import iscp
+
+KEY_COUNT = 12
+DIM_COUNT = 3
+
+# Key number -> command to send, ready to write to the UART
+KEY_COMMANDS = (
+    b'!1SLI12\r',  # 0 TV
+    b'!1SLI02\r',  # 1 G1
+    b'!1SLI23\r',  # 2 CD
+    b'!1SLI10\r',  # 3 DVD
+    b'!1SLI2B\r',  # 4 NET
+    b'!1SLI11\r',  # 5 STM
+    b'!1SLI05\r',  # 6 PC
+    b'!1SLI04\r',  # 7 G2
+    b'!1SLI01\r',  # 8 CBL
+    b'!1SLI03\r',  # 9 AUX
+    b'!1SLI26\r',  # 10 TUN
+    b'!1PWR00\r',  # 11 PWR_OFF
+)
+
+# Status message -> key whose LED it lights, as {code_key: {parameter: key}}
+STATUS_KEYS = {
+    0x534C49: {  # SLI
+        0x12: 0,  # 1SLI12
+        0x02: 1,  # 1SLI02
+        0x23: 2,  # 1SLI23
+        0x10: 3,  # 1SLI10
+        0x2B: 4,  # 1SLI2B
+        0x11: 5,  # 1SLI11
+        0x05: 6,  # 1SLI05
+        0x04: 7,  # 1SLI04
+        0x01: 8,  # 1SLI01
+        0x03: 9,  # 1SLI03
+        0x26: 10,  # 1SLI26
+        0x24: 10,  # 1SLI24
+        0x25: 10,  # 1SLI25
+        0x22: 11,  # 1SLI22
+        0x2E: 11,  # 1SLI2E
+    },
+    0x505752: {  # PWR
+        0x00: 11,  # 1PWR00
+    },
+}
+
+# Key number -> LED level at each dim setting
+DIM_LEVELS = (
+    (65535, 20000, 2000),  # 0
+    (65535, 20000, 2000),  # 1
+    (65535, 20000, 2000),  # 2
+    (65535, 20000, 2000),  # 3
+    (65535, 20000, 2000),  # 4
+    (65535, 20000, 2000),  # 5
+    (65535, 20000, 2000),  # 6
+    (65535, 20000, 2000),  # 7
+    (65535, 20000, 2000),  # 8
+    (65535, 20000, 2000),  # 9
+    (65535, 20000, 2000),  # 10
+    (65535, 20000, 2000),  # 11
+)
+
+# The off key, and the status message that means the receiver turned off
+POWER_OFF_KEY = 11
+POWER_OFF_CODE = 0x505752  # PWR
+POWER_OFF_PARAM = 0x00
+
+# Keys that change the volume while they're held (-1 if none), and the highest level
+VOLUME_UP_KEY = 12
+VOLUME_DOWN_KEY = 13
+VOLUME_MAX = 0x64
+
+# Scenes, each a tuple of steps as (command, code_key, value, base, timeout_ms,
+# retries). See lib/scenes.py.
+SCENES = (
+    (  # 0 VINYL
+        (b'!1PWR01\r', 0x505752, 0x01, 16, 3000, 3),  # PWR_ON
+        (b'!1SLI02\r', 0x534C49, 0x02, 16, 1000, 3),  # G1
+        (b'!1LMD01\r', 0x4C4D44, 0x01, 16, 1000, 3),  # 1LMD01
+        (b'!1MVL30\r', 0x4D564C, 0x30, 16, 1000, 3),  # 1MVL30
+    ),
+)
+
+# Key number -> scene it runs
+SCENE_KEYS = {
+    14: 0,  # VINYL
+}
+
+
+# Key whose LED a status frame from the parser (e.g. b"1SLI12") lights, or -1.
+def status_key(frame):
+    if len(frame) != 6:
+        return -1
+    params = STATUS_KEYS.get(iscp.code_key(frame, 1))
+    if params is None:
+        return -1
+    return params.get(iscp.param_int(frame, 4), -1)
+
+
+# True if a status frame says the receiver turned off.
+def is_power_off(frame):
+    return len(frame) == 6 and iscp.code_key(frame, 1) == POWER_OFF_CODE and \
+        iscp.param_int(frame, 4) == POWER_OFF_PARAM
@@ -0,0 +1,116 @@
+# Key press to LED latency tracing for the Onkyo keypad.
+#
+# What you notice on the keypad is the time from pressing a button to its LED lighting up,
+# and that time is spread over a few stages: our loop picking up the key and writing the
+# command, the receiver thinking about it, the status message crawling back over the 9600
+# baud link, and our loop parsing it and pushing the LEDs. The trace stamps monotonic_ns at
+# each stage of the most recent key presses into a fixed-size ring buffer:
+#
+#   key         key event picked up from the keypad
+#   write       the key's command written to the receiver
+#   first byte  first byte back from the receiver after the write
+#   parsed      the receiver's echo of the command parsed
+#   shown       the next LED frame pushed after that
+#
+# Stamping is a couple of comparisons and an array store, so it stays on all the time.
+# report() prints p50/p95/max for each stage over everything in the buffer, so you can tell
+# whether the receiver, the serial link or our own loop is the slow part.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+from array import array
+
+KEY = 0
+WRITE = 1
+FIRST_BYTE = 2
+PARSED = 3
+SHOWN = 4
+STAGE_COUNT = 5
+
+STAGE_NAMES = ("key", "write", "first byte", "parsed", "shown")
+
+
+class LatencyTrace:
+    def __init__(self, size=32):
+        self.size = size
+        # size records of STAGE_COUNT stamps each. 0 means the stage never happened.
+        self.stamps = array('q', [0] * (size * STAGE_COUNT))
+        self.head = size - 1      # record the latest key press went into
+        self.stage = STAGE_COUNT  # next stage expected for that record, STAGE_COUNT once done
+        self.command = None       # command the latest key press sent
+        self.count = 0            # key presses traced since the last clear()
+
+    def clear(self):
+        stamps = self.stamps
+        for i in range(len(stamps)):
+            stamps[i] = 0
+        self.stage = STAGE_COUNT
+        self.command = None
+        self.count = 0
+
+    # A key press that queues command. Starts a new record, overwriting the oldest one. A
+    # press that never got all the way to the LEDs is left incomplete.
+    def key(self, command, now_ns):
+        self.head += 1
+        if self.head == self.size:
+            self.head = 0
+        base = self.head * STAGE_COUNT
+        stamps = self.stamps
+        stamps[base] = now_ns
+        for i in range(1, STAGE_COUNT):
+            stamps[base + i] = 0
+        self.command = command
+        self.stage = WRITE
+        self.count += 1
+
+    # Stamp stage for the latest key press if it's the next one expected.
+    def mark(self, stage, now_ns):
+        if stage == self.stage:
+            self.stamps[self.head * STAGE_COUNT + stage] = now_ns
+            self.stage += 1
+
+    # A command was written to the receiver. Only counts if it's the key's own command.
+    def written(self, frame, now_ns):
+        if self.stage == WRITE and frame is self.command:
+            self.mark(WRITE, now_ns)
+
+    # A status message was parsed (e.g. b"1SLI12"). Only counts if it echoes the key's
+    # command (b"!1SLI12\r").
+    def parsed(self, frame, now_ns):
+        if self.stage != PARSED:
+            return
+        command = self.command
+        n = len(frame)
+        if n != len(command) - 2:
+            return
+        for i in range(n):
+            if frame[i] != command[i + 1]:
+                return
+        self.mark(PARSED, now_ns)
+
+    # Print p50/p95/max in ms for each stage, plus the total from key to LED.
+    def report(self, out=print):
+        records = min(self.count, self.size)
+        out("latency over the last {} key presses (ms)".format(records))
+        out("{:<22}{:>8}{:>8}{:>8}{:>6}".format("stage", "p50", "p95", "max", "n"))
+        for stage in range(WRITE, STAGE_COUNT):
+            self._report_row(out, STAGE_NAMES[stage - 1] + " -> " + STAGE_NAMES[stage],
+                             stage - 1, stage)
+        self._report_row(out, "key -> shown", KEY, SHOWN)
+
+    def _report_row(self, out, name, start, end):
+        times = []
+        stamps = self.stamps
+        for base in range(0, len(stamps), STAGE_COUNT):
+            if stamps[base + start] and stamps[base + end]:
+                times.append(stamps[base + end] - stamps[base + start])
+        if not times:
+            out("{:<22}{:>8}{:>8}{:>8}{:>6}".format(name, "-", "-", "-", 0))
+            return
+        times.sort()
+        n = len(times)
+        out("{:<22}{:>8.2f}{:>8.2f}{:>8.2f}{:>6}".format(
+            name, times[n // 2] / 1000000, times[min(n - 1, n * 95 // 100)] / 1000000,
+            times[-1] / 1000000, n))
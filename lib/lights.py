@@ -0,0 +1,259 @@
+# LED helpers for the Onkyo keypad.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py (or
+# main-trellis.py).
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+from array import array
+
+
+# LED backends.
+#
+# The frame buffer below works with any LED hardware that has two methods:
+#
+#   set_channel(channel, value)  stage one LED at value from 0 to 65535 without sending it
+#   show()                       send everything staged so far in one go
+#
+# The TLC59711 driver already works that way: set_channel() only changes its copy of the
+# 28 bytes and show() clocks them all out over SPI, so main.py hands it over as it is. The
+# classes below adapt the NeoTrellis and plain PWM pins to the same two methods.
+
+
+# The NeoTrellis prototype's 16 NeoPixels. Each one is driven by the seesaw chip behind
+# I2C, and with auto_write on (the default) every pixel write is its own I2C transaction
+# plus another one to show it. With auto_write off, writes only change the local copy of
+# the pixels and show() sends the whole strip at once. Levels are scaled into color, which
+# can be changed at any time and applies to the channels set after that. Colors are packed
+# 0xRRGGBB ints, which the pixel buffer takes without allocating a tuple for each one.
+class NeoTrellisLeds:
+    def __init__(self, pixels, color=0xFFFFFF):
+        self.pixels = pixels
+        pixels.auto_write = False
+        self.channel_count = len(pixels)
+        self.color = color
+
+    def set_channel(self, channel, value):
+        color = self.color
+        r = ((color >> 16) & 0xFF) * value // 65535
+        g = ((color >> 8) & 0xFF) * value // 65535
+        b = (color & 0xFF) * value // 65535
+        self.pixels[channel] = (r << 16) | (g << 8) | b
+
+    def show(self):
+        self.pixels.show()
+
+
+# LEDs on their own PWM pins, as in main-pwm.py. There's no bus to batch: setting the duty
+# cycle writes straight to the timer, so show() has nothing to do.
+class PwmLeds:
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.channel_count = len(outputs)
+
+    def set_channel(self, channel, value):
+        self.outputs[channel].duty_cycle = value
+
+    def show(self):
+        pass
+
+
+# Shadow copy of the LED channels in front of the LED backend.
+#
+# The code sets channels on the frame buffer as often as it likes, and the buffer only talks
+# to the backend when something actually changed. Only the channels that differ from what's
+# on the LEDs get staged, followed by a single show(), and pushes are capped at fps frames
+# per second. on_dirty is called when the buffer goes from clean to dirty so whoever pushes
+# it can wake up.
+class FrameBuffer:
+    def __init__(self, leds, channel_count=12, fps=100, on_dirty=None):
+        self.leds = leds
+        self.channels = array('H', [0] * channel_count)
+        self.pushed = array('H', [0] * channel_count)
+        self.dirty = False
+        self.frame_ns = 1000000000 // fps
+        self.next_push_ns = 0
+        self.on_dirty = on_dirty
+        self.push_count = 0
+
+    def set(self, channel, value):
+        if self.channels[channel] != value:
+            self.channels[channel] = value
+            self._mark_dirty()
+
+    def fill(self, value):
+        channels = self.channels
+        for i in range(len(channels)):
+            if channels[i] != value:
+                channels[i] = value
+                self._mark_dirty()
+
+    def _mark_dirty(self):
+        if not self.dirty:
+            self.dirty = True
+            if self.on_dirty is not None:
+                self.on_dirty()
+
+    # Send the frame to the LEDs if it changed and the frame rate allows. Returns 0 when
+    # there's nothing left to do, or the number of ns to wait before the next push is allowed.
+    def push(self, now_ns):
+        if not self.dirty:
+            return 0
+        if now_ns < self.next_push_ns:
+            return self.next_push_ns - now_ns
+        channels = self.channels
+        pushed = self.pushed
+        leds = self.leds
+        for i in range(len(channels)):
+            if channels[i] != pushed[i]:
+                leds.set_channel(i, channels[i])
+                pushed[i] = channels[i]
+        leds.show()
+        self.dirty = False
+        self.push_count += 1
+        self.next_push_ns = now_ns + self.frame_ns
+        return 0
+
+
+# Fade curve from level down to 0 in steps entries. Our eyes see brightness roughly as the
+# duty cycle to the power of 1/2.2, so a fade that's linear in duty cycle looks like it
+# hangs at full brightness and then drops off a cliff. Spacing the steps along
+# (1 - t) ** gamma makes the fade look even from start to finish. The last entry is 0.
+def fade_curve(level, steps=64, gamma=2.2):
+    curve = array('H', [0] * steps)
+    for i in range(steps - 1):
+        curve[i] = int(level * (1 - i / (steps - 1)) ** gamma + 0.5)
+    return curve
+
+
+# What an animation does with its channel. NONE leaves the channel to the layers below.
+NONE = 0
+HOLD = 1
+FADE = 2
+PULSE = 3
+
+
+# Layered LED animations.
+#
+# Every channel can have one animation on each layer, and any number of them run at once:
+#
+#   hold   stay at level
+#   fade   stay at level until start_ns, then fade over duration_ms to whatever the layers
+#          below show, and drop out
+#   pulse  from start_ns, fade from level to whatever the layers below show and back again,
+#          once every period_ms
+#
+# Higher layers go on top of lower ones, and because fades and pulses blend into what's
+# underneath, a key that's lit on both layers stays lit while the top layer fades away.
+# render() works out every channel from the bottom layer up and sets the result on the frame
+# buffer, which only sends what changed. It skips empty layers, so a tick costs about as much
+# as the animations that are running.
+#
+# Fades and pulses follow one gamma-corrected curve (see fade_curve()) in steps, timed from
+# their start no matter how late render() gets called, so a stalled loop skips steps instead
+# of stretching the fade. All the state lives in arrays allocated up front.
+class Compositor:
+    def __init__(self, channel_count=12, layer_count=2, steps=64):
+        self.channel_count = channel_count
+        self.layer_count = layer_count
+        self.steps = steps
+        self.curve = fade_curve(65535, steps)
+        size = channel_count * layer_count
+        self.kind = bytearray(size)
+        self.level = array('H', [0] * size)
+        self.start_ns = array('q', [0] * size)
+        self.duration_ns = array('q', [0] * size)
+        self.values = array('H', [0] * channel_count)
+        self.active = array('H', [0] * layer_count)   # animations on each layer
+        self.moving = 0                               # fades and pulses, which need ticks
+
+    def _set(self, layer, channel, kind, level, start_ns, duration_ns):
+        i = layer * self.channel_count + channel
+        old = self.kind[i]
+        if old == NONE:
+            self.active[layer] += 1
+        elif old != HOLD:
+            self.moving -= 1
+        if kind == NONE:
+            self.active[layer] -= 1
+        elif kind != HOLD:
+            self.moving += 1
+        self.kind[i] = kind
+        self.level[i] = level
+        self.start_ns[i] = start_ns
+        self.duration_ns[i] = duration_ns
+
+    def hold(self, layer, channel, level):
+        self._set(layer, channel, HOLD, level, 0, 0)
+
+    def fade(self, layer, channel, level, start_ns, duration_ms):
+        self._set(layer, channel, FADE, level, start_ns, duration_ms * 1000000)
+
+    def pulse(self, layer, channel, level, start_ns, period_ms):
+        self._set(layer, channel, PULSE, level, start_ns, period_ms * 1000000)
+
+    # Take one channel, or every channel with channel=-1, off a layer.
+    def clear(self, layer, channel=-1):
+        if channel >= 0:
+            if self.kind[layer * self.channel_count + channel] != NONE:
+                self._set(layer, channel, NONE, 0, 0, 0)
+            return
+        for channel in range(self.channel_count):
+            if self.kind[layer * self.channel_count + channel] != NONE:
+                self._set(layer, channel, NONE, 0, 0, 0)
+
+    # Work out every channel for now_ns and set it on frame. Returns the time the next fade or
+    # pulse step is due, or 0 if nothing is moving.
+    def render(self, now_ns, frame):
+        count = self.channel_count
+        steps = self.steps
+        curve = self.curve
+        kinds = self.kind
+        levels = self.level
+        starts = self.start_ns
+        durations = self.duration_ns
+        values = self.values
+        next_ns = 0
+        for channel in range(count):
+            values[channel] = 0
+        for layer in range(self.layer_count):
+            if not self.active[layer]:
+                continue
+            base = layer * count
+            for channel in range(count):
+                i = base + channel
+                kind = kinds[i]
+                if kind == NONE:
+                    continue
+                if kind == HOLD:
+                    values[channel] = levels[i]
+                    continue
+                elapsed = now_ns - starts[i]
+                duration = durations[i]
+                if elapsed < 0:
+                    # Not started yet. A fade holds its level, a pulse shows what's below.
+                    due = starts[i]
+                    if kind == FADE:
+                        values[channel] = levels[i]
+                elif kind == FADE:
+                    step = elapsed * steps // duration
+                    if step >= steps - 1:
+                        # Done. What's below shows through from now on.
+                        self._set(layer, channel, NONE, 0, 0, 0)
+                        continue
+                    below = values[channel]
+                    values[channel] = below + (levels[i] - below) * curve[step] // 65535
+                    due = starts[i] + (step + 1) * duration // steps
+                else:
+                    # Down the curve for the first half of the period and back up the second.
+                    cycle = elapsed // duration
+                    step = (elapsed - cycle * duration) * 2 * steps // duration
+                    below = values[channel]
+                    weight = curve[step] if step < steps else curve[2 * steps - 1 - step]
+                    values[channel] = below + (levels[i] - below) * weight // 65535
+                    due = starts[i] + cycle * duration + (step + 1) * duration // (2 * steps)
+                if next_ns == 0 or due < next_ns:
+                    next_ns = due
+        for channel in range(count):
+            frame.set(channel, values[channel])
+        return next_ns
@@ -0,0 +1,92 @@
+# Per-task profiler for the Onkyo keypad.
+#
+# Each task in main.py does a little work and goes back to sleep. The profiler adds up how
+# long each one runs between sleeps, how many times it ran and its worst run, so we can see
+# which one eats the loop's time. A separate probe keeps a histogram of how late the event
+# loop wakes up a task that asked to sleep a fixed time, which is the jitter every task
+# sees. Everything lives in arrays allocated up front, so profiling doesn't feed the
+# garbage collector while it's measuring.
+#
+# main.py only uses this when PROFILE is set. With it off, the const() lets the compiler
+# drop the profiling code altogether and this file never gets imported.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import time
+from array import array
+
+# Upper bounds of the lag histogram buckets in us. The last bucket takes everything longer.
+LAG_BOUNDS_US = (250, 500, 1000, 2000, 5000, 10000, 20000)
+
+
+class Profiler:
+    def __init__(self, names, lag_bounds_us=LAG_BOUNDS_US):
+        count = len(names)
+        self.names = names
+        self.started = array('q', [0] * count)
+        self.total = array('q', [0] * count)
+        self.worst = array('q', [0] * count)
+        self.calls = array('L', [0] * count)
+        self.bounds = array('L', lag_bounds_us)
+        self.histogram = array('L', [0] * (len(lag_bounds_us) + 1))
+        self.worst_lag = 0
+        self.since = time.monotonic_ns()
+
+    def reset(self):
+        for i in range(len(self.names)):
+            self.total[i] = 0
+            self.worst[i] = 0
+            self.calls[i] = 0
+        for i in range(len(self.histogram)):
+            self.histogram[i] = 0
+        self.worst_lag = 0
+        self.since = time.monotonic_ns()
+
+    # Bracket a task's work between sleeps with start(slot) and stop(slot).
+    def start(self, slot):
+        self.started[slot] = time.monotonic_ns()
+
+    def stop(self, slot):
+        elapsed = time.monotonic_ns() - self.started[slot]
+        self.total[slot] += elapsed
+        self.calls[slot] += 1
+        if elapsed > self.worst[slot]:
+            self.worst[slot] = elapsed
+
+    # How much later than asked the loop woke up the lag probe.
+    def lag(self, lag_ns):
+        us = lag_ns // 1000
+        bounds = self.bounds
+        i = 0
+        while i < len(bounds) and us >= bounds[i]:
+            i += 1
+        self.histogram[i] += 1
+        if lag_ns > self.worst_lag:
+            self.worst_lag = lag_ns
+
+    def report(self, out=print):
+        elapsed = time.monotonic_ns() - self.since
+        out("profile over {:.1f} s".format(elapsed / 1000000000))
+        out("{:<10}{:>8}{:>10}{:>8}{:>8}{:>8}".format(
+            "task", "calls", "total ms", "busy %", "avg us", "max us"))
+        busy = 0
+        for i in range(len(self.names)):
+            calls = self.calls[i]
+            total = self.total[i]
+            busy += total
+            out("{:<10}{:>8}{:>10.1f}{:>8.2f}{:>8}{:>8}".format(
+                self.names[i], calls, total / 1000000, 100 * total / elapsed,
+                total // calls // 1000 if calls else 0, self.worst[i] // 1000))
+        out("{:<10}{:>8}{:>10.1f}{:>8.2f}".format("all", "", busy / 1000000, 100 * busy / elapsed))
+        line = "loop lag"
+        low = 0
+        for i in range(len(self.histogram)):
+            if i < len(self.bounds):
+                line += "  {}-{}us:{}".format(low, self.bounds[i], self.histogram[i])
+                low = self.bounds[i]
+            else:
+                line += "  {}us+:{}".format(low, self.histogram[i])
+        out(line)
+        out("worst loop lag {} us".format(self.worst_lag // 1000))
@@ -0,0 +1,115 @@
+# Cached state of the receiver, kept up to date from the ISCP status messages.
+#
+# The receiver reports every change it makes over the serial port, whether it came from us,
+# the front panel, the IR remote or the network, so watching the status stream is enough to
+# know what it's doing without asking it over a slow serial link. Queries are only sent for
+# things we don't know yet (or that have gone stale), and are retried if no answer comes.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import iscp
+
+# State slots. Values are ints: power and mute are 0/1, input and listening mode are the
+# hex selector codes (0x2B for NET), volume is the hex MVL level (0x00-0x64, or 0x00-0xC8 on
+# receivers that count it in 0.5 steps), and tuner is the decimal TUN frequency (8750 for
+# FM 87.50 MHz, 1530 for AM 1530 kHz).
+POWER = 0
+INPUT = 1
+VOLUME = 2
+MUTE = 3
+LISTENING_MODE = 4
+TUNER = 5
+SLOT_COUNT = 6
+
+# Command code for each slot, and the base its parameter is written in.
+CODES = (b'PWR', b'SLI', b'MVL', b'AMT', b'LMD', b'TUN')
+BASES = (16, 16, 16, 16, 16, 10)
+
+# Query for each slot, ready to go to the transmit queue.
+QUERIES = tuple(b'!1' + code + b'QSTN\r' for code in CODES)
+
+_SLOTS = {iscp.code_key(code): slot for slot, code in enumerate(CODES)}
+
+
+class ReceiverState:
+    def __init__(self, retry_ms=2000):
+        self.retry_ns = retry_ms * 1000000
+        self.values = [None] * SLOT_COUNT
+        self.updated_ns = [0] * SLOT_COUNT
+        self.asked_ns = [None] * SLOT_COUNT
+        self.retries = 0
+
+    # Keep up to date from the status messages an iscp.Dispatcher hands out. Subscribe before
+    # anything else that reads the state, so it sees each message's new value.
+    def subscribe(self, dispatcher):
+        for slot in range(SLOT_COUNT):
+            dispatcher.subscribe(iscp.code_key(CODES[slot]), self._handler(slot))
+
+    def _handler(self, slot):
+        base = BASES[slot]
+
+        def on_status(params, now_ns):
+            self._set(slot, iscp.param_int(params, 0, base), now_ns)
+
+        return on_status
+
+    def _set(self, slot, value, now_ns):
+        if value < 0:
+            return False
+        self.values[slot] = value
+        self.updated_ns[slot] = now_ns
+        self.asked_ns[slot] = None
+        return True
+
+    # Current value of a slot, or None if we haven't heard it yet.
+    def get(self, slot):
+        return self.values[slot]
+
+    # Current value for a command code as an int from iscp.code_key(), or None if it isn't
+    # one we track or we haven't heard it yet.
+    def value(self, code):
+        slot = _SLOTS.get(code, -1)
+        return None if slot < 0 else self.values[slot]
+
+    @property
+    def power(self):
+        return self.values[POWER]
+
+    @property
+    def input(self):
+        return self.values[INPUT]
+
+    @property
+    def volume(self):
+        return self.values[VOLUME]
+
+    # True if we have a value for slot that's no older than max_age_ms (0 means it never
+    # goes stale, which is right for anything the receiver reports on its own).
+    def known(self, slot, now_ns, max_age_ms=0):
+        if self.values[slot] is None:
+            return False
+        return not max_age_ms or now_ns - self.updated_ns[slot] <= max_age_ms * 1000000
+
+    # Queue a query for slot if its value is unknown or stale and we aren't already waiting
+    # on an answer. Returns True if a query was queued.
+    def refresh(self, slot, now_ns, tx_queue, max_age_ms=0):
+        if self.known(slot, now_ns, max_age_ms):
+            return False
+        asked_ns = self.asked_ns[slot]
+        if asked_ns is not None:
+            if now_ns - asked_ns < self.retry_ns:
+                return False
+            self.retries += 1
+        tx_queue.put(QUERIES[slot])
+        self.asked_ns[slot] = now_ns
+        return True
+
+    # Forget everything, e.g. after the serial link was lost, so every slot reads as unknown
+    # and the next refresh() asks for it straight away.
+    def clear(self):
+        for slot in range(SLOT_COUNT):
+            self.values[slot] = None
+            self.updated_ns[slot] = 0
+            self.asked_ns[slot] = None
@@ -0,0 +1,135 @@
+# Scenes for the Onkyo keypad: one key runs a series of commands, like power on, turntable,
+# direct mode and a set volume for listening to records.
+#
+# Sending them with fixed sleeps in between is slow when the receiver is quick and breaks
+# when it isn't. Instead each step goes out as soon as the receiver reports the one before
+# it done: a status message with the same code and, for commands that set a value, the same
+# value. Steps the receiver is already at are skipped. If the status doesn't show up within
+# the step's timeout the command is sent again, and after its retries run out the scene is
+# given up, so a receiver that's ignoring us never holds anything up. Everything here is
+# driven from service() and acknowledge(), nothing waits, and the keypad keeps working
+# while a scene runs. Pressing another key stops it.
+#
+# Scenes come from layout.toml through keymap.SCENES, as tuples of steps:
+#
+#   (command, code_key, value, base, timeout_ms, retries)
+#
+# command is the encoded command, code_key and value are what the status message that
+# acknowledges it looks like (see iscp.code_key() and iscp.param_int()), with value -1 for
+# commands like MVLUP that any status with the same code answers.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import iscp
+
+COMMAND = 0
+CODE = 1
+VALUE = 2
+BASE = 3
+TIMEOUT_MS = 4
+RETRIES = 5
+
+POWER_ON = b'!1PWR01\r'
+_PWR = iscp.code_key(b'PWR')
+_SLI = iscp.code_key(b'SLI')
+
+
+# A scene for an input key pressed while the receiver is off: power on, then select the
+# input the moment the receiver says it's on. Returns None for keys that don't select an
+# input, like the off key. Builds the steps from the encoded command, e.g. b"!1SLI12\r", so
+# call it once at startup rather than on every press.
+def power_on(command, power_timeout_ms=3000, timeout_ms=1000, retries=3):
+    if not command or iscp.code_key(command, 2) != _SLI:
+        return None
+    return ((POWER_ON, _PWR, 0x01, 16, power_timeout_ms, retries),
+            (command, _SLI, iscp.param_int(command[:-1], 5), 16, timeout_ms, retries))
+
+
+class SceneRunner:
+    def __init__(self, scenes, tx_queue, state, on_ready=None):
+        self.scenes = scenes
+        self.tx_queue = tx_queue
+        self.state = state
+        self.on_ready = on_ready
+        self.steps = None        # steps of the running scene, or None
+        self.index = 0           # step we're on
+        self.tries = 0           # times its command has been sent
+        self.sent_ns = 0
+        self.started_ns = 0
+        self.completed = 0
+        self.aborted = 0
+        self.resent = 0
+        self.last_ms = 0         # how long the last completed scene took
+
+    @property
+    def running(self):
+        return self.steps is not None
+
+    # Start a scene, stopping any that's already running, and send its first step. on_ready
+    # is called so whoever calls service() knows there's a timeout to watch.
+    def start(self, scene, now_ns):
+        self.run(self.scenes[scene], now_ns)
+
+    # Same as start() for steps that aren't one of the scenes, like power_on()'s.
+    def run(self, steps, now_ns):
+        self.stop()
+        self.steps = steps
+        self.index = 0
+        self.tries = 0
+        self.started_ns = now_ns
+        self.service(now_ns)
+        if self.on_ready is not None:
+            self.on_ready()
+
+    def stop(self):
+        if self.steps is not None:
+            self.steps = None
+            self.aborted += 1
+
+    # Call with every status message from the receiver (e.g. b"1SLI02"). Sends the next step
+    # right away if this one was waiting on it.
+    def acknowledge(self, frame, now_ns):
+        if self.steps is None or not self.tries or len(frame) < 5:
+            return
+        step = self.steps[self.index]
+        if iscp.code_key(frame, 1) != step[CODE]:
+            return
+        if step[VALUE] >= 0 and iscp.param_int(frame, 4, step[BASE]) != step[VALUE]:
+            return
+        self._next(now_ns)
+        self.service(now_ns)
+
+    def _next(self, now_ns):
+        self.index += 1
+        self.tries = 0
+        if self.index == len(self.steps):
+            self.steps = None
+            self.completed += 1
+            self.last_ms = (now_ns - self.started_ns) // 1000000
+
+    # Send the next step, or resend one that timed out. Returns 0 when no scene is running,
+    # otherwise the number of ns until the current step times out.
+    def service(self, now_ns):
+        while self.steps is not None:
+            step = self.steps[self.index]
+            value = step[VALUE]
+            # Already there? That covers a power on with the receiver already on, and a
+            # status that got through while we weren't looking.
+            if value >= 0 and self.state.value(step[CODE]) == value:
+                self._next(now_ns)
+                continue
+            if self.tries:
+                timeout_ns = self.sent_ns + step[TIMEOUT_MS] * 1000000
+                if now_ns < timeout_ns:
+                    return timeout_ns - now_ns
+                if self.tries > step[RETRIES]:
+                    self.stop()
+                    return 0
+                self.resent += 1
+            self.tx_queue.put(step[COMMAND], urgent=True)
+            self.tries += 1
+            self.sent_ns = now_ns
+            return step[TIMEOUT_MS] * 1000000
+        return 0
@@ -0,0 +1,81 @@
+# The receiver's power and input, saved in the M4's non-volatile memory.
+#
+# At boot the keypad doesn't know what the receiver is doing until it answers the power and
+# input queries, a few hundred ms in, and until then the LEDs are dark or wrong. Saving the
+# last power and input lets main.py light the right key (or none) with its very first frame
+# and then fix it up from the receiver's answers if anything changed while we were off.
+#
+# microcontroller.nvm is flash, and every write to it costs an erase, so writes are kept to
+# a minimum: nothing is written until the state has been the same for delay_ms (flipping
+# through inputs is one write, not one per input), nothing is written if it matches what's
+# already saved, and the whole record is four bytes that go out in one write:
+#
+#   MAGIC, power, input, check
+#
+# where check is the other three XORed together and inverted, so blank (0xFF) or corrupt
+# memory reads as nothing saved.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+MAGIC = 0x4B
+SIZE = 4
+
+
+class Snapshot:
+    def __init__(self, nvm, offset=0, delay_ms=10000):
+        self.nvm = nvm
+        self.offset = offset
+        self.delay_ns = delay_ms * 1000000
+        self.record = bytearray(SIZE)
+        self.power = None        # what's saved, None if nothing is
+        self.input = None
+        self.changed_ns = 0      # when the state we're waiting to save last changed
+        self.next_power = None
+        self.next_input = None
+        self.writes = 0
+        self.load()
+
+    def load(self):
+        record = self.nvm[self.offset:self.offset + SIZE]
+        if record[0] == MAGIC and record[1] <= 1 and \
+                record[3] == (MAGIC ^ record[1] ^ record[2]) ^ 0xFF:
+            self.power = record[1]
+            self.input = record[2]
+
+    # True if the state isn't what's saved yet.
+    def pending(self, power, input):
+        return power is not None and input is not None and \
+            (power != self.power or input != self.input)
+
+    # Call every so often with the receiver's power and input (None if unknown). Saves them
+    # once they've stayed the same for delay_ms. Returns True if it wrote.
+    def service(self, power, input, now_ns):
+        if not self.pending(power, input):
+            self.next_power = None
+            return False
+        if power != self.next_power or input != self.next_input:
+            self.next_power = power
+            self.next_input = input
+            self.changed_ns = now_ns
+            return False
+        if now_ns - self.changed_ns < self.delay_ns:
+            return False
+        self.save(power, input)
+        return True
+
+    # Save right away, e.g. on the way into light sleep when nothing more is going to change.
+    def save(self, power, input):
+        if not self.pending(power, input):
+            return
+        record = self.record
+        record[0] = MAGIC
+        record[1] = power
+        record[2] = input
+        record[3] = (MAGIC ^ power ^ input) ^ 0xFF
+        self.nvm[self.offset:self.offset + SIZE] = record
+        self.power = power
+        self.input = input
+        self.next_power = None
+        self.writes += 1
@@ -0,0 +1,278 @@
+# Links to the receiver.
+#
+# The keypad talks ISCP to the receiver over its serial port, but the same protocol runs
+# over the network as eISCP: each message is wrapped in a 16-byte "ISCP" header and sent
+# over TCP port 60128. Both links here look the same to the rest of the code:
+#
+#   readinto(buf)    copy whatever ISCP bytes have arrived into buf and return the count
+#                    (0 if nothing), without blocking
+#   write(frame)     send one command, e.g. b"!1SLI12\r"
+#   service(now_ns)  housekeeping: reconnecting. Call it every so often. Returns True when
+#                    the link wants a keepalive, which the caller queues like any other
+#                    command (a power query does it), so it gets the same pacing.
+#   connected        True if commands can go out right now
+#
+# readinto() hands back the plain ISCP byte stream with the eISCP headers already taken
+# off, so the same FrameParser works on either link.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import errno
+
+EISCP_PORT = 60128
+HEADER_SIZE = 16
+
+# Error numbers differ between Linux, macOS and CircuitPython, so they come from errno.
+# CircuitPython's errno leaves out EISCONN; its sockets use the Linux number for it.
+_EAGAIN = errno.EAGAIN
+_EISCONN = getattr(errno, "EISCONN", 106)
+_ETIMEDOUT = errno.ETIMEDOUT
+_EALREADY = errno.EALREADY
+_EINPROGRESS = errno.EINPROGRESS
+
+# Tries in a row a send can make no progress before the connection is given up on.
+SEND_TRIES = 20
+
+
+class SerialTransport:
+    def __init__(self, uart):
+        self.uart = uart
+        self.connected = True
+
+    # Only ask for what's already in the receive buffer. busio.UART.readinto() keeps waiting
+    # until it has filled buf or the UART's timeout passes with nothing new, which would hold
+    # up every other task for the whole timeout on each status message.
+    def readinto(self, buf):
+        n = self.uart.in_waiting
+        if not n:
+            return 0
+        return self.uart.readinto(buf, min(n, len(buf))) or 0
+
+    def write(self, frame):
+        self.uart.write(frame)
+
+    def service(self, now_ns):
+        return False
+
+
+# eISCP over TCP.
+#
+# pool is whatever makes sockets: socketpool.SocketPool(wifi.radio) on CircuitPython, or
+# the socket module on a computer. The connection is opened once and kept, and every
+# command goes over it. If it drops, service() reconnects every reconnect_ms, and if
+# nothing has been heard for keepalive_ms it asks for a keepalive to make sure the
+# connection is still there (and the receiver hasn't quietly dropped it).
+#
+# Nothing here waits on the network, since it all runs on the keypad's event loop. Connects
+# are non-blocking and service() checks on them until they're made or connect_timeout
+# passes, and a send the socket won't take is given up on along with the connection.
+class EiscpTransport:
+    def __init__(self, pool, host, port=EISCP_PORT, connect_timeout=2.0, reconnect_ms=5000,
+                 keepalive_ms=30000):
+        self.pool = pool
+        self.host = host
+        self.port = port
+        self.connect_timeout_ns = int(connect_timeout * 1000000000)
+        self.reconnect_ns = reconnect_ms * 1000000
+        self.keepalive_ns = keepalive_ms * 1000000
+        self.sock = None
+        self.connecting = None    # the socket while its connect is in progress
+        self.connect_deadline_ns = 0
+        self.connected = False
+        self.connects = 0
+        self.next_connect_ns = 0
+        self.last_heard_ns = 0
+        self.last_sent_ns = 0
+        self._reader = EiscpReader()
+        self._chunk = bytearray(128)
+        self.heard = False
+        # Outgoing message: the header (data size goes in bytes 8-11) with the command copied in
+        # behind it, so each command goes out in a single send. Sending the header on its own
+        # stalls every command on TCP's delayed acknowledgements for tens of ms.
+        self._out = bytearray(HEADER_SIZE + 64)
+        self._out[0:HEADER_SIZE] = b"ISCP\x00\x00\x00\x10\x00\x00\x00\x00\x01\x00\x00\x00"
+        self._out_view = memoryview(self._out)
+
+    # Start connecting. Returns True if the connection was made right away; otherwise
+    # service() finishes it.
+    def connect(self, now_ns=0):
+        self.close()
+        self.next_connect_ns = now_ns + self.reconnect_ns
+        try:
+            sock = self.pool.socket(self.pool.AF_INET, self.pool.SOCK_STREAM)
+            sock.settimeout(0)
+        except OSError:
+            return False
+        self.connecting = sock
+        self.connect_deadline_ns = now_ns + self.connect_timeout_ns
+        return self._check_connect(now_ns)
+
+    # See how the connect in progress is doing by asking for it again: that fails with
+    # EISCONN once it's made, and with the reason if it couldn't be. Returns True once
+    # it's connected.
+    def _check_connect(self, now_ns):
+        sock = self.connecting
+        try:
+            sock.connect((self.host, self.port))
+        except OSError as e:
+            error = _errno(e)
+            if error in (_EINPROGRESS, _EALREADY, _EAGAIN) and now_ns < self.connect_deadline_ns:
+                return False
+            if error != _EISCONN:
+                self.close()
+                return False
+        self.connecting = None
+        self.sock = sock
+        self.connected = True
+        self.connects += 1
+        self.last_heard_ns = self.last_sent_ns = now_ns
+        self._reader.reset()
+        self.heard = False
+        return True
+
+    def close(self):
+        for sock in (self.sock, self.connecting):
+            if sock is not None:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+        self.sock = None
+        self.connecting = None
+        self.connected = False
+
+    def service(self, now_ns):
+        if not self.connected:
+            if self.connecting is not None:
+                self._check_connect(now_ns)
+            elif now_ns >= self.next_connect_ns:
+                self.connect(now_ns)
+            return False
+        if self.heard:
+            self.heard = False
+            self.last_heard_ns = now_ns
+        if now_ns - self.last_heard_ns > self.keepalive_ns and \
+                now_ns - self.last_sent_ns > self.keepalive_ns:
+            self.last_sent_ns = now_ns
+            return True
+        return False
+
+    def write(self, frame):
+        if not self.connected:
+            return
+        out = self._out
+        size = len(frame)
+        out[8] = (size >> 24) & 0xFF
+        out[9] = (size >> 16) & 0xFF
+        out[10] = (size >> 8) & 0xFF
+        out[11] = size & 0xFF
+        out[HEADER_SIZE:HEADER_SIZE + size] = frame
+        try:
+            self._send_all(self._out_view[:HEADER_SIZE + size])
+        except OSError:
+            self.close()
+
+    # Send all of data or raise OSError. If the socket takes nothing SEND_TRIES times in a
+    # row, the receiver has stopped reading or the network's gone, and write() closes the
+    # connection instead of the keypad spinning here. The frame is lost either way, since
+    # half of one would leave the stream out of step.
+    def _send_all(self, data):
+        view = memoryview(data)
+        tries = 0
+        while view:
+            try:
+                sent = self.sock.send(view)
+            except OSError as e:
+                if _errno(e) != _EAGAIN:
+                    raise
+                sent = 0
+            if sent:
+                tries = 0
+            else:
+                tries += 1
+                if tries >= SEND_TRIES:
+                    raise OSError(_EAGAIN)
+            view = view[sent:]
+
+    # Read from the socket and strip the eISCP headers, leaving the ISCP bytes in buf.
+    def readinto(self, buf):
+        if not self.connected:
+            return 0
+        # Never read more than buf can hold. Headers only make the payload smaller.
+        chunk = self._chunk
+        try:
+            n = self.sock.recv_into(chunk, min(len(buf), len(chunk)))
+        except OSError as e:
+            if _errno(e) not in (_EAGAIN, _ETIMEDOUT):
+                self.close()
+            return 0
+        if not n:
+            # The receiver closed the connection.
+            self.close()
+            return 0
+        self.heard = True
+        count = self._reader.unwrap(chunk, n, buf)
+        if count < 0:
+            # Lost track of the stream. Start over on a fresh connection.
+            self.close()
+            return 0
+        return count
+
+
+# Takes the eISCP headers off a TCP byte stream and leaves the ISCP bytes behind. Bytes can
+# arrive split up any old way; the reader keeps track of where it is between calls.
+class EiscpReader:
+    def __init__(self):
+        self.header = bytearray(HEADER_SIZE)
+        self.reset()
+
+    def reset(self):
+        self.header_length = 0   # header bytes collected so far
+        self.skip = 0            # extra header bytes still to skip
+        self.payload_left = 0    # payload bytes still to pass on
+
+    # Copy the payload bytes in data[:n] to buf, which needs room for n bytes. Returns the
+    # number of bytes copied, or -1 if the stream isn't eISCP.
+    def unwrap(self, data, n, buf):
+        count = 0
+        i = 0
+        while i < n:
+            if self.skip:
+                # Header bytes beyond the 16 we know about.
+                take = min(n - i, self.skip)
+                i += take
+                self.skip -= take
+            elif self.payload_left:
+                take = min(n - i, self.payload_left)
+                buf[count:count + take] = data[i:i + take]
+                count += take
+                i += take
+                self.payload_left -= take
+            else:
+                header = self.header
+                header[self.header_length] = data[i]
+                self.header_length += 1
+                i += 1
+                if self.header_length == HEADER_SIZE:
+                    self.header_length = 0
+                    if header[0:4] != b"ISCP":
+                        return -1
+                    self.skip = max(0, _be32(header, 4) - HEADER_SIZE)
+                    self.payload_left = _be32(header, 8)
+        return count
+
+
+# eISCP header for a message of size bytes.
+def eiscp_header(size):
+    return b"ISCP\x00\x00\x00\x10" + bytes(((size >> 24) & 0xFF, (size >> 16) & 0xFF,
+                                             (size >> 8) & 0xFF, size & 0xFF)) + b"\x01\x00\x00\x00"
+
+
+def _be32(data, i):
+    return (data[i] << 24) | (data[i + 1] << 16) | (data[i + 2] << 8) | data[i + 3]
+
+
+def _errno(e):
+    return e.errno if hasattr(e, 'errno') and e.errno is not None else (e.args[0] if e.args else 0)
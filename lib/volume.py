@@ -0,0 +1,129 @@
+# Hold-to-repeat volume keys for the Onkyo keypad.
+#
+# A tap moves the volume one step. Holding the key keeps it going after a short delay,
+# slowly at first and faster the longer it's held. Sending MVLUP for every step doesn't
+# work over a 9600 baud link that waits for each command to be echoed: the commands pile up
+# and the volume keeps creeping along after the key is let go. So the keypad works out the
+# level itself, starting from the last MVL status the receiver sent, and sends it as an
+# absolute "!1MVLxx" at most once every pace_ms. However many steps happened in between, it's
+# one command.
+#
+# If we haven't heard the volume yet, steps go out as MVLUP/MVLDOWN until the receiver's
+# answer tells us where it is.
+#
+# Copy this file to the lib folder on the CIRCUITPY drive along with main.py.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+MVL_UP = b'!1MVLUP\r'
+MVL_DOWN = b'!1MVLDOWN\r'
+_HEX = b'0123456789ABCDEF'
+
+# How long after the last command to keep counting from our own level instead of the
+# receiver's, while its answer is on the way.
+SETTLE_NS = 1000000000
+
+
+class VolumeKeys:
+    def __init__(self, up_key, down_key, max_level=0x64, delay_ms=400, start_rate=8,
+                 top_rate=30, ramp_ms=1500, pace_ms=100):
+        self.up_key = up_key
+        self.down_key = down_key
+        self.max_level = max_level
+        self.delay_ns = delay_ms * 1000000
+        self.start_rate = start_rate   # steps per second when repeating starts
+        self.top_rate = top_rate       # steps per second ramp_ms later
+        self.ramp_ns = ramp_ms * 1000000
+        self.pace_ns = pace_ms * 1000000
+        # The absolute command gets filled in for each level instead of built, so nothing is
+        # allocated. The transmit queue only ever holds the latest one.
+        self.frame = bytearray(b'!1MVL00\r')
+        self.direction = 0       # 1 or -1 while a key is held
+        self.held_ns = 0         # when it went down
+        self.last_ns = 0         # last service()
+        self.progress = 0        # part of a step so far, in steps * 1e9
+        self.steps = 0           # steps not added to the target yet
+        self.target = -1         # level we're heading for, -1 to start from the receiver's
+        self.sent = -1           # last level sent
+        self.sent_ns = -self.pace_ns
+        self.commands = 0        # commands sent, for comparing with the steps taken
+        self.total_steps = 0
+
+    # Call with every key event. Returns True if it was a volume key.
+    def key(self, key_number, pressed, now_ns):
+        if key_number == self.up_key:
+            direction = 1
+        elif key_number == self.down_key:
+            direction = -1
+        else:
+            return False
+        if pressed:
+            self.direction = direction
+            self.held_ns = now_ns
+            self.last_ns = now_ns
+            self.progress = 0
+            self.steps += direction
+            self.total_steps += 1
+        elif direction == self.direction:
+            self.direction = 0
+        return True
+
+    # Call every so often with the receiver's last reported volume (None if unknown) while
+    # there's something to do. Moves the target along while a key is held and sends it when
+    # the pacing allows. Returns False once everything has been sent and the receiver has
+    # caught up.
+    def service(self, now_ns, volume, tx_queue):
+        direction = self.direction
+        if direction:
+            repeat_ns = now_ns - self.held_ns - self.delay_ns
+            if repeat_ns > 0:
+                if repeat_ns >= self.ramp_ns:
+                    rate = self.top_rate
+                else:
+                    rate = self.start_rate + \
+                        (self.top_rate - self.start_rate) * repeat_ns // self.ramp_ns
+                self.progress += min(now_ns - self.last_ns, repeat_ns) * rate
+                while self.progress >= 1000000000:
+                    self.progress -= 1000000000
+                    self.steps += direction
+                    self.total_steps += 1
+            self.last_ns = now_ns
+        paced = now_ns - self.sent_ns >= self.pace_ns
+
+        if self.target < 0:
+            if volume is None:
+                # No idea where the volume is. Step it and let the answer tell us.
+                if self.steps and paced:
+                    tx_queue.put(MVL_UP if self.steps > 0 else MVL_DOWN, urgent=True)
+                    self.steps -= 1 if self.steps > 0 else -1
+                    self.sent_ns = now_ns
+                    self.commands += 1
+                return direction != 0 or self.steps != 0
+            self.target = volume
+            self.sent = volume
+
+        target = self.target + self.steps
+        self.steps = 0
+        if target < 0:
+            target = 0
+        elif target > self.max_level:
+            target = self.max_level
+        self.target = target
+        if target != self.sent:
+            if paced:
+                frame = self.frame
+                frame[5] = _HEX[target >> 4]
+                frame[6] = _HEX[target & 0xF]
+                tx_queue.put(frame, urgent=True)
+                self.sent = target
+                self.sent_ns = now_ns
+                self.commands += 1
+            return True
+        if direction:
+            return True
+        # All sent. Keep counting from our own level until the receiver reports it, so quick
+        # taps don't start from an old volume, then go back to the receiver's.
+        if volume == target or now_ns - self.sent_ns > SETTLE_NS:
+            self.target = -1
+            return False
+        return True
@@ -7,6 +7,7 @@ import busio
 import digitalio
 import pwmio
 import keypad
+import lights
 
 LED_BRIGHTNESS = 30000   # max is 65535
 
@@ -68,6 +69,9 @@ for button in button_LEDs_on:
     button.direction = digitalio.Direction.OUTPUT
     button.value = True
 
+# The PWM pins as an LED backend for the same frame buffer main.py uses
+led_frame = lights.FrameBuffer(lights.PwmLeds(button_LEDs))
+
 # Main event loop
 while True:
 
@@ -75,9 +79,10 @@ while True:
     for i in range(100):
         # PWM LED up and down
         if i < 50:
-            button_LEDs[0].duty_cycle = int(i * 2 * 65535 / 100)  # Up
+            led_frame.set(0, int(i * 2 * 65535 / 100))  # Up
         else:
-            button_LEDs[0].duty_cycle = 65535 - int((i - 50) * 2 * 65535 / 100) 
+            led_frame.set(0, 65535 - int((i - 50) * 2 * 65535 / 100))
+        led_frame.push(time.monotonic_ns())
         time.sleep(0.01)
 
 
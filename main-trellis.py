@@ -8,83 +8,62 @@ from adafruit_neotrellis.neotrellis import NeoTrellis
 import board
 import busio
 import digitalio
+import iscp
+import keymap
+import lights
 
 # Create the i2c object for the trellis
 i2c_bus = board.I2C()  # uses board.SCL and board.SDA
 # i2c_bus = board.STEMMA_I2C()  # For using the built-in STEMMA QT connector on a microcontroller
 
-# Create the trellis object
-trellis = NeoTrellis(i2c_bus)
+# Create the trellis object. With interrupt on, the seesaw pulls its INT line low while key
+# events are waiting, so the main loop only talks to it over I2C when there's something to
+# read. INT is wired to D9.
+trellis_int = digitalio.DigitalInOut(board.D9)
+trellis_int.direction = digitalio.Direction.INPUT
+trellis_int.pull = digitalio.Pull.UP
+trellis = NeoTrellis(i2c_bus, interrupt=True)
 
 # Set the brightness value (0 to 1.0)
 trellis.brightness = 0.5
 
-# Some color definitions
-OFF = (0, 0, 0)
-RED = (255, 0, 0)
-YELLOW = (255, 150, 0)
-GREEN = (0, 255, 0)
-CYAN = (0, 255, 255)
-BLUE = (0, 0, 255)
-PURPLE = (180, 0, 255)
-WHITE = (255, 255, 255)
-
-# Serial status codes for the various inputs. Variable name matches button on receiver.
-# Comment is how it's actually wired.
-DVD = '1SLI10' # CD/DVD/BlueRay
-CBL = '1SLI01' # Apple TV
-STM = '1SLI11' # Switch
-PC = '1SLI05'  # WII
-G1 = '1SLI02'  # Turntable
-G2 = '1SLI04'  # Namco  ## !!!CHECK THIS!!!
-AUX = '1SLI03' # Front Input
-CD  = '1SLI23' # Tape
-PHN = '1SLI22' # (not used) Phono -- no way to bypass internal preamp
-TV = '1SLI12'  # TV
-TUN = '1SLI26' # AM/FM
-FM = '1SLI24'
-AM = '1SLI25'
-NET = '1SLI2B' # Spotify/Airplay/Etc.
-BLUETOOTH = '1SLI2E' # (not used) Bluetooth -- I use airplay rather than bluetooth
-PWR_OFF = '1PWR00'
-
-# Button command mapping
-button_mapping = {
-    0: TV,
-    1: G1,
-    2: CD,
-    3: DVD,
-    4: NET,
-    5: STM,
-    6: PC,
-    7: G2,
-    8: CBL,
-    9: AUX,
-    10: TUN,
-    11: PWR_OFF
-}
-
-# Status messages mapping to button lights. Map extra channels to existing buttons.
-status_mapping = {y: x for x, y in button_mapping.items()}
-status_mapping[FM] = 10        # TUN
-status_mapping[AM] = 10        # TUN
-status_mapping[PHN] = 11       # PWR_OFF
-status_mapping[BLUETOOTH] = 11 # PWR_OFF
+# Some color definitions, packed as 0xRRGGBB
+OFF = 0x000000
+RED = 0xFF0000
+YELLOW = 0xFF9600
+GREEN = 0x00FF00
+CYAN = 0x00FFFF
+BLUE = 0x0000FF
+PURPLE = 0xB400FF
+WHITE = 0xFFFFFF
+
+# The LEDs go through the same frame buffer as main.py's. Writing trellis.pixels directly
+# costs two I2C transactions for every pixel. Through the frame buffer, everything that
+# changed in a frame goes out with a single show().
+leds = lights.NeoTrellisLeds(trellis.pixels, color=WHITE)
+led_frame = lights.FrameBuffer(leds, channel_count=16)
+LED_ON = 65535
+
+# The keypad layout is shared with main.py. See layout.toml and tools/build_keymap.py.
+# Only the first keymap.KEY_COUNT of the 16 trellis keys are used.
 
 # Create the UART
 uart = busio.UART(board.TX, board.RX, baudrate=9600)
 
+# Print key presses and everything the receiver sends on the USB console. Building those
+# strings allocates on every frame, so it's off unless you're chasing something.
+DEBUG = False
+
 # This will be called when button events are received
 def button_press(event):
     # turn the LED on when a rising edge is detected
     if event.edge == NeoTrellis.EDGE_RISING:
         # trellis.pixels[event.number] = CYAN
-        if event.number in button_mapping:
-            send_str = '!' + button_mapping[event.number] + '\r'
-            send_bytes = bytes(send_str, 'ascii') 
-            uart.write(send_bytes)
+        if event.number < keymap.KEY_COUNT and keymap.KEY_COMMANDS[event.number]:
+            uart.write(keymap.KEY_COMMANDS[event.number])
 
-        print("You pressed button # " + str(event.number))
+        if DEBUG:
+            print("You pressed button # " + str(event.number))
     # turn the LED off when a falling edge is detected
     # elif event.edge == NeoTrellis.EDGE_FALLING:
     #     trellis.pixels[event.number] = OFF
@@ -98,67 +77,78 @@ for i in range(16):
     # set all keys to trigger the blink callback
     trellis.callbacks[i] = button_press
 
-    # cycle the LEDs on startup
-    trellis.pixels[i] = PURPLE
-    time.sleep(0.05)
+# cycle the LEDs on startup a row at a time, one show per row
+leds.color = PURPLE
+for row in range(4):
+    for i in range(row * 4, row * 4 + 4):
+        led_frame.set(i, LED_ON)
+    led_frame.push(time.monotonic_ns())
+    time.sleep(0.2)
 
 # Turn everything off
-for i in range(16):
-    trellis.pixels[i] = OFF
-    time.sleep(0.05)
+led_frame.fill(0)
+led_frame.push(time.monotonic_ns())
+leds.color = WHITE
 
 # Button light state
 last_button_id = -1
 
-# Serial receive data buffer.
-data_buffer = ''
+# Serial receive buffer and ISCP frame parser, same as main.py.
+rx_buffer = bytearray(64)
+parser = iscp.FrameParser()
+
+# Handle one status message from the receiver, e.g. "1SLI10".
+def handle_status(frame):
+    global last_button_id
+
+    # print all the commands we receive
+    if DEBUG:
+        print("command message " + str(bytes(frame), 'ascii'))
+
+    # is this command mapped to a button?
+    button_id = keymap.status_key(frame)
+    if button_id >= 0:
+        # turn the last button off if it's different
+        if last_button_id != -1 and last_button_id != button_id: led_frame.set(last_button_id, 0)
+
+        # turn on the new button. handle special case for the PWR_OFF button when it used to indicate
+        # a mode not mapped to a button on the panel
+        if DEBUG:
+            print("button to light " + str(button_id + 1))
+        if not keymap.is_power_off(frame): led_frame.set(button_id, LED_ON)
+
+        # store the light we just turned on
+        last_button_id = button_id
+
+# Main event loop. It runs every LOOP_SLEEP, 5 ms, so a key press or a status message waits
+# at most that long to be noticed. That's well inside the 66 ms the UART's 64-byte buffer
+# takes to fill at 9600 baud, and cheap, since checking the keypad is just a pin read unless
+# INT says events are waiting. The trellis can only be read every 17 milliseconds or so, so a sync
+# never follows the last one sooner than SYNC_GAP_NS.
+LOOP_SLEEP = 0.005
+SYNC_GAP_NS = 17000000
+last_sync_ns = -SYNC_GAP_NS
 
-# Main event loop
 while True:
     # Process any button events
-    trellis.sync()
+    now = time.monotonic_ns()
+    if not trellis_int.value and now - last_sync_ns >= SYNC_GAP_NS:
+        trellis.sync()
+        last_sync_ns = now
 
     # Process UART communications
+    # Only read what's there, since readinto() would otherwise wait out the UART's timeout
+    # for the rest of the buffer.
     if uart.in_waiting > 0:
-        num_bytes = uart.in_waiting
-        data = uart.read(num_bytes)  
-        print("raw data ")
-        print (data)  # this is a bytearray type
-
-        if data is not None:
-            # add the received data to the buffer
-            data_buffer += ''.join([chr(b) for b in data]) 
-
-            # only process the data buffer when we've received an EOF. This handles the case when
-            # the receive buffer is still filling up.
-            if len(data_buffer) > 0 and data_buffer[len(data_buffer)-1] == (b'\x1a').decode('ascii'):
-                # split the string into individual commands and process each one
-                commands = data_buffer.split('!')
-                for command in commands:
-                    # print all the commands we receive
-                    if len(command) > 0: print("command message " + command)
-
-                    # remove EOF 
-                    cmd_str = command.replace((b'\x1a').decode('ascii'),'')
-
-                    # is this command mapped to a button?
-                    if cmd_str in status_mapping:
-                        # get the new button id based on the command string
-                        button_id = int(status_mapping[cmd_str])
-
-                        # turn the last button off if it's different
-                        if last_button_id != -1 and last_button_id != button_id: trellis.pixels[last_button_id] = OFF
-
-                        # turn on the new button. handle special case for the PWR_OFF button when it used to indicate
-                        # a mode not mapped to a button on the panel
-                        print("button to light " + str(button_id + 1))
-                        if cmd_str != PWR_OFF: trellis.pixels[button_id] = WHITE
-
-                        # store the light we just turned on
-                        last_button_id = button_id
-
-                # clear the buffer
-                data_buffer = ""
-
-    # the trellis can only be read every 17 milliseconds or so
-    time.sleep(0.02)
+        num_bytes = uart.readinto(rx_buffer, min(uart.in_waiting, len(rx_buffer)))
+        if DEBUG:
+            print("raw data ")
+            print(rx_buffer[:num_bytes])  # this is a bytearray type
+
+        if num_bytes:
+            parser.feed(rx_buffer, num_bytes, handle_status)
+
+    # Show whatever the status messages changed, all in one go
+    led_frame.push(time.monotonic_ns())
+
+    time.sleep(LOOP_SLEEP)
@@ -32,19 +32,29 @@
 # LED states
 # * All LED off: receiver is off
 # * One LED on: receiver is on the indicated channel
+# * One LED pulsing: receiver is powering on, and will switch to that channel
 # * All LEDs on: prox sensor tripped
 #
 # There's also a dimmer button on the bottom to control the LED brightness.
 # 
 # (c) Doug Gaff 2023, All Rights Reserved
 
+# Startup is in order of what someone at the keypad needs first. The keypad's background
+# scanner starts queueing presses the moment the KeyMatrix exists and the UART starts
+# buffering the receiver's answers the moment it's open, so those two come before anything
+# else gets imported. Then the LED driver, then the rest, with the dimmer button and the
+# features that can wait at the end. boot_log times every step. The report is printed on the
+# console when the keypad is ready, and again any time "b" is typed.
 import time
+import bootlog
+boot_log = bootlog.BootLog()
+
+# How long main.py should take to get to a working keypad. With the modules in lib
+# precompiled to .mpy (see tools/build_mpy.py) it has plenty of room.
+BOOT_BUDGET_MS = 500
+
 import board
-import busio
-import digitalio
 import keypad
-import adafruit_tlc59711
-from adafruit_debouncer import Debouncer
 
 # Create the keypad
 # https://learn.adafruit.com/key-pad-matrix-scanning-in-circuitpython/keymatrix
@@ -52,232 +62,642 @@ km = keypad.KeyMatrix(
     row_pins=(board.A0, board.A1, board.A2, board.A3),
     column_pins=(board.D7, board.D9, board.D10),
 )
+boot_log.mark("keypad")
+
+import busio
 
 # Create the UART
 uart = busio.UART(board.TX, board.RX, baudrate=9600)
+boot_log.mark("uart")
+
+import sys
+import asyncio
+import digitalio
+import microcontroller
+import supervisor
+from micropython import const
+import iscp
+import receiver
+import keymap
+import transport
+boot_log.mark("imports")
+
+# Everything talks to the receiver through the link. To use the network instead of the
+# serial port on a board with WiFi, swap in an eISCP link:
+#
+#   import socketpool, wifi
+#   link = transport.EiscpTransport(socketpool.SocketPool(wifi.radio), "192.168.1.20")
+link = transport.SerialTransport(uart)
+
+# Commands to the receiver go through a transmit queue. Repeated presses of the same kind
+# of command are merged so only the last one is sent, and each command waits for the
+# receiver to echo the previous one before going out.
+tx_event = asyncio.Event()
+tx_queue = iscp.TxQueue(link, on_ready=tx_event.set)
+boot_log.mark("link")
+
+import adafruit_tlc59711
+import lights
 
 # Create SPI bus for LED control
 spi = busio.SPI(clock=board.SCK, MOSI=board.MOSI)
 leds = adafruit_tlc59711.TLC59711(spi)
 
-# Setup prox sensor input pin
-prox_trigger = digitalio.DigitalInOut(board.D11)
-prox_trigger.direction = digitalio.Direction.INPUT
-
-# Setup dimmer button
-dim_pin = digitalio.DigitalInOut(board.D12)
-dim_pin.direction = digitalio.Direction.INPUT
-dim_pin.pull = digitalio.Pull.DOWN
-dim_button = Debouncer(dim_pin)
-
-# Dim levels
-dim_levels = [65535, 20000, 2000]  # Don't go below 1000 or the fade out will throw an error
+# Everything draws into this frame buffer instead of talking to the 59711 directly. The
+# LED task only sends it over SPI when something changed, at most LED_FPS times a second.
+# The 59711 driver is one of the LED backends in lib/lights.py, so the same code runs the
+# NeoTrellis (see main-trellis.py) or plain PWM pins by handing the frame buffer a different
+# backend.
+LED_FPS = 100
+led_event = asyncio.Event()
+led_frame = lights.FrameBuffer(leds, fps=LED_FPS, on_dirty=led_event.set)
+boot_log.mark("leds")
+
+# The keypad layout, the status messages that light each button and the dim levels all
+# come from layout.toml. See tools/build_keymap.py.
 dim_index = 0
 
-# Serial status codes for the various inputs. Variable name matches button on the
-# front of the receiver. The comment reflects how it's actually wired in my setup.
-DVD = '1SLI10'       # CD/DVD/BlueRay
-CBL = '1SLI01'       # Apple TV
-STM = '1SLI11'       # Switch
-PC = '1SLI05'        # WII
-G1 = '1SLI02'        # Turntable
-G2 = '1SLI04'        # Namco old school game controller
-AUX = '1SLI03'       # Front aux input
-CD  = '1SLI23'       # Cassette tape deck
-PHN = '1SLI22'       # (not used by me) Phono -- no way to bypass the internal preamp
-TV = '1SLI12'        # TV
-TUN = '1SLI26'       # AM/FM - goes to the last selected tuner
-FM = '1SLI24'        # FM tuner
-AM = '1SLI25'        # AM tuner
-NET = '1SLI2B'       # Spotify/Airplay/Etc.
-BLUETOOTH = '1SLI2E' # (not used by me) Bluetooth -- I use airplay instead
-PWR_OFF = '1PWR00'   # I monitor for power off to turn off the button lights.
-
-# Button command mapping. This is how the keypad is laid out.
-#   +-------+-------+--------+
-#   |  TV   | PHONO |  TAPE  |
-#   +-------+-------+--------+
-#   |  CD   |  NET  | SWITCH |
-#   +-------+-------+--------+
-#   |  WII  | NAMCO | APPLE  |
-#   +-------+-------+--------+
-#   |  AUX  |  TUN  |  OFF   |
-#   +-------+-------+--------+
-
-button_mapping = {
-    0: TV,
-    1: G1,
-    2: CD,
-    3: DVD,
-    4: NET,
-    5: STM,
-    6: PC,
-    7: G2,
-    8: CBL,
-    9: AUX,
-    10: TUN,
-    11: PWR_OFF
-}
-
-# Status messages mapping to button lights. Map extra channels to existing buttons.
-status_mapping = {y: x for x, y in button_mapping.items()}
-status_mapping[FM] = 10        # TUN
-status_mapping[AM] = 10        # TUN
-status_mapping[PHN] = 11       # PWR_OFF
-status_mapping[BLUETOOTH] = 11 # PWR_OFF
+# Fades take the same time at every dim level.
+FADE_MS = 1000
+
+# LED level for a key at the current dim setting.
+def key_level(key):
+    return keymap.DIM_LEVELS[key][dim_index]
 
 # Button LED state.
 last_button_id = -1
 
-# Serial receive data buffer.
-data_buffer = ''
-
-# Proximity and fade-out variables.
-prox_fadeout = False
-power_off_fadeout = False
-led_fade_timer_ns = 0
-led_fade_level = 0
-
-# Reboot flag to request channel and receiver status
-first_boot = True
-
-# Main event loop
-while True:
-    # Sending these two commands on boot will make sure the right button lights up. If the power is off,
-    # the last mode will light up and then will turn off. If the power is on, the appropriate channel
-    # light will stay lit.
-    if first_boot:
-        uart.write(bytes("!1SLIQSTN\r",'ascii'))
-        uart.write(bytes("!1PWRQSTN\r",'ascii'))
-        first_boot = False
-
-    # Process any button events. See https://docs.circuitpython.org/en/latest/shared-bindings/keypad/index.html
-    event = km.events.get()
-    if event:
-        # print(event)    
-        if event.pressed:
-            if event.key_number in button_mapping:
-                send_str = '!' + button_mapping[event.key_number] + '\r'
-                send_bytes = bytes(send_str, 'ascii') 
-                uart.write(send_bytes)
-
-    # Prox triggered. Light up everything. The prox will keep resetting the fade out timer until
-    # proximity is no longer detected.
-    if prox_trigger.value:
-        # Hold all the lights on for 3 seconds before starting the fade out.
-        led_fade_timer_ns = time.monotonic_ns() + 3000000000  
-        led_fade_level = dim_levels[dim_index]
-        prox_fadeout = True
-        power_off_fadeout = False
-
-        # All lights on.    
-        for i in range(12): leds.set_channel(i, dim_levels[dim_index]) 
-        leds.show()
-
-    # Handle a fadeout until it's done.
-    if (power_off_fadeout or (prox_fadeout and not prox_trigger.value)) and time.monotonic_ns() > led_fade_timer_ns:
-        # Go to the next fade level
-        led_fade_level -= 1000
-        if led_fade_level < 1000: led_fade_level = 0
-
-        # If this is a power off fade out, only fade out the power button.
-        if power_off_fadeout:
-            leds.set_channel(11, led_fade_level)
-        # Otherwise this is a prox fade-out, fade out all buttons except selected one.
-        else:
-            for i in range(12): 
-                # NOTE: Originally when the system was off and the prox was triggered, I would just fade all the
-                # LEDs at the same time. I added some code below to fade the off button separately in this case.
-                # if last_button_id == 11 or i != last_button_id:
-                if i != last_button_id:
-                    leds.set_channel(i, led_fade_level)
-        leds.show()
-
-        # Are we done fading?
-        if led_fade_level == 0:
-            # If the system is already off, this will cause the Off button to fade out on its own next.
-            if last_button_id == 11 and prox_fadeout:
-                power_off_fadeout = True
-                led_fade_timer_ns = time.monotonic_ns() + 1000000000 
-                led_fade_level = dim_levels[dim_index]
-                prox_fadeout = False
-            # Otherwise, reset the fadeout flags and timer.
-            else:
-                power_off_fadeout = False            
-                prox_fadeout = False            
-                led_fade_timer_ns = 0
+# Everything we know about what the receiver is doing: power, input, volume, mute,
+# listening mode and tuner. Kept up to date from all of the status messages it sends.
+receiver_state = receiver.ReceiverState()
+
+import snapshot
+
+# The receiver's power and input as of the last time they settled, saved in non-volatile
+# memory so the keypad can show them from its first frame at the next boot. See
+# lib/snapshot.py.
+saved_state = snapshot.Snapshot(microcontroller.nvm)
+restored_off = False
+
+# Input selector code -> key it lights.
+INPUT_KEYS = keymap.STATUS_KEYS[iscp.code_key(b'SLI')]
+
+import latency
+import collector
+import volume
+import scenes
+
+# Timestamps for the last few key presses on their way to the LEDs. Type "t" on the USB
+# console for a latency report, or "c" to start over.
+trace = latency.LatencyTrace()
+
+# Garbage collection runs while the keypad is idle, so its pauses don't land in the
+# middle of a fade or a key press. Type "g" on the console for the pause times.
+gc_collector = collector.Collector()
+last_key_ns = 0
+
+# Volume keys, if the layout has any. Held keys step the volume faster and faster, and the
+# level goes to the receiver as one absolute MVL command at a time instead of a stream of
+# MVLUPs. See lib/volume.py.
+volume_keys = volume.VolumeKeys(keymap.VOLUME_UP_KEY, keymap.VOLUME_DOWN_KEY, keymap.VOLUME_MAX)
+volume_event = asyncio.Event()
+
+# Scene keys run a series of commands, each one as soon as the receiver has done the last.
+# See lib/scenes.py.
+scene_event = asyncio.Event()
+scene_runner = scenes.SceneRunner(keymap.SCENES, tx_queue, receiver_state,
+                                  on_ready=scene_event.set)
+
+# Pressing an input key while the receiver is off turns it on as well. The input select goes
+# out the moment the receiver reports it's on, and is sent again if the receiver is still
+# booting and ignores it, so one press gets music as fast as the receiver allows. It runs as
+# a two-step scene, one for each input key, while the key pulses to show it's on its way.
+POWER_ON_SCENES = tuple(scenes.power_on(command) for command in keymap.KEY_COMMANDS)
+PENDING_PULSE_MS = 600
+pending_key = -1
+
+# Serial receive buffer and ISCP frame parser. Both are fixed size so a lost EOF can't
+# make memory use grow.
+rx_buffer = bytearray(64)
+parser = iscp.FrameParser()
+
+# LED animations, in three layers. The status layer shows what the receiver is doing: the
+# selected input, or the off button fading out. The prox layer lights everything up on top
+# of it while someone is near the keypad, then fades away to the status layer underneath.
+# The pending layer pulses a key whose input is waiting on the receiver to power on.
+STATUS_LAYER = const(0)
+PROX_LAYER = const(1)
+PENDING_LAYER = const(2)
+PROX_HOLD_NS = 3000000000   # everything stays lit this long after the prox lets go
+OFF_HOLD_NS = 1000000000    # the off button stays lit this long before it fades
+compositor = lights.Compositor(keymap.KEY_COUNT, layer_count=3)
+
+# Wakes up the animation task when the animations change.
+anim_event = asyncio.Event()
+
+# Draw the animations as they are now, and let the animation task know they changed.
+def redraw(now):
+    compositor.render(now, led_frame)
+    anim_event.set()
+
+# Stop the pending pulse once the power-on scene is over, whether it got the input selected,
+# gave up or was stopped by another key.
+def settle_pending(now):
+    global pending_key
+    if pending_key >= 0 and not scene_runner.running:
+        compositor.clear(PENDING_LAYER, pending_key)
+        pending_key = -1
+        redraw(now)
+
+boot_log.mark("state")
+
+# Show what the receiver was doing when we last saw it, before it's had a chance to answer
+# the queries. handle_status() fixes it up if anything changed while we were off.
+if saved_state.power == 1:
+    last_button_id = INPUT_KEYS.get(saved_state.input, -1)
+    if last_button_id >= 0:
+        compositor.hold(STATUS_LAYER, last_button_id, key_level(last_button_id))
+        redraw(time.monotonic_ns())
+elif saved_state.power == 0:
+    last_button_id = keymap.POWER_OFF_KEY
+    restored_off = True
+
+boot_log.mark("restore")
+
+# Status messages go to the handlers subscribed to their 3-letter code (see
+# iscp.Dispatcher), so each one costs a single lookup however many features watch the
+# receiver, and the ones nothing wants are dropped right there. The receiver state
+# subscribes first so everything after it sees each message's new value.
+dispatcher = iscp.Dispatcher(parser)
+receiver_state.subscribe(dispatcher)
+
+# Light the key for a status message. off is for the power off status, which lights the off
+# key and fades it out.
+def show_status(button_id, off, now):
+    global last_button_id
+    if button_id < 0:
+        return
+    last_button_id = button_id
+
+    # Either way, any prox fadeout in progress is over and only the new status shows.
+    compositor.clear(PROX_LAYER)
+    compositor.clear(STATUS_LAYER)
+
+    # Special power off case. When power off is pressed, it lights up for one second and
+    # then fades out to a fully off keypad.
+    if off:
+        compositor.fade(STATUS_LAYER, keymap.POWER_OFF_KEY, key_level(keymap.POWER_OFF_KEY),
+                        now + OFF_HOLD_NS, FADE_MS)
+    # All other button cases when the power is on. Only the selected button is lit.
+    else:
+        # print("button to light " + str(last_button_id + 1))
+        compositor.hold(STATUS_LAYER, last_button_id, key_level(last_button_id))
+    redraw(now)
+
+# Power status, e.g. "00" for off.
+POWER_CODE = iscp.code_key(b'PWR')
+POWER_KEYS = keymap.STATUS_KEYS.get(POWER_CODE, {})
+
+# The power the keys last showed, and whether a power key has been pressed since. A power
+# status that changes neither, like the answer to a keepalive or a refresh query while the
+# receiver's in standby, leaves the keypad alone instead of replaying the off key's fade.
+shown_power = None
+power_key_pending = False
+
+def on_power(params, now):
+    global restored_off, shown_power, power_key_pending
+    value = iscp.param_int(params, 0)
+    if value < 0 or value == shown_power and not power_key_pending:
+        return
+    shown_power = value
+    power_key_pending = False
+    button_id = POWER_KEYS.get(value, -1) if len(params) == 2 else -1
+
+    # The input gets asked before the power at boot, so a receiver that turns out to be on
+    # lights its input when the power status arrives.
+    if receiver_state.power == 1 and last_button_id == keymap.POWER_OFF_KEY:
+        button_id = INPUT_KEYS.get(receiver_state.input, -1)
+    # The keypad already shows off if that's what was saved, so it doesn't need the off
+    # button's fade to say so again.
+    elif receiver_state.power == 0 and restored_off:
+        button_id = -1
+    restored_off = False
+    show_status(button_id, value == keymap.POWER_OFF_PARAM, now)
+
+# Any other status that lights a key, like an input select. keys maps its parameter to the
+# key. A status from a receiver that's off (or was when we last saw it), like the answer to
+# the input query at boot, has nothing to light.
+def status_handler(keys):
+    def on_status(params, now):
+        power = receiver_state.power
+        if len(params) != 2 or power == 0 or power is None and saved_state.power == 0:
+            return
+        show_status(keys.get(iscp.param_int(params, 0), -1), False, now)
+    return on_status
+
+dispatcher.subscribe(POWER_CODE, on_power)
+for code, keys in keymap.STATUS_KEYS.items():
+    if code != POWER_CODE:
+        dispatcher.subscribe(code, status_handler(keys))
+
+# Handle one status message from the receiver, e.g. "1SLI10".
+def handle_status(frame):
+    # Let the transmit queue know the receiver has caught up, and let everything that's
+    # subscribed to this kind of message have it.
+    now = time.monotonic_ns()
+    tx_queue.acknowledge(frame)
+    dispatcher.dispatch(frame, now)
+    scene_runner.acknowledge(frame, now)
+    settle_pending(now)
+    trace.parsed(frame, now)
+
+    # print all the commands we receive
+    # print("command message " + str(frame, 'ascii'))
+
+from adafruit_debouncer import Debouncer
+
+# Setup prox sensor input pin and dimmer button. Light sleep needs these two pins for its
+# wake alarms, so they're given up while asleep and set up again afterwards.
+def claim_pins():
+    global prox_trigger, dim_pin
+    prox_trigger = digitalio.DigitalInOut(board.D11)
+    prox_trigger.direction = digitalio.Direction.INPUT
+    dim_pin = digitalio.DigitalInOut(board.D12)
+    dim_pin.direction = digitalio.Direction.INPUT
+    dim_pin.pull = digitalio.Pull.DOWN
+
+def release_pins():
+    prox_trigger.deinit()
+    dim_pin.deinit()
+
+claim_pins()
+dim_button = Debouncer(lambda: dim_pin.value)
+boot_log.mark("dimmer")
+
+# How often each task wakes up to poll its peripheral. The keypad is scanned in the
+# background every 20 ms, so polling its event queue every 5 ms keeps the worst-case
+# button-to-UART latency at about 25 ms. At 9600 baud a byte arrives roughly every ms,
+# so a 5 ms UART poll never gets close to filling the 64-byte receive buffer.
+KEYPAD_POLL = 0.005
+UART_POLL = 0.005
+PROX_POLL = 0.02
+DIMMER_POLL = 0.005
+
+# Profiling. Set PROFILE to 1 to have every task time its work between sleeps and a probe
+# task measure how late the loop wakes it up, with a report on the console every
+# PROFILE_REPORT seconds. With PROFILE at 0 the compiler drops all of the profiling code.
+PROFILE = const(0)
+PROFILE_REPORT = 10
+PROFILE_PROBE = 0.005
+P_KEYPAD = const(0)
+P_UART = const(1)
+P_TX = const(2)
+P_STATE = const(3)
+P_PROX = const(4)
+P_DIMMER = const(5)
+P_ANIM = const(6)
+P_LED = const(7)
+P_VOLUME = const(8)
+P_SCENE = const(9)
+if PROFILE:
+    import profiler
+    prof = profiler.Profiler(("keypad", "uart", "tx", "state", "prox", "dimmer", "anim", "led",
+                              "volume", "scene"))
+
+# Process any button events. See https://docs.circuitpython.org/en/latest/shared-bindings/keypad/index.html
+async def keypad_task():
+    global last_key_ns, pending_key, power_key_pending
+    boot_log.mark("ready")
+    while True:
+        if PROFILE: prof.start(P_KEYPAD)
+        event = km.events.get()
+        if event:
+            # print(event)    
+            # Volume keys count presses and releases, the rest only presses.
+            if volume_keys.key(event.key_number, event.pressed, time.monotonic_ns()):
+                last_key_ns = time.monotonic_ns()
+                volume_event.set()
+            elif event.pressed:
+                last_key_ns = time.monotonic_ns()
+                scene = keymap.SCENE_KEYS.get(event.key_number, -1)
+                if scene >= 0:
+                    # Like any other key, a scene takes over from whatever was still going,
+                    # and a key still pulsing for it stops.
+                    scene_runner.stop()
+                    settle_pending(last_key_ns)
+                    scene_runner.start(scene, last_key_ns)
+                elif event.key_number < keymap.KEY_COUNT and keymap.KEY_COMMANDS[event.key_number]:
+                    # Any other key takes over from a scene that's still going.
+                    scene_runner.stop()
+                    settle_pending(last_key_ns)
+                    command = keymap.KEY_COMMANDS[event.key_number]
+                    trace.key(command, last_key_ns)
+                    if iscp.code_key(command, 2) == POWER_CODE:
+                        power_key_pending = True
+                    steps = POWER_ON_SCENES[event.key_number]
+                    if receiver_state.power == 0 and steps is not None:
+                        # Receiver's off. Turn it on first and pulse the key until it's done.
+                        scene_runner.run(steps, last_key_ns)
+                        pending_key = event.key_number
+                        compositor.pulse(PENDING_LAYER, pending_key, key_level(pending_key),
+                                         last_key_ns, PENDING_PULSE_MS)
+                        redraw(last_key_ns)
+                    else:
+                        tx_queue.put(command, urgent=True)
+            if PROFILE: prof.stop(P_KEYPAD)
+            # Handle any other queued events right away.
+            continue
+        if PROFILE: prof.stop(P_KEYPAD)
+        await asyncio.sleep(KEYPAD_POLL)
+
+# Prox triggered. Light up everything. The prox keeps pushing back the start of the fadeout
+# until proximity is no longer detected.
+async def prox_task():
+    while True:
+        if PROFILE: prof.start(P_PROX)
+        if prox_trigger.value:
+            # All lights on, holding for 3 seconds before the fade out. Each one fades to what
+            # the status layer shows, so the selected button stays lit.
+            now = time.monotonic_ns()
+            fade_ns = now + PROX_HOLD_NS
+            for i in range(keymap.KEY_COUNT):
+                compositor.fade(PROX_LAYER, i, key_level(i), fade_ns, FADE_MS)
+
+            # If the system is already off, the off button stays lit underneath and fades out on
+            # its own a second after the rest.
+            if last_button_id == keymap.POWER_OFF_KEY:
+                compositor.fade(STATUS_LAYER, keymap.POWER_OFF_KEY, key_level(keymap.POWER_OFF_KEY),
+                                fade_ns + FADE_MS * 1000000 + OFF_HOLD_NS, FADE_MS)
+            redraw(now)
+        if PROFILE: prof.stop(P_PROX)
+        await asyncio.sleep(PROX_POLL)
+
+# Step the volume while a volume key is held, and send it as the pacing allows. Sleeps until
+# a volume key is pressed once everything has gone out.
+VOLUME_POLL = 0.02
+
+async def volume_task():
+    while True:
+        if PROFILE: prof.start(P_VOLUME)
+        busy = volume_keys.service(time.monotonic_ns(), receiver_state.volume, tx_queue)
+        if PROFILE: prof.stop(P_VOLUME)
+        if not busy:
+            volume_event.clear()
+            await volume_event.wait()
+            continue
+        await asyncio.sleep(VOLUME_POLL)
+
+# Watch a running scene for steps that time out. Steps go out from handle_status() as soon
+# as the receiver acknowledges the last one, and a new scene sends its first step when its
+# key is pressed. A new scene can have a shorter timeout than the one we're sleeping on, so
+# check back at least every SCENE_POLL.
+SCENE_POLL = 0.1
+
+async def scene_task():
+    while True:
+        if PROFILE: prof.start(P_SCENE)
+        now = time.monotonic_ns()
+        delay_ns = scene_runner.service(now)
+        settle_pending(now)
+        if PROFILE: prof.stop(P_SCENE)
+        if not delay_ns:
+            scene_event.clear()
+            await scene_event.wait()
+            continue
+        await asyncio.sleep(min(delay_ns / 1000000000, SCENE_POLL))
+
+# Run the LED animations. Sleeps until the next fade step is due, or until the animations
+# change if nothing is fading. Changes are drawn as they happen by redraw(), but one of them
+# could need a step sooner than the one we're sleeping for, so check back every ANIM_POLL.
+ANIM_POLL = 0.02
+
+async def anim_task():
+    while True:
+        if PROFILE: prof.start(P_ANIM)
+        now = time.monotonic_ns()
+        next_ns = compositor.render(now, led_frame)
+        if PROFILE: prof.stop(P_ANIM)
+        if next_ns == 0:
+            anim_event.clear()
+            await anim_event.wait()
         else:
-            led_fade_timer_ns = time.monotonic_ns() + 15000000  # 15 ms fade interval
-
-    # Handle dimming button. 
-    dim_button.update()
-    if dim_button.fell:
-        # Move to next dim level
-        dim_index += 1
-        if dim_index == 3: dim_index = 0
-
-        # Change button brightness unless the power is off.
-        if last_button_id != 11: 
-            leds.set_channel(last_button_id, dim_levels[dim_index])
-            leds.show()
-
-    # Process UART communications.
-    if uart.in_waiting > 0:
-        num_bytes = uart.in_waiting
-        data = uart.read(num_bytes)  
+            await asyncio.sleep(min((next_ns - now) / 1000000000, ANIM_POLL))
+
+# Handle dimming button. 
+async def dimmer_task():
+    global dim_index
+    while True:
+        if PROFILE: prof.start(P_DIMMER)
+        dim_button.update()
+        if dim_button.fell:
+            # Move to next dim level
+            dim_index += 1
+            if dim_index == keymap.DIM_COUNT: dim_index = 0
+
+            # Change button brightness unless the power is off.
+            if last_button_id != keymap.POWER_OFF_KEY and last_button_id != -1: 
+                compositor.hold(STATUS_LAYER, last_button_id, key_level(last_button_id))
+                redraw(time.monotonic_ns())
+        if PROFILE: prof.stop(P_DIMMER)
+        await asyncio.sleep(DIMMER_POLL)
+
+# Process UART communications. Read whatever has arrived into the receive buffer and
+# let the parser hand us each status message as soon as its terminator shows up. The link
+# also gets a chance to reconnect or send a keepalive here if it needs to.
+async def uart_task():
+    while True:
+        if PROFILE: prof.start(P_UART)
+        num_bytes = link.readinto(rx_buffer)
         # print("raw data ")
-        # print (data)  # this is a bytearray type
-
-        if data is not None:
-            # add the received data to the buffer
-            data_buffer += ''.join([chr(b) for b in data]) 
-
-            # only process the data buffer when we've received an EOF. This handles the case when
-            # the receive buffer is still filling up.
-            if len(data_buffer) > 0 and data_buffer[len(data_buffer)-1] == (b'\x1a').decode('ascii'):
-                # split the string into individual commands and process each one
-                commands = data_buffer.split('!')
-                for command in commands:
-                    # print all the commands we receive
-                    # if len(command) > 0: print("command message " + command)
-
-                    # remove EOF 
-                    cmd_str = command.replace((b'\x1a').decode('ascii'),'')
-
-                    # is this command mapped to a button?
-                    if cmd_str in status_mapping:
-                        # get the new button id based on the command string
-                        # todo current_button_id
-                        last_button_id = int(status_mapping[cmd_str])
-
-                        # Special power off case. When power off is pressed, it lights up for one second and
-                        # then fades out to a fully off keypad.
-                        if cmd_str == PWR_OFF:
-                            # Turn out all lights and turn on the power off light.
-                            for i in range(12): 
-                                leds.set_channel(i, 0)
-                            leds.set_channel(11, dim_levels[dim_index])
-                            leds.show()
-
-                            # Setup a fadeout for the power off button. Reset prox fadeout if it was in progress.
-                            power_off_fadeout = True
-                            led_fade_timer_ns = time.monotonic_ns() + 1000000000 
-                            led_fade_level = dim_levels[dim_index]
-                            prox_fadeout = False
-                        # All other button cases when the power is on.
-                        else: 
-                            # Turn off all buttons except the one selected.
-                            for i in range(12): 
-                                if i != last_button_id: leds.set_channel(i, 0)
-
-                            # Turn on the new button.
-                            # print("button to light " + str(last_button_id + 1))
-                            leds.set_channel(last_button_id, dim_levels[dim_index])
-                            leds.show()
-
-                            # Reset the prox sensor fadeout if it was in progress.
-                            prox_fadeout = False
-                            led_fade_timer_ns = 0
-
-                # clear the buffer
-                data_buffer = ""
+        # print (rx_buffer[:num_bytes])
+
+        if num_bytes:
+            trace.mark(latency.FIRST_BYTE, time.monotonic_ns())
+            parser.feed(rx_buffer, num_bytes, handle_status)
+        if link.service(time.monotonic_ns()):
+            tx_queue.put(receiver.QUERIES[receiver.POWER])
+        if PROFILE: prof.stop(P_UART)
+        await asyncio.sleep(UART_POLL)
+
+# Fill in whatever we don't know about the receiver yet. Nothing gets sent once the receiver
+# has answered, since it reports every change on its own after that. Asking for the input
+# before the power makes sure the right button lights up at boot. If the power is on, the
+# appropriate channel light will stay lit. If it's off and we didn't know that from the
+# saved state, the last mode will light up and then will turn off. The rest only gets
+# answered while the receiver is on. The power and input get saved here once they settle.
+STATE_POLL = 1.0
+TUNER_INPUTS = (0x24, 0x25, 0x26)
+
+async def state_task():
+    while True:
+        if PROFILE: prof.start(P_STATE)
+        now = time.monotonic_ns()
+        saved_state.service(receiver_state.power, receiver_state.input, now)
+        receiver_state.refresh(receiver.INPUT, now, tx_queue)
+        receiver_state.refresh(receiver.POWER, now, tx_queue)
+        if receiver_state.power == 1:
+            receiver_state.refresh(receiver.VOLUME, now, tx_queue)
+            receiver_state.refresh(receiver.MUTE, now, tx_queue)
+            receiver_state.refresh(receiver.LISTENING_MODE, now, tx_queue)
+            if receiver_state.input in TUNER_INPUTS:
+                receiver_state.refresh(receiver.TUNER, now, tx_queue)
+        if PROFILE: prof.stop(P_STATE)
+        await asyncio.sleep(STATE_POLL)
+
+# Send queued commands to the receiver, one at a time as it's ready for them. While waiting
+# for an acknowledgement, check back every UART poll since that's when one can show up.
+async def tx_task():
+    while True:
+        if not tx_queue:
+            tx_event.clear()
+            await tx_event.wait()
+            continue
+        if PROFILE: prof.start(P_TX)
+        now = time.monotonic_ns()
+        delay_ns = tx_queue.service(now)
+        if tx_queue.sent_ns == now:
+            trace.written(tx_queue.awaiting, now)
+        if PROFILE: prof.stop(P_TX)
+        if delay_ns:
+            await asyncio.sleep(min(delay_ns / 1000000000, UART_POLL))
+
+# Push the LED frame buffer to the 59711 whenever it changes.
+async def led_task():
+    while True:
+        if not led_frame.dirty:
+            led_event.clear()
+            await led_event.wait()
+            continue
+        if PROFILE: prof.start(P_LED)
+        now = time.monotonic_ns()
+        delay_ns = led_frame.push(now)
+        if not led_frame.dirty:
+            trace.mark(latency.SHOWN, now)
+        if PROFILE: prof.stop(P_LED)
+        if delay_ns:
+            await asyncio.sleep(delay_ns / 1000000000)
+
+# Collect garbage when nothing's going on: no fade running, the LEDs are up to date, and no
+# key press or command to the receiver in the last second (GC_QUIET). With the receiver off
+# that's nearly all the time.
+GC_POLL = 0.25
+GC_QUIET = 1000000000
+
+async def gc_task():
+    while True:
+        now = time.monotonic_ns()
+        idle = not compositor.moving and not led_frame.dirty and \
+            not tx_queue and now - last_key_ns > GC_QUIET and now - tx_queue.sent_ns > GC_QUIET
+        gc_collector.service(now, idle)
+        await asyncio.sleep(GC_POLL)
+
+# Light sleep while the receiver is off and nobody's around: no key press for IDLE_QUIET, no
+# animation running and nothing to send. The prox sensor and the dimmer button wake it right
+# away, and every IDLE_WAKE_MS it checks the keypad and the UART and goes back to sleep if
+# nothing's there. Any of them drops it straight back into the full-speed loop. Type "i" on
+# the console for how much of the time it's been asleep. See lib/idle.py.
+#
+# Set IDLE_SLEEP to 0 to never sleep. The eISCP link needs that, since light sleep doesn't
+# check the network, and so does the profiler, which would count the sleep as lag.
+IDLE_SLEEP = const(1)
+IDLE_POLL = 0.5
+IDLE_QUIET = 5000000000
+IDLE_WAKE_MS = 50
+if IDLE_SLEEP:
+    import idle
+    sleeper = idle.IdleSleep(((board.D11, True, False), (board.D12, True, True)), IDLE_WAKE_MS)
+
+# True if something's come in on the keypad or the UART while we were asleep.
+def waiting():
+    return bool(km.events) or uart.in_waiting > 0
+
+# Checked at every wake from light sleep. The event loop doesn't run until the sleep ends,
+# which can be all night, and every nap allocates a little, so the collector gets its turn
+# here too.
+def wake_check():
+    gc_collector.service(time.monotonic_ns(), True)
+    return waiting()
+
+async def idle_task():
+    while True:
+        await asyncio.sleep(IDLE_POLL)
+        now = time.monotonic_ns()
+        if receiver_state.power != 0 or now - last_key_ns < IDLE_QUIET or \
+                compositor.moving or led_frame.dirty or tx_queue or \
+                tx_queue.awaiting_ack(now) or scene_runner.running or \
+                volume_event.is_set() or prox_trigger.value or dim_button.value or waiting():
+            continue
+        # Collect now rather than right after waking up, when someone's waiting on the keypad.
+        gc_collector.service(now, True)
+        saved_state.save(receiver_state.power, receiver_state.input)
+        # Whatever happens, the prox and dimmer tasks get their pins back. Deinit is harmless
+        # on a pin that's already been let go, so a failure halfway through releasing them is
+        # covered too.
+        try:
+            release_pins()
+            sleeper.sleep(wake_check)
+        finally:
+            release_pins()
+            claim_pins()
+
+# Commands typed on the USB console.
+CONSOLE_POLL = 0.1
+
+async def console_task():
+    cold = supervisor.runtime.run_reason == supervisor.RunReason.STARTUP
+    boot_log.report(BOOT_BUDGET_MS, cold)
+    while True:
+        if supervisor.runtime.serial_bytes_available:
+            c = sys.stdin.read(1)
+            if c == "t":
+                trace.report()
+            elif c == "c":
+                trace.clear()
+            elif c == "g":
+                gc_collector.report()
+            elif c == "b":
+                boot_log.report(BOOT_BUDGET_MS, cold)
+            elif c == "i" and IDLE_SLEEP:
+                sleeper.report()
+        await asyncio.sleep(CONSOLE_POLL)
+
+# Profiling probe. Asks to sleep PROFILE_PROBE at a time and records how late it wakes up,
+# which is how long other tasks held on to the loop. Prints the profile every PROFILE_REPORT
+# seconds.
+async def profile_task():
+    probe_ns = int(PROFILE_PROBE * 1000000000)
+    report_ns = PROFILE_REPORT * 1000000000
+    last = time.monotonic_ns()
+    while True:
+        await asyncio.sleep(PROFILE_PROBE)
+        now = time.monotonic_ns()
+        prof.lag(max(0, now - last - probe_ns))
+        last = now
+        if now - prof.since >= report_ns:
+            prof.report()
+            prof.reset()
+            last = time.monotonic_ns()
+
+async def main():
+    # Each part of the keypad runs as its own task and sleeps until it has something to do.
+    if PROFILE:
+        asyncio.create_task(profile_task())
+    elif IDLE_SLEEP:
+        asyncio.create_task(idle_task())
+    await asyncio.gather(
+        asyncio.create_task(keypad_task()),
+        asyncio.create_task(uart_task()),
+        asyncio.create_task(tx_task()),
+        asyncio.create_task(state_task()),
+        asyncio.create_task(prox_task()),
+        asyncio.create_task(dimmer_task()),
+        asyncio.create_task(volume_task()),
+        asyncio.create_task(scene_task()),
+        asyncio.create_task(anim_task()),
+        asyncio.create_task(led_task()),
+        asyncio.create_task(gc_task()),
+        asyncio.create_task(console_task()),
+    )
+
+boot_log.mark("tasks")
+asyncio.run(main())
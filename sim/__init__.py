@@ -0,0 +1,11 @@
+# Host-side simulation harness for the keypad firmware.
+#
+# Runs main.py (or any of the other firmware variants) on a regular Python install with fake
+# board, busio, digitalio, keypad, supervisor, micropython, gc, adafruit_tlc59711,
+# adafruit_neotrellis and adafruit_debouncer modules and a shared virtual clock (asyncio
+# included), so loop latency and LED timing can be measured and checked without the
+# ItsyBitsy. See scenarios.py for examples, or run "python -m sim".
+
+from sim.core import Clock, SimulationEnd
+from sim.receiver import FakeReceiver
+from sim.simulator import Simulator
@@ -0,0 +1,39 @@
+# Run the standard scenarios against a firmware file and print the measurements.
+#
+#   python -m sim [main.py] [scenario ...]
+
+import os
+import sys
+import traceback
+
+from sim import scenarios
+from sim.simulator import REPO_DIR
+
+
+def main(argv):
+    firmware = os.path.join(REPO_DIR, "main.py")
+    if argv and argv[0].endswith(".py"):
+        firmware = argv.pop(0)
+    selected = [s for s in scenarios.ALL if not argv or s.__name__ in argv]
+
+    failed = 0
+    for scenario in selected:
+        try:
+            results = scenario(firmware)
+        except AssertionError as e:
+            failed += 1
+            print("{:<12} FAIL  {}".format(scenario.__name__, e))
+            continue
+        except Exception:
+            failed += 1
+            print("{:<12} ERROR".format(scenario.__name__))
+            traceback.print_exc()
+            continue
+        print("{:<12} ok    {}".format(scenario.__name__, "  ".join(
+            "{}={:.1f}".format(k, v) if isinstance(v, float) else "{}={}".format(k, v)
+            for k, v in results.items())))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+# Simulation core: a virtual clock plus the state shared by the fake CircuitPython modules.
+#
+# Everything in the simulation runs on one virtual clock measured in nanoseconds. Time only
+# moves forward when the firmware sleeps, reads the clock or touches a peripheral, and each
+# of those costs a small, configurable amount of virtual time. That lets a fade that takes a
+# second on the keypad run in a few milliseconds on the host, and makes every run
+# repeatable.
+
+import heapq
+
+# Installed by Simulator.run() so the fake modules can find the running simulation.
+current = None
+
+
+# Raised out of the firmware once the simulation runs past its end time. It derives from
+# BaseException so the firmware's own error handling doesn't swallow it.
+class SimulationEnd(BaseException):
+    pass
+
+
+class Clock:
+    def __init__(self, poll_cost_ns=20000):
+        self.now_ns = 0
+        self.end_ns = None
+        self.ended = False
+        # Virtual time charged every time the firmware polls a peripheral or reads the clock.
+        # Without it a busy loop would never let time move forward.
+        self.poll_cost_ns = poll_cost_ns
+        self._queue = []
+        self._seq = 0
+
+    # Run fn() when the clock reaches t_ns.
+    def at(self, t_ns, fn):
+        self._seq += 1
+        heapq.heappush(self._queue, (int(t_ns), self._seq, fn))
+
+    def after(self, delay_ns, fn):
+        self.at(self.now_ns + delay_ns, fn)
+
+    # Time of the next scheduled event, or None.
+    def next_event_ns(self):
+        return self._queue[0][0] if self._queue else None
+
+    # Move the clock forward, firing any scheduled events on the way in order.
+    def advance(self, ns):
+        if self.ended:
+            return
+        target = self.now_ns + max(0, int(ns))
+        if self.end_ns is not None and target > self.end_ns:
+            target = self.end_ns
+        queue = self._queue
+        while queue and queue[0][0] <= target:
+            t, _, fn = heapq.heappop(queue)
+            if t > self.now_ns:
+                self.now_ns = t
+            fn()
+        self.now_ns = target
+        if self.end_ns is not None and self.now_ns >= self.end_ns:
+            # Only raise once, so the firmware (or asyncio) can clean up after the first one.
+            self.ended = True
+            raise SimulationEnd()
+
+    def poll(self):
+        self.advance(self.poll_cost_ns)
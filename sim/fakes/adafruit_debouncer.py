@@ -0,0 +1,44 @@
+# Fake adafruit_debouncer. Same state machine as the real library, timed on the virtual clock.
+
+from sim import core
+
+
+class Debouncer:
+    def __init__(self, io_or_predicate, interval=0.010):
+        if hasattr(io_or_predicate, "value"):
+            self._read = lambda: io_or_predicate.value
+        else:
+            self._read = io_or_predicate
+        self.interval_ns = int(interval * 1000000000)
+        self._unstable = self._stable = bool(self._read())
+        self._changed = False
+        self._last_bounce_ns = 0
+        self._state_changed_ns = 0
+
+    def update(self, new_state=None):
+        now = core.current.clock.now_ns
+        self._changed = False
+        current = bool(self._read()) if new_state is None else bool(new_state)
+        if current != self._unstable:
+            self._last_bounce_ns = now
+            self._unstable = current
+        elif now - self._last_bounce_ns >= self.interval_ns and current != self._stable:
+            self._stable = current
+            self._changed = True
+            self._state_changed_ns = now
+
+    @property
+    def value(self):
+        return self._stable
+
+    @property
+    def rose(self):
+        return self._stable and self._changed
+
+    @property
+    def fell(self):
+        return not self._stable and self._changed
+
+    @property
+    def current_duration(self):
+        return (core.current.clock.now_ns - self._state_changed_ns) / 1000000000
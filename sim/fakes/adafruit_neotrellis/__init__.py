@@ -0,0 +1 @@
+# Fake adafruit_neotrellis package. See neotrellis.py.
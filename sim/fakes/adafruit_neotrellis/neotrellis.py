@@ -0,0 +1,136 @@
+# Fake NeoTrellis: a 4x4 keypad and 16 NeoPixels behind a seesaw chip on I2C.
+#
+# Nothing here talks to the keys or pixels directly, everything is an I2C transaction, and
+# those are what cost time on the real board. The transactions follow what the Adafruit
+# seesaw driver sends, roughly:
+#
+#  * sync() reads the number of waiting key events, waits for the seesaw to answer, then
+#    reads the events if there are any and calls the callbacks.
+#  * A pixel write with auto_write on is one write of the pixel's offset and color and one
+#    show command. With auto_write off it only changes the local copy.
+#  * show() writes the whole pixel buffer in chunks that fit the seesaw's receive buffer,
+#    then sends the show command.
+#
+# The keys take presses from the simulator like the keypad module does, and the pixels are
+# what the simulator records as the LEDs. A pixel's entry in the show log is its packed
+# 0xRRGGBB color. Created with interrupt=True, the seesaw pulls its INT line low while key
+# events are waiting, on the board pin named by the simulator's trellis_int_pin.
+
+from sim import core
+
+SEESAW_ADDRESS = 0x2E
+READ_DELAY_NS = 500000      # wait between asking the seesaw for something and reading it
+CHUNK = 22                  # pixel bytes per write, after the 2-byte buffer offset
+
+
+class KeyEvent:
+    def __init__(self, number, edge):
+        self.number = number
+        self.edge = edge
+
+
+class _Keys:
+    def __init__(self, trellis):
+        self._trellis = trellis
+        self._events = []
+
+    def _put(self, key_number, pressed):
+        self._events.append((key_number, pressed))
+        self._trellis._update_int()
+
+
+class NeoPixel:
+    def __init__(self, i2c, n=16):
+        self._i2c = i2c
+        self.n = n
+        self.channel_count = n
+        self.auto_write = True
+        self.brightness = 1.0
+        self._pixels = [0] * n
+        # (time_ns, tuple of packed colors) for every show, like the TLC59711 fake's
+        self.show_log = []
+        core.current.attach_leds(self)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        return self._pixels[i]
+
+    def __setitem__(self, i, color):
+        if not isinstance(color, int):
+            color = (color[0] << 16) | (color[1] << 8) | color[2]
+        self._pixels[i] = color
+        if self.auto_write:
+            self._i2c._transaction("pixels", 2 + 2 + 3)
+            self._show()
+
+    def fill(self, color):
+        auto_write = self.auto_write
+        self.auto_write = False
+        for i in range(self.n):
+            self[i] = color
+        self.auto_write = auto_write
+        if auto_write:
+            self.show()
+
+    def show(self):
+        size = self.n * 3
+        for offset in range(0, size, CHUNK):
+            self._i2c._transaction("pixels", 2 + 2 + min(CHUNK, size - offset))
+        self._show()
+
+    def _show(self):
+        self._i2c._transaction("pixels", 2)
+        self.show_log.append((core.current.clock.now_ns, tuple(self._pixels)))
+
+
+class NeoTrellis:
+    EDGE_HIGH = 0
+    EDGE_LOW = 1
+    EDGE_FALLING = 2
+    EDGE_RISING = 3
+
+    def __init__(self, i2c_bus, interrupt=False, addr=SEESAW_ADDRESS, drive_mode=None):
+        self.i2c_device = i2c_bus
+        self.interrupt_enabled = interrupt
+        self.callbacks = [None] * 16
+        self.pixels = NeoPixel(i2c_bus)
+        self._edges = [set() for _ in range(16)]
+        # The seesaw scans its keys on its own and queues the events, so a press shows up
+        # at the next sync() after it happens.
+        self.interval_ns = 1
+        self.events = _Keys(self)
+        core.current.attach_keypad(self)
+        self._update_int()
+
+    def _update_int(self):
+        sim = core.current
+        if self.interrupt_enabled and self.events._events:
+            sim.pins[sim.trellis_int_pin] = False
+        else:
+            sim.pins.pop(sim.trellis_int_pin, None)
+
+    def activate_key(self, key, edge, enable=True):
+        self.i2c_device._transaction("keypad", 2 + 2)
+        if enable:
+            self._edges[key].add(edge)
+        else:
+            self._edges[key].discard(edge)
+
+    def sync(self):
+        i2c = self.i2c_device
+        i2c._transaction("keypad", 2, READ_DELAY_NS)
+        i2c._transaction("keypad", 1)
+        events = self.events._events
+        if not events:
+            return
+        i2c._transaction("keypad", 2, READ_DELAY_NS)
+        i2c._transaction("keypad", len(events))
+        pending = list(events)
+        del events[:]
+        self._update_int()
+        for number, pressed in pending:
+            edge = self.EDGE_RISING if pressed else self.EDGE_FALLING
+            if edge in self._edges[number] and self.callbacks[number] is not None:
+                self.callbacks[number](KeyEvent(number, edge))
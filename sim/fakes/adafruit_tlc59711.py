@@ -0,0 +1,40 @@
+# Fake TLC59711 driver. Every set_channel() and show() is recorded with the virtual time,
+# and show() costs as long as the 28-byte SPI transfer would.
+
+from sim import core
+
+
+class TLC59711:
+    def __init__(self, spi, *, pixel_count=4):
+        self._spi = spi
+        self.pixel_count = pixel_count
+        self.channel_count = pixel_count * 3
+        self.channels = [0] * self.channel_count
+        self.shown = [0] * self.channel_count
+        # (time_ns, channel, value) for every set_channel() call
+        self.set_log = []
+        # (time_ns, tuple of all channel values) for every show() call
+        self.show_log = []
+        core.current.attach_leds(self)
+
+    def set_channel(self, channel, value):
+        if not 0 <= channel < self.channel_count:
+            raise IndexError("channel {} out of range".format(channel))
+        if not 0 <= value <= 65535:
+            raise ValueError("value {} out of range".format(value))
+        self.channels[channel] = value
+        self.set_log.append((core.current.clock.now_ns, channel, value))
+
+    def __setitem__(self, key, value):
+        base = key * 3
+        for i in range(3):
+            self.set_channel(base + i, value[i])
+
+    def __getitem__(self, key):
+        base = key * 3
+        return tuple(self.channels[base:base + 3])
+
+    def show(self):
+        self._spi.write(bytes(28 * (self.pixel_count // 4 or 1)))
+        self.shown = list(self.channels)
+        self.show_log.append((core.current.clock.now_ns, tuple(self.channels)))
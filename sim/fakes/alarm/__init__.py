@@ -0,0 +1,39 @@
+# Fake alarm module: light sleep on the virtual clock. Scripted events keep happening while
+# the firmware sleeps (keys get scanned, bytes arrive on the UART), and it wakes at the time
+# alarm or as soon as a pin alarm's pin reads its value. Every sleep is logged in
+# Simulator.sleep_log as (start_ns, end_ns, pin name or "time").
+
+from sim import core
+from alarm import pin, time
+
+wake_alarm = None
+
+
+def light_sleep_until_alarms(*alarms):
+    global wake_alarm
+    sim = core.current
+    clock = sim.clock
+    timers = [a for a in alarms if isinstance(a, time.TimeAlarm)]
+    pins = [a for a in alarms if isinstance(a, pin.PinAlarm)]
+    deadline = min(a.monotonic_ns for a in timers) if timers else None
+    start = clock.now_ns
+    woke = None
+    while woke is None:
+        for a in pins:
+            if sim.pin_value(a.pin.name, not a.value if a.pull else False) == a.value:
+                woke = a
+                break
+        else:
+            if deadline is not None and clock.now_ns >= deadline:
+                woke = timers[0]
+                break
+            next_ns = clock.next_event_ns()
+            if deadline is not None and (next_ns is None or next_ns > deadline):
+                next_ns = deadline
+            if next_ns is None:
+                next_ns = clock.end_ns
+            clock.advance(next_ns - clock.now_ns)
+    sim.sleep_log.append((start, clock.now_ns,
+                          woke.pin.name if isinstance(woke, pin.PinAlarm) else "time"))
+    wake_alarm = woke
+    return woke
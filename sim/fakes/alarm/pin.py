@@ -0,0 +1,13 @@
+# Fake alarm.pin. The simulator checks the pin's scripted level while the firmware sleeps.
+
+from sim import core
+
+
+class PinAlarm:
+    def __init__(self, pin, value, edge=False, pull=False):
+        if pin.name in core.current.claimed_pins:
+            raise ValueError("{} in use".format(pin))
+        self.pin = pin
+        self.value = value
+        self.edge = edge
+        self.pull = pull
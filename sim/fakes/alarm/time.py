@@ -0,0 +1,9 @@
+# Fake alarm.time, on the virtual clock.
+
+
+class TimeAlarm:
+    def __init__(self, *, monotonic_time=None, epoch_time=None):
+        if monotonic_time is None:
+            raise ValueError("only monotonic_time is supported")
+        self.monotonic_time = monotonic_time
+        self.monotonic_ns = int(monotonic_time * 1000000000)
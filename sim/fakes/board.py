@@ -0,0 +1,21 @@
+# Fake board module. Pins are plain named objects; the simulator refers to them by name.
+
+
+class Pin:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "board." + self.name
+
+
+for _name in ("A0", "A1", "A2", "A3", "A4", "A5", "D0", "D1", "D2", "D3", "D4", "D5", "D7",
+              "D9", "D10", "D11", "D12", "D13", "TX", "RX", "SCK", "MOSI", "MISO", "SDA",
+              "SCL", "LED", "NEOPIXEL"):
+    globals()[_name] = Pin(_name)
+del _name
+
+
+def I2C():
+    import busio
+    return busio.I2C(SCL, SDA)
@@ -0,0 +1,148 @@
+# Fake busio module.
+#
+# The UART is an in-memory pipe paced at the configured baud rate: bytes the simulator sends
+# arrive one character time apart and land in a receive FIFO of the real size, so a slow
+# reader overflows it just like the hardware does. Reads wait out the timeout for bytes that
+# haven't arrived, as they do on the board. Writes are logged with timestamps and
+# block for as long as the bytes take on the wire. The I2C bus only keeps time and a log of
+# transactions for the fake devices on it.
+
+from sim import core
+
+
+class UART:
+    def __init__(self, tx, rx, *, baudrate=9600, bits=8, parity=None, stop=1, timeout=1,
+                 receiver_buffer_size=64):
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.receiver_buffer_size = receiver_buffer_size
+        self._rx = bytearray()
+        self.overflowed = 0
+        core.current.attach_uart(self)
+
+    # Nanoseconds to move one character (start + 8 data + stop bits) over the wire.
+    @property
+    def char_time_ns(self):
+        return 10 * 1000000000 // self.baudrate
+
+    # Called by the simulator as each byte arrives.
+    def _receive_byte(self, b):
+        if len(self._rx) >= self.receiver_buffer_size:
+            self.overflowed += 1
+        else:
+            self._rx.append(b)
+
+    @property
+    def in_waiting(self):
+        core.current.clock.poll()
+        return len(self._rx)
+
+    # Like the SAMD51 port, read() and readinto() keep going until they have every byte asked
+    # for, or until timeout seconds pass without a new character, so asking for more than
+    # in_waiting stalls the caller.
+    def _take(self, nbytes):
+        clock = core.current.clock
+        clock.poll()
+        timeout_ns = int(self.timeout * 1000000000)
+        deadline = clock.now_ns + timeout_ns
+        data = bytearray()
+        while nbytes is None or len(data) < nbytes:
+            if self._rx:
+                n = len(self._rx) if nbytes is None else min(nbytes - len(data), len(self._rx))
+                data += self._rx[:n]
+                del self._rx[:n]
+                deadline = clock.now_ns + timeout_ns
+                continue
+            # Wait for whatever happens next on the clock, which may be a byte arriving.
+            next_ns = clock.next_event_ns()
+            if next_ns is None or next_ns > deadline:
+                clock.advance(deadline - clock.now_ns)
+                break
+            clock.advance(next_ns - clock.now_ns)
+        return bytes(data) if data else None
+
+    def read(self, nbytes=None):
+        return self._take(nbytes)
+
+    def readinto(self, buf, nbytes=None):
+        data = self._take(len(buf) if nbytes is None else min(nbytes, len(buf)))
+        if data is None:
+            return None
+        buf[:len(data)] = data
+        return len(data)
+
+    def readline(self):
+        core.current.clock.poll()
+        i = self._rx.find(b"\n")
+        return self.read(len(self._rx) if i < 0 else i + 1)
+
+    def write(self, buf):
+        sim = core.current
+        data = bytes(buf)
+        sim.clock.poll()
+        sim.uart_written(data)
+        # The SAMD51 port blocks until the bytes are out.
+        sim.clock.advance(len(data) * self.char_time_ns)
+        return len(data)
+
+    def reset_input_buffer(self):
+        self._rx = bytearray()
+
+    def deinit(self):
+        pass
+
+
+class SPI:
+    def __init__(self, clock, MOSI=None, MISO=None):
+        self.frequency = 100000
+        self.bytes_written = 0
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def configure(self, *, baudrate=100000, polarity=0, phase=0, bits=8):
+        self.frequency = baudrate
+
+    def write(self, buf, *, start=0, end=None):
+        n = len(buf[start:end])
+        self.bytes_written += n
+        core.current.clock.advance(n * 8 * 1000000000 // self.frequency)
+
+    def deinit(self):
+        pass
+
+
+class I2C:
+    def __init__(self, scl, sda, *, frequency=100000):
+        self.frequency = frequency
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return []
+
+    # Called by fake I2C devices for every transaction. Logs it and takes as long as the
+    # address byte, nbytes and the acks would at the bus frequency, plus any time the device
+    # makes the driver wait before it can read the answer.
+    def _transaction(self, device, nbytes, delay_ns=0):
+        sim = core.current
+        sim.i2c_log.append((sim.clock.now_ns, device, nbytes))
+        sim.clock.advance((nbytes + 1) * 9 * 1000000000 // self.frequency + delay_ns)
+
+    def deinit(self):
+        pass
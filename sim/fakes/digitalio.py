@@ -0,0 +1,51 @@
+# Fake digitalio module. Input values come from the simulator's scripted pin levels.
+
+from sim import core
+
+
+class Direction:
+    INPUT = "INPUT"
+    OUTPUT = "OUTPUT"
+
+
+class Pull:
+    UP = "UP"
+    DOWN = "DOWN"
+
+
+class DriveMode:
+    PUSH_PULL = "PUSH_PULL"
+    OPEN_DRAIN = "OPEN_DRAIN"
+
+
+class DigitalInOut:
+    def __init__(self, pin):
+        self.pin = pin
+        core.current.claimed_pins.add(pin.name)
+        self.direction = Direction.INPUT
+        self.pull = None
+        self._output = False
+
+    @property
+    def value(self):
+        sim = core.current
+        sim.clock.poll()
+        if self.direction == Direction.OUTPUT:
+            return self._output
+        return sim.pin_value(self.pin.name, self.pull == Pull.UP)
+
+    @value.setter
+    def value(self, value):
+        self._output = bool(value)
+        core.current.clock.poll()
+
+    def switch_to_input(self, pull=None):
+        self.direction = Direction.INPUT
+        self.pull = pull
+
+    def switch_to_output(self, value=False, drive_mode=DriveMode.PUSH_PULL):
+        self.direction = Direction.OUTPUT
+        self._output = value
+
+    def deinit(self):
+        core.current.claimed_pins.discard(self.pin.name)
@@ -0,0 +1,36 @@
+# Fake gc module. There's no way to know what the firmware would allocate on the M4, so the
+# heap just has Simulator.heap_free bytes free, and each collection costs
+# Simulator.gc_pause_us of virtual time and is logged in Simulator.gc_log.
+
+from sim import core
+
+_enabled = True
+
+
+def collect():
+    sim = core.current
+    sim.gc_log.append(sim.clock.now_ns)
+    sim.clock.advance(sim.gc_pause_us * 1000)
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def isenabled():
+    return _enabled
+
+
+def mem_free():
+    core.current.clock.poll()
+    return core.current.heap_free
+
+
+def mem_alloc():
+    return core.current.heap_size - core.current.heap_free
@@ -0,0 +1,74 @@
+# Fake keypad module. Key presses are injected by the simulator and show up in the event
+# queue at the next scan, the same way the real background scanner reports them.
+
+from sim import core
+
+
+class Event:
+    def __init__(self, key_number=0, pressed=True, timestamp=None):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = timestamp
+
+    @property
+    def released(self):
+        return not self.pressed
+
+    def __eq__(self, other):
+        return (self.key_number, self.pressed) == (other.key_number, other.pressed)
+
+    def __repr__(self):
+        return "<Event: key_number {} {}>".format(
+            self.key_number, "pressed" if self.pressed else "released")
+
+
+class EventQueue:
+    def __init__(self, max_events=64):
+        self.max_events = max_events
+        self.overflowed = False
+        self._events = []
+
+    def _put(self, key_number, pressed):
+        if len(self._events) >= self.max_events:
+            self.overflowed = True
+            return
+        self._events.append((key_number, pressed, core.current.clock.now_ns // 1000000))
+
+    def get(self):
+        core.current.clock.poll()
+        if not self._events:
+            return None
+        key_number, pressed, timestamp = self._events.pop(0)
+        return Event(key_number, pressed, timestamp)
+
+    def get_into(self, event):
+        core.current.clock.poll()
+        if not self._events:
+            return False
+        event.key_number, event.pressed, event.timestamp = self._events.pop(0)
+        return True
+
+    def clear(self):
+        self._events = []
+        self.overflowed = False
+
+    def __len__(self):
+        return len(self._events)
+
+    def __bool__(self):
+        return bool(self._events)
+
+
+class KeyMatrix:
+    def __init__(self, row_pins, column_pins, columns_to_anodes=True, interval=0.02,
+                 max_events=64):
+        self.key_count = len(row_pins) * len(column_pins)
+        self.interval_ns = int(interval * 1000000000)
+        self.events = EventQueue(max_events)
+        core.current.attach_keypad(self)
+
+    def reset(self):
+        pass
+
+    def deinit(self):
+        pass
@@ -0,0 +1,24 @@
+# Fake microcontroller module. Only nvm is here, backed by Simulator.nvm so a scenario can
+# carry it from one run to the next like a power cycle. Writes are logged in
+# Simulator.nvm_log as (time_ns, offset, bytes).
+
+from sim import core
+
+
+class _Nvm:
+    def __len__(self):
+        return len(core.current.nvm)
+
+    def __getitem__(self, index):
+        return core.current.nvm[index]
+
+    def __setitem__(self, index, value):
+        sim = core.current
+        sim.clock.poll()
+        start = index.start if isinstance(index, slice) else index
+        sim.nvm_log.append((sim.clock.now_ns, start or 0, bytes(value) if isinstance(index, slice)
+                            else bytes((value,))))
+        sim.nvm[index] = value
+
+
+nvm = _Nvm()
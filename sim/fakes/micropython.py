@@ -0,0 +1,5 @@
+# Fake micropython module. const() is just the value on a computer.
+
+
+def const(value):
+    return value
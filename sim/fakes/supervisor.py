@@ -0,0 +1,24 @@
+# Fake supervisor module. runtime.serial_bytes_available is for reading the USB console:
+# Simulator.type() queues the characters and sys.stdin hands them out. Every run is a power
+# up as far as runtime.run_reason goes.
+
+from sim import core
+
+
+class RunReason:
+    STARTUP = "STARTUP"
+    AUTO_RELOAD = "AUTO_RELOAD"
+    SUPERVISOR_RELOAD = "SUPERVISOR_RELOAD"
+    REPL_RELOAD = "REPL_RELOAD"
+
+
+class Runtime:
+    run_reason = RunReason.STARTUP
+
+    @property
+    def serial_bytes_available(self):
+        core.current.clock.poll()
+        return bool(core.current.console_input)
+
+
+runtime = Runtime()
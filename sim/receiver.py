@@ -0,0 +1,144 @@
+# A small model of the Onkyo's serial port, good enough to exercise the keypad firmware.
+#
+# It answers the commands the firmware sends with the same status messages the TX-RZ800
+# does, ignores input changes while in standby, takes a while to act on each command and
+# only works on one command at a time, and sends a flurry of status messages at power on.
+# It can also be made to ignore everything for a while after it powers on, which some
+# receivers do while they boot.
+
+MS = 1000000
+
+
+# The receiver's state and how it answers each command, without any timing. The simulator
+# drives it on the virtual clock (FakeReceiver below) and the host tools drive it in real
+# time over TCP or a pty (tools/fake_onkyo.py).
+class ReceiverModel:
+    def __init__(self, power=True, input="01", volume=0x28, mute=False):
+        self.power = power
+        self.input = input
+        self.volume = volume
+        self.mute = mute
+        self.listening_mode = "00"
+        self.tuner = "08750"
+        # Commands other than power are ignored for this long after powering on.
+        self.boot_ms = 0
+        self.ready_ns = 0
+        # Every command the receiver acted on, as (time_ns, command)
+        self.commands = []
+        # Every input the receiver actually switched to, as (time_ns, input)
+        self.input_changes = []
+
+    # Carry out a command like "SLI12" and return the status messages it produces, like
+    # ["SLI12"].
+    def execute(self, command, now_ns=0):
+        self.commands.append((now_ns, command))
+        code, param = command[:3], command[3:]
+        if code == "PWR":
+            if param == "01" and not self.power:
+                self.power = True
+                self.ready_ns = now_ns + self.boot_ms * MS
+                return self.power_on_flurry()
+            if param == "00":
+                self.power = False
+            return ["PWR0" + ("1" if self.power else "0")]
+        if now_ns < self.ready_ns:
+            return []
+        if code == "SLI":
+            if param != "QSTN" and self.power:
+                if param in ("UP", "DOWN"):
+                    return []
+                if param != self.input:
+                    self.input_changes.append((now_ns, param))
+                self.input = param
+            return ["SLI" + self.input]
+        if not self.power:
+            return []
+        if code == "MVL":
+            if param == "UP":
+                self.volume = min(0x64, self.volume + 1)
+            elif param == "DOWN":
+                self.volume = max(0, self.volume - 1)
+            elif param != "QSTN":
+                self.volume = int(param, 16)
+            return ["MVL%02X" % self.volume]
+        if code == "AMT":
+            if param == "TG":
+                self.mute = not self.mute
+            elif param != "QSTN":
+                self.mute = param == "01"
+            return ["AMT0" + ("1" if self.mute else "0")]
+        if code == "LMD":
+            if param != "QSTN":
+                self.listening_mode = param
+            return ["LMD" + self.listening_mode]
+        if code == "TUN":
+            if param != "QSTN":
+                self.tuner = param
+            return ["TUN" + self.tuner]
+        return []
+
+    # What the TX-RZ800 sends when it comes out of standby.
+    def power_on_flurry(self):
+        return ["PWR01", "AMT0" + ("1" if self.mute else "0"), "MVL%02X" % self.volume,
+                "SLI" + self.input, "LMD" + self.listening_mode, "TUN" + self.tuner,
+                "IFAHDMI 1,PCM,48 kHz,2.0 ch,All Ch Stereo,5.1.2 ch,",
+                "IFV,,,,,,,,,,", "SLZ0C", "MVZ28", "ZPW00", "RAS00", "DIM00",
+                "SLP00", "HDO01", "CTL00", "SWL00", "TFRB00T00", "DIM00"]
+
+    # How long the receiver takes to act on a command.
+    def busy_ms(self, command, response_ms, switch_ms):
+        return response_ms + (switch_ms if command.startswith(("SLI", "PWR01")) else 0)
+
+
+# Commands in a chunk of bytes written to the receiver, e.g. b"!1SLI12\r" -> "SLI12". pending
+# holds on to a partial command until the rest of it arrives.
+def split_commands(pending, data):
+    pending += data
+    commands = []
+    while True:
+        i = pending.find(b"\r")
+        if i < 0:
+            break
+        frame = bytes(pending[:i])
+        del pending[:i + 1]
+        j = frame.rfind(b"!1")
+        if j >= 0 and len(frame) - j >= 5:
+            commands.append(frame[j + 2:].decode("ascii"))
+    return commands
+
+
+def encode_reply(message):
+    return b"!1" + message.encode("ascii") + b"\x1a\r\n"
+
+
+# The receiver on the simulator's virtual clock, connected to the fake UART.
+class FakeReceiver(ReceiverModel):
+    def __init__(self, sim, power=True, input="01", volume=0x28, mute=False,
+                 response_ms=30, switch_ms=250, boot_ms=0):
+        super().__init__(power, input, volume, mute)
+        self.boot_ms = boot_ms
+        self.sim = sim
+        self.response_ms = response_ms
+        self.switch_ms = switch_ms
+        self._busy_until = 0
+        self._pending = bytearray()
+
+    # Called with the bytes the keypad wrote to the UART.
+    def written(self, data):
+        for command in split_commands(self._pending, data):
+            self._queue(command)
+
+    # Commands are handled one at a time, in order.
+    def _queue(self, command):
+        clock = self.sim.clock
+        done = max(clock.now_ns, self._busy_until) + \
+            self.busy_ms(command, self.response_ms, self.switch_ms) * MS
+        self._busy_until = done
+        clock.at(done, lambda: self._execute(command))
+
+    def reply(self, message):
+        self.sim.send(encode_reply(message))
+
+    def _execute(self, command):
+        for message in self.execute(command, self.sim.clock.now_ns):
+            self.reply(message)
@@ -0,0 +1,424 @@
+# Standard scenarios for the keypad firmware. Each one scripts a session against the fake
+# receiver, runs the firmware under the simulator and returns a dict of measurements. The
+# checks are deliberately loose: they catch things that are broken, not things that are a
+# few milliseconds slower. Run them all with "python -m sim".
+
+import os
+import tempfile
+
+from sim import FakeReceiver, Simulator
+from sim.receiver import encode_reply
+
+MS = 1000000
+S = 1000000000
+
+# Key numbers on the keypad (see the layout in main.py).
+TV_KEY = 0
+OFF_KEY = 11
+VOLUME_UP_KEY = 12
+SCENE_KEY = 14
+PROX_PIN = "D11"
+DIM_PIN = "D12"
+
+
+def _session(seconds, power=True, input="01"):
+    sim = Simulator(seconds=seconds)
+    sim.receiver = FakeReceiver(sim, power=power, input=input)
+    return sim
+
+
+def _lit(channels):
+    return [i for i, v in enumerate(channels) if v]
+
+
+# What the firmware printed on the console, less the boot report it prints at startup.
+def _console_lines(sim):
+    return [line for line in sim.console_text.splitlines() if not line.startswith("boot:")]
+
+
+# Boot with the receiver on. The Apple TV button (key 8, 1SLI01) should end up lit.
+def boot(firmware):
+    sim = _session(2.0).run(firmware)
+    t = sim.first_show(lambda ch: _lit(ch) == [8])
+    assert t is not None, "Apple TV button never lit after boot"
+    # The receiver answers the queries in about 300 ms. Much more than that means something
+    # sat on the event loop, like a UART read waiting out its timeout.
+    assert t < 500 * MS, "Apple TV button took {:.0f} ms to light".format(t / MS)
+    return {"boot_to_led_ms": t / MS, "speedup": sim.speedup}
+
+
+# Press TV and measure how long it takes for its button to light.
+def key_to_led(firmware):
+    sim = _session(3.0)
+    sim.press(TV_KEY, at=1.0)
+    sim.run(firmware)
+    press_ns = sim.key_log[0][0]
+    writes = [t for t, data in sim.tx_log if t >= press_ns and b"SLI12" in data]
+    assert writes, "key press never reached the UART"
+    t = sim.first_show(lambda ch: _lit(ch) == [TV_KEY], press_ns)
+    assert t is not None, "TV button never lit"
+    assert t - press_ns < 500 * MS, "TV button took {:.0f} ms to light".format((t - press_ns) / MS)
+    return {"key_to_uart_ms": (writes[0] - press_ns) / MS, "key_to_led_ms": (t - press_ns) / MS,
+            "speedup": sim.speedup}
+
+
+# Touch the case for half a second. Everything lights, holds for 3 s after release and then
+# fades back to just the selected input.
+def prox_fade(firmware):
+    sim = _session(8.0)
+    sim.pulse_pin(PROX_PIN, at=1.0, duration=0.5)
+    sim.run(firmware)
+    lit = sim.first_show(lambda ch: len(_lit(ch)) == 12, 1 * S)
+    assert lit is not None, "prox never lit every button"
+    release = int(1.5 * S)
+    done = sim.first_show(lambda ch: _lit(ch) == [8], release)
+    assert done is not None, "fade never finished"
+    return {"prox_to_led_ms": (lit - 1 * S) / MS, "release_to_dark_ms": (done - release) / MS,
+            "shows": len(sim.leds.show_log), "speedup": sim.speedup}
+
+
+# Press OFF. The off button lights, then fades out to a dark keypad.
+def power_off(firmware):
+    sim = _session(5.0)
+    sim.press(OFF_KEY, at=1.0)
+    sim.run(firmware)
+    lit = sim.first_show(lambda ch: _lit(ch) == [OFF_KEY], 1 * S)
+    assert lit is not None, "off button never lit"
+    dark = sim.first_show(lambda ch: not _lit(ch), lit)
+    assert dark is not None, "keypad never went dark"
+    assert not sim.receiver.power
+    return {"key_to_off_led_ms": (lit - 1 * S) / MS, "off_fade_ms": (dark - lit) / MS,
+            "speedup": sim.speedup}
+
+
+# Press the dimmer button while an input is selected.
+def dimmer(firmware):
+    sim = _session(3.0)
+    sim.pulse_pin(DIM_PIN, at=1.0, duration=0.1)
+    sim.run(firmware)
+    before = max(sim.shown_at(int(0.9 * S)))
+    after = max(sim.shown_at(int(2.0 * S)))
+    assert 0 < after < before, "dimmer didn't dim the selected button"
+    return {"level_before": before, "level_after": after, "speedup": sim.speedup}
+
+
+# Mash five different input keys 60 ms apart. The receiver shouldn't have to work through
+# every one of them, and the keypad should end up on the last one.
+def mash(firmware):
+    sim = _session(3.0)
+    keys = (0, 1, 2, 3, 4)
+    for i, key in enumerate(keys):
+        sim.press(key, at=1.0 + 0.06 * i, hold=0.03)
+    sim.run(firmware)
+    assert sim.receiver.input == "2B", "receiver ended up on " + sim.receiver.input
+    final = sim.first_show(lambda ch: _lit(ch) == [keys[-1]], 1 * S)
+    assert final is not None, "last key never lit"
+    return {"input_switches": len(sim.receiver.input_changes), "commands_sent": len(sim.tx_log),
+            "press_to_final_led_ms": (final - 1 * S) / MS, "speedup": sim.speedup}
+
+
+# Press a few keys, then ask for the latency report on the console. Every stage should have
+# an entry for each press.
+def latency_report(firmware):
+    sim = _session(6.0)
+    for i, key in enumerate((TV_KEY, 1, 2, TV_KEY)):
+        sim.press(key, at=1.0 + i)
+    sim.type("t", at=5.5)
+    sim.run(firmware)
+    lines = _console_lines(sim)
+    rows = {line[:22].strip(): line[22:].split() for line in lines[2:]}
+    assert "key -> shown" in rows, "no latency report on the console"
+    assert rows["key -> shown"][3] == "4", "expected 4 complete presses, got " + \
+        rows["key -> shown"][3]
+    return {"key_to_write_p50_ms": float(rows["key -> write"][0]),
+            "first_byte_to_parsed_p50_ms": float(rows["first byte -> parsed"][0]),
+            "key_to_shown_max_ms": float(rows["key -> shown"][2]), "speedup": sim.speedup}
+
+
+# Run with PROFILE turned on, since nothing else exercises the profiling code. The profile
+# is printed every 10 s.
+def profile(firmware):
+    with open(firmware) as f:
+        source = f.read()
+    assert "PROFILE = const(0)" in source, "firmware has no PROFILE switch"
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, os.path.basename(firmware))
+        with open(path, "w") as f:
+            f.write(source.replace("PROFILE = const(0)", "PROFILE = const(1)"))
+        sim = _session(11.0)
+        sim.pulse_pin(PROX_PIN, at=1.0, duration=0.5)
+        sim.press(TV_KEY, at=6.0)
+        sim.run(path)
+    lines = _console_lines(sim)
+    assert lines and lines[0].startswith("profile over"), "no profile on the console"
+    busy = next(line for line in lines if line.startswith("all")).split()[-1]
+    worst = lines[-1].split()[-2]
+    return {"busy_percent": float(busy), "worst_lag_us": int(worst), "speedup": sim.speedup}
+
+
+# Collections should only happen while the keypad is idle: never during the prox fade or
+# right after a key press, but regularly otherwise.
+def gc_idle(firmware):
+    sim = _session(30.0)
+    sim.pulse_pin(PROX_PIN, at=12.0, duration=0.5)
+    sim.press(TV_KEY, at=20.0)
+    sim.press(1, at=24.0)
+    sim.run(firmware)
+    busy = [(12 * S, int(16.6 * S)), (20 * S, 21 * S), (24 * S, 25 * S)]
+    during = [t for t in sim.gc_log if any(start <= t < end for start, end in busy)]
+    assert not during, "collected while busy at {} ms".format(during[0] // MS)
+    assert len(sim.gc_log) >= 2, "only {} collections".format(len(sim.gc_log))
+    return {"collections": len(sim.gc_log), "speedup": sim.speedup}
+
+
+# Memory stays low through a prox fade, as if the heap were mostly live data. The collector
+# should still collect, but not on every check in the middle of the fade.
+def gc_low(firmware):
+    sim = _session(10.0)
+    sim.heap_free = 8 * 1024
+    sim.pulse_pin(PROX_PIN, at=2.0, duration=0.5)
+    sim.run(firmware)
+    during = [t for t in sim.gc_log if 2 * S <= t < int(6.6 * S)]
+    assert during, "never collected with memory low"
+    assert len(during) <= 3, "{} collections in a 4.6 s fade".format(len(during))
+    return {"collections": len(during), "speedup": sim.speedup}
+
+
+# Hold volume up for two seconds. The volume should climb faster and faster, go out as a few
+# absolute MVL commands rather than one per step, and stop as soon as the key is let go.
+def volume_hold(firmware):
+    sim = _session(6.0)
+    start = sim.receiver.volume
+    sim.press(VOLUME_UP_KEY, at=2.0, hold=2.0)
+    sim.run(firmware)
+    sent = [(t, data) for t, data in sim.tx_log if data.startswith(b"!1MVL") and
+            not data.endswith(b"QSTN\r")]
+    assert sent, "volume key never sent anything"
+    steps = sim.receiver.volume - start
+    assert steps > 10, "volume only went up {} steps".format(steps)
+    assert len(sent) < steps, "{} commands for {} steps".format(len(sent), steps)
+    assert sent[-1][1] == b"!1MVL%02X\r" % sim.receiver.volume
+    release_ns = 4 * S
+    return {"steps": steps, "commands": len(sent),
+            "release_to_last_ms": (sent[-1][0] - release_ns) / MS, "speedup": sim.speedup}
+
+
+# The NeoTrellis prototype, main-trellis.py next to the firmware. Every LED frame should go
+# out as one batched show instead of a pair of I2C transactions for every pixel, and the
+# keypad should only be read when its INT line says a key changed.
+def trellis(firmware):
+    sim = _session(3.0)
+    sim.press(TV_KEY, at=2.0)
+    sim.run(os.path.join(os.path.dirname(firmware), "main-trellis.py"))
+    press_ns = sim.key_log[0][0]
+    writes = [t for t, data in sim.tx_log if t >= press_ns and b"SLI12" in data]
+    assert writes, "key press never reached the UART"
+    t = sim.first_show(lambda ch: _lit(ch) == [TV_KEY], press_ns)
+    assert t is not None, "TV button never lit"
+    pixels = [t_ns for t_ns, device, _ in sim.i2c_log if device == "pixels"]
+    per_show = len(pixels) / len(sim.leds.show_log)
+    assert per_show <= 4, "{:.1f} I2C transactions per show".format(per_show)
+    # Reads of the keypad once the startup sequence is over: only the press and release.
+    startup_ns = sim.leds.show_log[4][0]
+    keypad = [t_ns for t_ns, device, _ in sim.i2c_log if device == "keypad" and t_ns > startup_ns]
+    assert len(keypad) <= 8, "{} keypad transactions for one press".format(len(keypad))
+    return {"startup_i2c": len([t_ns for t_ns in pixels if t_ns < press_ns]),
+            "i2c_per_show": per_show, "keypad_i2c": len(keypad),
+            "key_to_uart_ms": (writes[0] - press_ns) / MS, "key_to_led_ms": (t - press_ns) / MS,
+            "speedup": sim.speedup}
+
+
+# The VINYL scene from a receiver in standby that ignores everything for a while after it
+# powers on. Each step should go out when the last one is acknowledged, the one the booting
+# receiver ignores should be sent again, and the receiver should end up where the scene says.
+def scene(firmware):
+    sim = Simulator(seconds=8.0)
+    sim.receiver = FakeReceiver(sim, power=False, boot_ms=700)
+    sim.press(SCENE_KEY, at=2.0)
+    sim.run(firmware)
+    r = sim.receiver
+    assert r.power, "receiver never powered on"
+    assert (r.input, r.listening_mode, r.volume) == ("02", "01", 0x30), \
+        "ended at input {} mode {} volume {:02X}".format(r.input, r.listening_mode, r.volume)
+    press_ns = sim.key_log[0][0]
+    acted = [t for t, command in r.commands if t >= press_ns]
+    resends = len([t for t, data in sim.tx_log if data == b"!1SLI02\r"]) - 1
+    assert resends >= 1, "ignored input change was never sent again"
+    return {"press_to_done_ms": (acted[-1] - press_ns) / MS, "resends": resends,
+            "speedup": sim.speedup}
+
+
+# Press TV with the receiver off, then the scene key before the receiver's on. The scene
+# takes over, and TV should stop pulsing for the power on it no longer waits for.
+def scene_over_pending(firmware):
+    sim = Simulator(seconds=8.0)
+    sim.receiver = FakeReceiver(sim, power=False, boot_ms=700)
+    sim.press(TV_KEY, at=2.0)
+    sim.press(SCENE_KEY, at=2.1)
+    sim.run(firmware)
+    levels = set(ch[TV_KEY] for t, ch in sim.leds.show_log if t > 2.2 * S)
+    assert len(levels) <= 1, "TV kept pulsing through the scene ({} levels)".format(len(levels))
+    assert sim.receiver.input == "02", "scene ended at input {}".format(sim.receiver.input)
+    return {"speedup": sim.speedup}
+
+
+# A receiver that never acknowledges the listening mode. The scene should give up on it
+# without sending the volume, and the keypad should keep working.
+def scene_abort(firmware):
+    sim = _session(12.0)
+    execute = sim.receiver.execute
+    sim.receiver.execute = lambda command, now_ns=0: \
+        [] if command.startswith("LMD") else execute(command, now_ns)
+    sim.press(SCENE_KEY, at=2.0)
+    sim.press(TV_KEY, at=10.0)
+    sim.run(firmware)
+    sent = [data for t, data in sim.tx_log]
+    assert b"!1MVL30\r" not in sent, "scene carried on past a step that failed"
+    tries = sent.count(b"!1LMD01\r")
+    assert tries == 4, "listening mode sent {} times".format(tries)
+    press_ns = sim.key_log[-1][0]
+    t = sim.first_show(lambda ch: _lit(ch) == [TV_KEY], press_ns)
+    assert t is not None, "TV button never lit after the scene gave up"
+    return {"lmd_tries": tries, "key_to_led_ms": (t - press_ns) / MS, "speedup": sim.speedup}
+
+
+# An input key pressed while the receiver is off. It should power the receiver on and
+# select the input the moment the power comes on, pulsing the key until it has.
+def power_on_input(firmware):
+    sim = _session(6.0, power=False)
+    sim.press(TV_KEY, at=2.0)
+    sim.run(firmware)
+    r = sim.receiver
+    assert r.power, "receiver never powered on"
+    assert r.input == "12", "receiver ended up on input {}".format(r.input)
+    press_ns = sim.key_log[0][0]
+    selected = [t for t, command in r.commands if command == "SLI12"][0]
+    levels = set(ch[TV_KEY] for t, ch in sim.leds.show_log if press_ns <= t < selected)
+    assert len(levels) > 2, "TV key didn't pulse while the receiver powered on"
+    final = sim.leds.show_log[-1][1]
+    assert _lit(final) == [TV_KEY], "lit {} at the end".format(_lit(final))
+    return {"press_to_input_ms": (selected - press_ns) / MS, "speedup": sim.speedup}
+
+
+# With the receiver off the keypad should spend the quiet stretches in light sleep, and wake
+# up for the prox sensor and for a key press. Runs again with IDLE_SLEEP off to show what the
+# sleep costs in wake-up latency.
+def idle_sleep(firmware):
+    with open(firmware) as f:
+        source = f.read()
+    assert "IDLE_SLEEP = const(1)" in source, "firmware has no IDLE_SLEEP switch"
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        awake = os.path.join(folder, os.path.basename(firmware))
+        with open(awake, "w") as f:
+            f.write(source.replace("IDLE_SLEEP = const(1)", "IDLE_SLEEP = const(0)"))
+        for name, path in (("asleep", firmware), ("awake", awake)):
+            sim = _session(30.0, power=False)
+            sim.pulse_pin(PROX_PIN, at=15.0, duration=0.5)
+            sim.press(TV_KEY, at=25.0)
+            sim.run(path)
+            lit = sim.first_show(lambda ch: len(_lit(ch)) == 12, 15 * S)
+            assert lit is not None, "prox never lit every button"
+            press_ns = sim.key_log[0][0]
+            writes = [t for t, data in sim.tx_log if t >= press_ns]
+            assert writes, "key press never reached the UART"
+            results[name] = sim, (lit - 15 * S) / MS, (writes[0] - press_ns) / MS
+    sim, prox_ms, key_ms = results["asleep"]
+    quiet = [(start, end) for start, end, _ in sim.sleep_log if 8 * S <= start < 15 * S]
+    asleep = sum(min(end, 15 * S) - start for start, end in quiet) / (7 * S)
+    assert asleep > 0.9, "only asleep {:.0%} of the quiet time".format(asleep)
+    assert results["awake"][0].sleep_log == [], "slept with IDLE_SLEEP off"
+    # The event loop doesn't run while asleep, so the collector has to get its turn between
+    # naps or a long night would fill the heap. It's asleep from 5 s until the prox wakes it,
+    # long enough for the 10 s collection interval to come around.
+    first_nap = min(start for start, _, _ in sim.sleep_log)
+    between = [t for t in sim.gc_log if first_nap < t < 15 * S]
+    assert between, "never collected while asleep"
+    assert prox_ms < 50, "prox took {:.1f} ms to light the keypad".format(prox_ms)
+    assert key_ms < 100, "key took {:.1f} ms to reach the UART".format(key_ms)
+    return {"asleep_percent": round(asleep * 100, 1), "wakes_per_s": round(len(quiet) / 7, 1),
+            "collections_asleep": len(between),
+            "prox_to_led_ms": prox_ms, "awake_prox_to_led_ms": results["awake"][1],
+            "key_to_uart_ms": key_ms, "awake_key_to_uart_ms": results["awake"][2],
+            "speedup": sim.speedup}
+
+
+# Press volume up with the receiver in standby, which ignores it. The command never gets
+# acknowledged, but once its acknowledgement has timed out the keypad should go to sleep
+# like it would have without the press.
+def idle_unacked(firmware):
+    sim = _session(15.0, power=False)
+    sim.press(VOLUME_UP_KEY, at=1.0)
+    sim.run(firmware)
+    press_ns = sim.key_log[0][0]
+    sent = [t for t, data in sim.tx_log if t >= press_ns and data.startswith(b"!1MVL")]
+    assert sent, "volume key never reached the UART"
+    naps = [start for start, _, _ in sim.sleep_log if start > press_ns]
+    assert naps, "never slept after the unanswered command"
+    return {"press_to_sleep_ms": (naps[0] - press_ns) / MS, "naps": len(naps),
+            "speedup": sim.speedup}
+
+
+# With the receiver in standby, a power status that says what we already know, like the
+# answer to a keepalive, shouldn't replay the off key's fade. Pressing OFF still should.
+def standby_status(firmware):
+    sim = _session(12.0, power=False)
+    sim.send(encode_reply("PWR00"), at=4.0)
+    sim.press(OFF_KEY, at=8.0)
+    sim.run(firmware)
+    lit = sim.first_show(lambda ch: any(ch), 4 * S)
+    assert lit is not None, "OFF never lit"
+    assert lit > 8 * S, "a repeated PWR00 lit the keypad at {} ms".format(lit // MS)
+    return {"off_to_led_ms": (lit - 8 * S) / MS, "speedup": sim.speedup}
+
+
+# Power cycle the keypad with the receiver on, with it off, and with it switched to another
+# input while the keypad was off. The saved state should be written once, and at the next
+# boot the keypad should show it from the first frame, then follow the receiver's answers.
+def restore(firmware):
+    runs = {}
+    for name, power, before, after in (("on", True, "12", "12"), ("off", False, "12", "12"),
+                                       ("changed", True, "12", "01")):
+        first = _session(15.0, power=power, input=before)
+        first.run(firmware)
+        assert len(first.nvm_log) == 1, "{} writes to nvm".format(len(first.nvm_log))
+        sim = _session(3.0, power=power, input=after)
+        sim.nvm = first.nvm
+        sim.run(firmware)
+        runs[name] = sim
+    sim = runs["on"]
+    lit = [_lit(channels) for t, channels in sim.leds.show_log]
+    assert lit[0] == [TV_KEY], "first frame lit {}".format(lit[0])
+    assert all(keys == [TV_KEY] for keys in lit), "lit {} on the way".format(lit)
+    lit_off = [keys for keys in (_lit(ch) for t, ch in runs["off"].leds.show_log) if keys]
+    assert not lit_off, "lit {} with the receiver off".format(lit_off[0])
+    final = _lit(runs["changed"].shown_at(3 * S))
+    assert final == [8], "lit {} after the receiver changed inputs".format(final)
+    return {"boot_to_led_ms": sim.leds.show_log[0][0] / MS,
+            "changed_to_led_ms": runs["changed"].first_show(lambda ch: _lit(ch) == [8]) / MS,
+            "speedup": sim.speedup}
+
+
+# The boot report. Startup should get the keypad and the UART going before anything else,
+# and be ready within its budget. The simulator doesn't charge anything for imports, so on
+# the board the times are what count; this checks the order and the report.
+def boot_profile(firmware):
+    sim = _session(2.0)
+    sim.type("b", at=1.5)
+    sim.run(firmware)
+    lines = [line[5:].split() for line in sim.console_text.splitlines()
+             if line.startswith("boot:")]
+    reports = [i for i, line in enumerate(lines) if line[1:3] == ["ms", "before"]]
+    assert len(reports) == 2, "{} boot reports on the console".format(len(reports))
+    report = lines[:reports[1]]
+    steps = [line[0] for line in report if len(line) == 5]
+    assert steps[:2] == ["keypad", "uart"], "started with {}".format(steps[:2])
+    assert steps.index("leds") < steps.index("state") < steps.index("dimmer"), steps
+    assert steps[-1] == "ready", "keypad never got ready"
+    assert "within" in report[-1], " ".join(report[-1])
+    return {"steps": len(steps), "ready_ms": int(report[-1][0]), "speedup": sim.speedup}
+
+
+ALL = (boot, key_to_led, prox_fade, power_off, dimmer, mash, latency_report, profile,
+       gc_idle, gc_low, volume_hold, trellis, scene, scene_over_pending, scene_abort,
+       power_on_input, idle_sleep, idle_unacked, standby_status, restore, boot_profile)
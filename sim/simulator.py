@@ -0,0 +1,219 @@
+# The Simulator owns the virtual clock, the fake peripherals the firmware creates and the
+# scripted inputs: key presses, pin levels and bytes arriving on the UART.
+
+import asyncio
+import importlib.util
+import os
+import runpy
+import sys
+import time
+
+from sim import core, vasyncio, vtime
+from sim.core import Clock, SimulationEnd
+
+FAKES_DIR = os.path.join(os.path.dirname(__file__), "fakes")
+FAKE_MODULES = tuple(name[:-3] if name.endswith(".py") else name
+                     for name in os.listdir(FAKES_DIR)
+                     if name.endswith(".py") or os.path.isfile(
+                         os.path.join(FAKES_DIR, name, "__init__.py")))
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+S = 1000000000
+
+
+class Simulator:
+    # uart_baud runs the UART at that speed no matter what the firmware asks for, to see
+    # how the receive path holds up with data coming in faster than 9600 baud.
+    def __init__(self, seconds=10.0, poll_cost_us=20, uart_baud=None):
+        self.clock = Clock(poll_cost_us * 1000)
+        self.uart_baud = uart_baud
+        self.clock.end_ns = int(seconds * S)
+        self.uart = None
+        self.keypad = None
+        self.leds = None
+        self.receiver = None
+        self.pins = {}
+        # Board pin the NeoTrellis's INT line is wired to. Unset pins read as their pull.
+        self.trellis_int_pin = "D9"
+        # (time_ns, bytes) for everything the firmware wrote to the UART
+        self.tx_log = []
+        # (time_ns, key_number, pressed) for every injected key event
+        self.key_log = []
+        # (time_ns, device, bytes) for every transaction on the I2C bus
+        self.i2c_log = []
+        # Pins held by a DigitalInOut, which can't be used for a pin alarm, and every light
+        # sleep as (start_ns, end_ns, what woke it).
+        self.claimed_pins = set()
+        self.sleep_log = []
+        # The board's non-volatile memory, blank to start with, and every write to it.
+        self.nvm = bytearray(b"\xff" * 8192)
+        self.nvm_log = []
+        # Characters typed on the USB console that the firmware hasn't read yet, and
+        # everything it printed.
+        self.console_input = ""
+        self.console_output = []
+        # The heap as the fake gc module reports it, what a collection costs, and the time of
+        # every collection.
+        self.heap_size = 192 * 1024
+        self.heap_free = 120 * 1024
+        self.gc_pause_us = 3000
+        self.gc_log = []
+        self.wall_seconds = 0.0
+        self._line_free_ns = 0
+
+    # Peripherals register themselves as the firmware creates them.
+    def attach_uart(self, uart):
+        if self.uart_baud is not None:
+            uart.baudrate = self.uart_baud
+        self.uart = uart
+
+    def attach_keypad(self, keypad):
+        self.keypad = keypad
+
+    def attach_leds(self, leds):
+        self.leds = leds
+
+    def pin_value(self, name, default=False):
+        return self.pins.get(name, default)
+
+    # Scripting. Times are in seconds of virtual time from power up.
+
+    def set_pin(self, name, value, at=0.0):
+        self.clock.at(at * S, lambda: self.pins.__setitem__(name, bool(value)))
+
+    def pulse_pin(self, name, at, duration):
+        self.set_pin(name, True, at)
+        self.set_pin(name, False, at + duration)
+
+    def press(self, key_number, at, hold=0.1):
+        self.clock.at(at * S, lambda: self._key(key_number, True))
+        self.clock.at((at + hold) * S, lambda: self._key(key_number, False))
+
+    def _key(self, key_number, pressed):
+        self.key_log.append((self.clock.now_ns, key_number, pressed))
+        if self.keypad is not None:
+            # The background scanner reports the change at its next scan.
+            interval = self.keypad.interval_ns
+            scan = -(-self.clock.now_ns // interval) * interval
+            self.clock.at(scan, lambda: self.keypad.events._put(key_number, pressed))
+
+    # Send bytes to the firmware over the UART, paced at the UART's baud rate. Sends queue up
+    # behind each other like they would on the wire.
+    def send(self, data, at=None):
+        if at is not None:
+            self.clock.at(at * S, lambda: self.send(data))
+            return
+        if self.uart is None:
+            return
+        char_ns = self.uart.char_time_ns
+        t = max(self.clock.now_ns, self._line_free_ns)
+        for b in data:
+            t += char_ns
+            self.clock.at(t, lambda b=b: self.uart._receive_byte(b))
+        self._line_free_ns = t
+
+    # Type text on the USB console.
+    def type(self, text, at):
+        self.clock.at(at * S, lambda: setattr(self, "console_input", self.console_input + text))
+
+    def uart_written(self, data):
+        self.tx_log.append((self.clock.now_ns, data))
+        if self.receiver is not None:
+            self.receiver.written(data)
+
+    # Run a firmware file until the virtual clock reaches the end time.
+    def run(self, path=os.path.join(REPO_DIR, "main.py")):
+        path = os.path.abspath(path)
+        search = [FAKES_DIR, os.path.join(REPO_DIR, "lib"), os.path.dirname(path)]
+        saved_modules = dict(sys.modules)
+        saved_path = list(sys.path)
+        saved_stdio = sys.stdin, sys.stdout
+        for name in FAKE_MODULES:
+            sys.modules.pop(name, None)
+            # Built in modules like gc are found before anything on sys.path, so those
+            # fakes have to be loaded by hand.
+            if name in sys.builtin_module_names:
+                sys.modules[name] = _load_fake(name)
+        sys.modules["time"] = vtime.make_module()
+        sys.path[0:0] = search
+        sys.stdin, sys.stdout = _ConsoleIn(self), _ConsoleOut(self)
+        asyncio.set_event_loop_policy(vasyncio.VirtualEventLoopPolicy())
+        core.current = self
+        start = time.perf_counter()
+        try:
+            runpy.run_path(path, run_name="__main__")
+        except SimulationEnd:
+            pass
+        finally:
+            self.wall_seconds = time.perf_counter() - start
+            core.current = None
+            sys.stdin, sys.stdout = saved_stdio
+            asyncio.set_event_loop_policy(None)
+            sys.path[:] = saved_path
+            # Drop everything the firmware imported so the next run starts clean.
+            for name in list(sys.modules):
+                if name not in saved_modules:
+                    del sys.modules[name]
+            sys.modules.update(saved_modules)
+        return self
+
+    # Results.
+
+    @property
+    def console_text(self):
+        return "".join(self.console_output)
+
+    @property
+    def seconds(self):
+        return self.clock.now_ns / S
+
+    @property
+    def speedup(self):
+        return self.seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    # First time at or after t_ns that the LEDs showed a frame matching predicate(channels).
+    def first_show(self, predicate, after_ns=0):
+        for t, channels in self.leds.show_log:
+            if t >= after_ns and predicate(channels):
+                return t
+        return None
+
+    # Frame the LEDs were showing at t_ns.
+    def shown_at(self, t_ns):
+        frame = (0,) * self.leds.channel_count
+        for t, channels in self.leds.show_log:
+            if t > t_ns:
+                break
+            frame = channels
+        return frame
+
+
+def _load_fake(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(FAKES_DIR, name + ".py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# The USB console as the firmware sees it. Reads only return what's been typed so far, like
+# they do after checking serial_bytes_available.
+class _ConsoleIn:
+    def __init__(self, sim):
+        self.sim = sim
+
+    def read(self, n=1):
+        text = self.sim.console_input[:n]
+        self.sim.console_input = self.sim.console_input[n:]
+        return text
+
+
+class _ConsoleOut:
+    def __init__(self, sim):
+        self.sim = sim
+
+    def write(self, text):
+        self.sim.console_output.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
@@ -0,0 +1,63 @@
+# asyncio on the virtual clock.
+#
+# The firmware's asyncio.run() gets an event loop whose time() is the simulator's clock.
+# When every task is asleep, the loop's selector moves the clock straight to the next
+# deadline instead of blocking, so idle time costs nothing on the host.
+
+import asyncio
+import math
+import selectors
+
+from sim import core
+from sim.core import SimulationEnd
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    def __init__(self):
+        super().__init__()
+        self.ended = False
+
+    def select(self, timeout=None):
+        # Still service the loop's own self-pipe so call_soon_threadsafe() works.
+        ready = super().select(0)
+        clock = core.current.clock
+        if ready:
+            return ready
+        if clock.ended:
+            if not self.ended:
+                # The end of the run was raised inside a task, like one in light sleep, and
+                # asyncio keeps that to itself. Raise it out of the loop instead, once.
+                self.ended = True
+                raise SimulationEnd()
+            return ready
+        try:
+            if timeout is None:
+                # Nothing scheduled: sleep until the next scripted input, or the end of the run.
+                next_ns = clock.next_event_ns()
+                end_ns = clock.end_ns if next_ns is None else next_ns
+                clock.advance(end_ns - clock.now_ns)
+            elif timeout > 0:
+                clock.advance(math.ceil(timeout * 1000000000))
+        except SimulationEnd:
+            self.ended = True
+            raise
+        return []
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        super().__init__(VirtualSelector())
+
+    def time(self):
+        return core.current.clock.now_ns / 1000000000
+
+    # A task that isn't awaited by anything, like the idle task, has nobody to hand the end of
+    # the run to. That's expected, so don't complain about it.
+    def default_exception_handler(self, context):
+        if not isinstance(context.get("exception"), SimulationEnd):
+            super().default_exception_handler(context)
+
+
+class VirtualEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    def new_event_loop(self):
+        return VirtualEventLoop()
@@ -0,0 +1,36 @@
+# Stand-in for the time module while the firmware runs under the simulator. It is installed
+# in sys.modules as "time" for the duration of a run, so "import time" in the firmware gets
+# the virtual clock.
+
+import types
+
+from sim import core
+
+
+def _now_ns():
+    clock = core.current.clock
+    clock.poll()
+    return clock.now_ns
+
+
+def monotonic_ns():
+    return _now_ns()
+
+
+def monotonic():
+    return _now_ns() / 1000000000
+
+
+def time():
+    return _now_ns() // 1000000000
+
+
+def sleep(seconds):
+    core.current.clock.advance(int(seconds * 1000000000))
+
+
+def make_module():
+    module = types.ModuleType("time")
+    for fn in (monotonic_ns, monotonic, time, sleep):
+        setattr(module, fn.__name__, fn)
+    return module
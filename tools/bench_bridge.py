@@ -0,0 +1,168 @@
+# Measure what tools/iscp_bridge.py costs as clients are added.
+#
+# The fake receiver, the bridge and the clients each get their own thread and event loop,
+# like three separate programs. Two things are measured for each number of clients:
+#
+#  * Fan-out: the fake receiver announces a volume change and every client times its
+#    arrival. A client connected straight to the fake receiver gets the same message, and
+#    the overhead is how much later each bridge client got it than that one did. All the
+#    clients share one thread here, so the overhead includes waiting for the clients ahead
+#    of it to be handled, and is an upper bound.
+#  * Merging: every client sends a burst of input selects and a query at the same time. The
+#    output shows how many commands reached the receiver and how many queries the bridge
+#    answered itself.
+#
+#   python tools/bench_bridge.py [--clients 1 10 50] [--rounds 50]
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "lib"))
+sys.path.insert(0, os.path.join(REPO_DIR, "tools"))
+
+import iscp  # noqa: E402
+import transport  # noqa: E402
+from bench_transport import start_fake  # noqa: E402
+from iscp_bridge import Bridge, EiscpUpstream  # noqa: E402
+
+
+def start_bridge(fake_port):
+    ready = threading.Event()
+    info = {}
+
+    async def serve():
+        bridge = Bridge(EiscpUpstream("127.0.0.1", fake_port))
+        servers = await bridge.start("127.0.0.1", 0)
+        info["bridge"] = bridge
+        info["port"] = servers[0].sockets[0].getsockname()[1]
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready.wait()
+    return info
+
+
+# An eISCP client that notes when the frame it's waiting for shows up.
+class BenchClient(asyncio.Protocol):
+    def __init__(self):
+        self.eiscp = transport.EiscpReader()
+        self.parser = iscp.FrameParser()
+        self.buf = bytearray(4096)
+        self.expect = None
+        self.arrived = 0.0
+        self.on_arrival = None
+        self.now = 0.0
+
+    def connection_made(self, t):
+        self.transport = t
+
+    def data_received(self, data):
+        self.now = time.perf_counter()
+        n = self.eiscp.unwrap(data, len(data), self.buf)
+        if n > 0:
+            self.parser.feed(self.buf, n, self._frame)
+
+    def _frame(self, frame):
+        if self.expect is not None and frame == self.expect:
+            self.expect = None
+            self.arrived = self.now
+            self.on_arrival()
+
+    def send(self, command):
+        self.transport.write(transport.eiscp_header(len(command)) + command)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def connect(port, count):
+    loop = asyncio.get_running_loop()
+    clients = []
+    for _ in range(count):
+        _, client = await loop.create_connection(BenchClient, "127.0.0.1", port)
+        clients.append(client)
+    return clients
+
+
+async def fan_out(fake, direct, clients, rounds):
+    loop = asyncio.get_running_loop()
+    overheads = []
+    everyone = [direct] + clients
+    for i in range(rounds):
+        done = loop.create_future()
+        left = [len(everyone)]
+
+        def arrived():
+            left[0] -= 1
+            if not left[0]:
+                done.set_result(None)
+
+        message = "MVL%02X" % (0x10 + i % 0x40)
+        for client in everyone:
+            client.expect = b"1" + message.encode()
+            client.on_arrival = arrived
+        fake["loop"].call_soon_threadsafe(fake["onkyo"].announce, message)
+        await asyncio.wait_for(done, 5)
+        overheads.extend((client.arrived - direct.arrived) * 1000 for client in clients)
+    return overheads
+
+
+async def merge(fake, bridge, clients):
+    model = fake["onkyo"].model
+    sent_before = len(model.commands)
+    hits_before = bridge.cache_hits
+    start = time.perf_counter()
+    for i, client in enumerate(clients):
+        for j in range(4):
+            client.send(b"!1SLI%02X\r" % (0x10 + (i + j) % 4))
+        client.send(b"!1MVLQSTN\r")
+    # Wait for the bridge to drain its queue.
+    await asyncio.sleep(0.05)
+    while len(bridge.tx_queue) or bridge.tx_queue.awaiting is not None:
+        await asyncio.sleep(0.01)
+    return (len(clients) * 5, len(model.commands) - sent_before,
+            bridge.cache_hits - hits_before, (time.perf_counter() - start) * 1000)
+
+
+async def run(args):
+    fake = start_fake(args.response_ms)
+    bridge_info = start_bridge(fake["port"])
+    bridge = bridge_info["bridge"]
+    direct = (await connect(fake["port"], 1))[0]
+    print("{:>8} {:>10} {:>10} {:>10}   {}".format(
+        "clients", "p50 ms", "p95 ms", "max ms", "merging"))
+    clients = []
+    for count in args.clients:
+        clients += await connect(bridge_info["port"], count - len(clients))
+        await asyncio.sleep(0.1)
+        overheads = await fan_out(fake, direct, clients, args.rounds)
+        sent, reached, answered, ms = await merge(fake, bridge, clients)
+        print("{:>8} {:>10.3f} {:>10.3f} {:>10.3f}   {} commands sent, {} reached the "
+              "receiver, {} queries answered by the bridge, settled in {:.0f} ms".format(
+                  count, percentile(overheads, 0.5), percentile(overheads, 0.95),
+                  max(overheads), sent, reached, answered, ms))
+    print("clients dropped for falling behind:", bridge.clients_dropped)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Fan-out overhead of the ISCP bridge.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--response-ms", type=int, default=30,
+                        help="how long the fake receiver takes per command")
+    args = parser.parse_args(argv)
+    args.clients.sort()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,159 @@
+# Replay recorded receiver traffic through the receive path and measure it.
+#
+# The fixtures in sim/fixtures are byte streams captured from the receiver (see
+# tools/capture_iscp.py): the power-on flurry, a session of input and volume changes, and a
+# noisy stream with the kinds of damage a serial line produces. Each one is replayed two ways:
+#
+#  * Parser: straight into iscp.FrameParser with the same per-frame work main.py does
+#    (acknowledge, then dispatch to the receiver state and the status-to-key handlers), cut into chunks the way the UART
+#    can hand them over: one byte at a time, random partial frames, or 64-byte reads that
+#    hold several frames. Reports frames per second on this computer. What the receive path
+#    allocates only means something on the board, where tools/device_replay.py runs the same
+#    replay and counts the bytes.
+#  * Firmware: main.py running in the simulator with the fixture arriving on the UART at
+#    9600 baud and faster. Reports the time from the first byte to the last LED change and
+#    any bytes lost to a full UART receive buffer.
+#
+#   python tools/bench_replay.py [fixture ...] [--repeat 200] [--bauds 9600 115200 921600]
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_DIR, "sim", "fixtures")
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "lib"))
+
+import iscp  # noqa: E402
+import keymap  # noqa: E402
+import receiver  # noqa: E402
+from sim import Simulator  # noqa: E402
+
+MS = 1000000
+S = 1000000000
+
+
+class NullLink:
+    def write(self, frame):
+        pass
+
+
+# Ways of cutting a stream into reads. Each returns a list of (start, end) offsets.
+def single_bytes(data):
+    return [(i, i + 1) for i in range(len(data))]
+
+
+def partial_frames(data, seed=1):
+    rng = random.Random(seed)
+    chunks = []
+    i = 0
+    while i < len(data):
+        n = rng.randint(1, 9)
+        chunks.append((i, min(i + n, len(data))))
+        i += n
+    return chunks
+
+
+def full_reads(data, size=64):
+    return [(i, min(i + size, len(data))) for i in range(0, len(data), size)]
+
+
+CHUNKINGS = (("bytes", single_bytes), ("partial", partial_frames), ("64-byte", full_reads))
+
+
+# The per-frame work main.py's handle_status() does before touching the LEDs.
+def make_handler(parser):
+    tx_queue = iscp.TxQueue(NullLink())
+    state = receiver.ReceiverState()
+    dispatcher = iscp.Dispatcher(parser)
+    state.subscribe(dispatcher)
+    for code, keys in keymap.STATUS_KEYS.items():
+        dispatcher.subscribe(code, status_handler(keys))
+    counts = [0]
+
+    def on_frame(frame):
+        counts[0] += 1
+        tx_queue.acknowledge(frame)
+        dispatcher.dispatch(frame)
+
+    return on_frame, counts
+
+
+# main.py's status handlers, minus the LEDs: find the key to light.
+def status_handler(keys):
+    def on_status(params, now):
+        if len(params) == 2:
+            keys.get(iscp.param_int(params, 0), -1)
+    return on_status
+
+
+def bench_parser(data, chunks, repeat):
+    buf = bytearray(64)
+    views = [memoryview(data)[start:end] for start, end in chunks]
+
+    parser = iscp.FrameParser()
+    on_frame, counts = make_handler(parser)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for view in views:
+            n = len(view)
+            buf[:n] = view
+            parser.feed(buf, n, on_frame)
+    elapsed = time.perf_counter() - start
+    frames = counts[0] // repeat
+    dropped = parser.dropped // repeat
+    return {"frames": frames, "dropped": dropped,
+            "frames_per_s": counts[0] / elapsed if elapsed else 0.0}
+
+
+def bench_firmware(data, baud, firmware):
+    sim = Simulator(seconds=4.0, uart_baud=baud)
+    sim.send(data, at=1.0)
+    sim.run(firmware)
+    last = [t for t, _ in sim.leds.show_log if t >= 1 * S]
+    lit = [i for i, v in enumerate(sim.shown_at(sim.clock.now_ns)) if v]
+    return {"to_final_led_ms": (last[-1] - 1 * S) / MS if last else None,
+            "overflowed": sim.uart.overflowed, "lit": lit}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Replay recorded ISCP traffic.")
+    parser.add_argument("fixtures", nargs="*",
+                        default=sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.iscp"))))
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--bauds", type=int, nargs="+", default=[9600, 115200, 921600])
+    parser.add_argument("--firmware", default=os.path.join(REPO_DIR, "main.py"))
+    args = parser.parse_args(argv)
+
+    print("{:<12}{:<10}{:>8}{:>9}{:>12}".format(
+        "fixture", "chunks", "frames", "dropped", "frames/s"))
+    for path in args.fixtures:
+        with open(path, "rb") as f:
+            data = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        for chunking, cut in CHUNKINGS:
+            r = bench_parser(data, cut(data), args.repeat)
+            print("{:<12}{:<10}{:>8}{:>9}{:>12.0f}".format(
+                name, chunking, r["frames"], r["dropped"], r["frames_per_s"]))
+
+    print()
+    print("{:<12}{:>8}{:>18}{:>12}   {}".format("fixture", "baud", "to final LED ms",
+                                               "overflowed", "lit"))
+    for path in args.fixtures:
+        with open(path, "rb") as f:
+            data = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        for baud in args.bauds:
+            r = bench_firmware(data, baud, args.firmware)
+            print("{:<12}{:>8}{:>18}{:>12}   {}".format(
+                name, baud, "-" if r["to_final_led_ms"] is None else
+                "{:.1f}".format(r["to_final_led_ms"]), r["overflowed"], r["lit"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,162 @@
+# Compare command round trips over the serial and eISCP links.
+#
+# Starts the fake receiver (tools/fake_onkyo.py) in the background and sends volume commands
+# through the firmware's own transports and frame parser, timing each one from the write
+# until its echo is parsed:
+#
+#   serial      SerialTransport on a pty paced at 9600 baud, like the DB9 port
+#   eiscp       EiscpTransport with one connection kept open for every command
+#   reconnect   a new eISCP connection for each command, like a client that doesn't
+#               keep its connection
+#
+#   python tools/bench_transport.py [--count 50] [--response-ms 0]
+
+import argparse
+import asyncio
+import fcntl
+import os
+import socket
+import struct
+import sys
+import termios
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "lib"))
+sys.path.insert(0, os.path.join(REPO_DIR, "tools"))
+
+import iscp  # noqa: E402
+import transport  # noqa: E402
+from fake_onkyo import FakeOnkyo, BAUD  # noqa: E402
+
+
+# Just enough of busio.UART on top of a pty for SerialTransport. Writes take as long as they
+# would at 9600 baud, since UART.write() blocks on the keypad.
+class PtyUart:
+    def __init__(self, path):
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+
+    @property
+    def in_waiting(self):
+        return struct.unpack("i", fcntl.ioctl(self.fd, termios.FIONREAD, b"\0\0\0\0"))[0]
+
+    def readinto(self, buf, nbytes=None):
+        try:
+            data = os.read(self.fd, len(buf) if nbytes is None else nbytes)
+        except BlockingIOError:
+            return None
+        buf[:len(data)] = data
+        return len(data)
+
+    def write(self, data):
+        os.write(self.fd, data)
+        time.sleep(len(data) * 10 / BAUD)
+
+
+# Run the fake receiver on its own thread and event loop. Returns the FakeOnkyo, its loop,
+# its eISCP port and its pty.
+def start_fake(response_ms):
+    ready = threading.Event()
+    info = {}
+
+    async def serve():
+        onkyo = FakeOnkyo(response_ms=response_ms)
+        onkyo.start()
+        server = await onkyo.serve_tcp("127.0.0.1", 0)
+        info["onkyo"] = onkyo
+        info["loop"] = asyncio.get_running_loop()
+        info["port"] = server.sockets[0].getsockname()[1]
+        info["pty"] = onkyo.serve_pty()
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready.wait()
+    return info
+
+
+# Send a command and wait for its echo. Returns the round trip in ms.
+def round_trip(link, parser, buf, command, timeout_s=2.0):
+    echoed = []
+    expect = command[1:-1]
+
+    def on_frame(frame):
+        if bytes(frame) == expect:
+            echoed.append(True)
+
+    start = time.perf_counter()
+    link.write(command)
+    deadline = start + timeout_s
+    while not echoed:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(command)
+        n = link.readinto(buf)
+        if n:
+            parser.feed(buf, n, on_frame)
+        else:
+            time.sleep(0.0002)
+    return (time.perf_counter() - start) * 1000
+
+
+def volume_command(i):
+    return b"!1MVL%02X\r" % (0x20 + i % 16)
+
+
+def bench(make_link, count, per_command=False):
+    times = []
+    buf = bytearray(64)
+    parser = iscp.FrameParser()
+    link = None if per_command else make_link()
+    for i in range(count):
+        if per_command:
+            start = time.perf_counter()
+            link = make_link()
+            setup_ms = (time.perf_counter() - start) * 1000
+        else:
+            setup_ms = 0
+        times.append(setup_ms + round_trip(link, parser, buf, volume_command(i)))
+        if per_command:
+            link.close()
+    times.sort()
+    return times
+
+
+# Connect the way the keypad does: start it, then let service() finish it.
+def eiscp_link(port):
+    link = transport.EiscpTransport(socket, "127.0.0.1", port)
+    link.connect(time.monotonic_ns())
+    while link.connecting is not None:
+        time.sleep(0.0002)
+        link.service(time.monotonic_ns())
+    if not link.connected:
+        raise ConnectionError("can't reach the fake receiver on port {}".format(port))
+    return link
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Round trips over the serial and eISCP links.")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--response-ms", type=int, default=0,
+                        help="how long the fake receiver takes per command")
+    args = parser.parse_args(argv)
+    fake = start_fake(args.response_ms)
+
+    runs = [
+        ("serial", lambda: bench(lambda: transport.SerialTransport(PtyUart(fake["pty"])),
+                                 args.count)),
+        ("eiscp", lambda: bench(lambda: eiscp_link(fake["port"]), args.count)),
+        ("reconnect", lambda: bench(lambda: eiscp_link(fake["port"]), args.count,
+                                    per_command=True)),
+    ]
+    print("{:<10} {:>8} {:>8} {:>8}".format("link", "p50 ms", "p95 ms", "max ms"))
+    for name, run in runs:
+        times = run()
+        print("{:<10} {:>8.2f} {:>8.2f} {:>8.2f}".format(
+            name, times[len(times) // 2], times[int(len(times) * 0.95)], times[-1]))
+    print("eISCP connections made:", fake["onkyo"].connections)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,217 @@
+# Build lib/keymap.py from layout.toml.
+#
+# The firmware looks up each status message by its 3-letter code and parameter as ints (see
+# iscp.code_key()), so it never has to make a bytes object out of a frame, and sends
+# commands that are already encoded. This script works all of that out ahead of time so
+# nothing has to be decoded or built on the keypad.
+#
+#   python tools/build_keymap.py [layout.toml] [lib/keymap.py]
+
+import os
+import sys
+import tomllib
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build(layout):
+    commands = layout["commands"]
+    dim_levels = layout["dim_levels"]
+    keys = {int(k): v for k, v in layout["keys"].items()}
+    key_count = max(keys) + 1
+    for key, name in sorted(keys.items()):
+        if name not in commands:
+            raise ValueError("key {} uses unknown command {}".format(key, name))
+
+    # Status message -> key whose LED it lights.
+    status_keys = {commands[name]: key for key, name in sorted(keys.items())}
+    key_by_name = {name: key for key, name in keys.items()}
+    for alias, name in layout.get("aliases", {}).items():
+        if alias not in commands or name not in key_by_name:
+            raise ValueError("bad alias {} = {}".format(alias, name))
+        status_keys[commands[alias]] = key_by_name[name]
+
+    levels = []
+    for key in range(key_count):
+        key_levels = layout.get("key_dim_levels", {}).get(str(key), dim_levels)
+        if len(key_levels) != len(dim_levels):
+            raise ValueError("key {} needs {} dim levels".format(key, len(dim_levels)))
+        levels.append(tuple(key_levels))
+
+    for frame in status_keys:
+        _split_status(frame)
+
+    # Volume keys are held rather than pressed, so they're kept out of [keys].
+    volume = layout.get("volume", {})
+    for name in ("up", "down"):
+        key = volume.get(name, -1)
+        if key in keys:
+            raise ValueError("volume {} key {} is already used for {}".format(name, key, keys[key]))
+    # MVL goes to 0x64 (100) on most receivers, and to 0xC8 in half steps on newer ones.
+    volume_max = volume.get("max", 0x64)
+    if not 0 <= volume_max <= 0xC8:
+        raise ValueError("volume max {} is out of range".format(volume_max))
+
+    scenes = []
+    scene_keys = {}
+    for name, scene in layout.get("scenes", {}).items():
+        key = scene["key"]
+        if key in keys or key in (volume.get("up"), volume.get("down")) or key in scene_keys:
+            raise ValueError("scene {} key {} is already in use".format(name, key))
+        timeout_ms = scene.get("timeout_ms", 1000)
+        retries = scene.get("retries", 3)
+        steps = []
+        for step in scene["steps"]:
+            if isinstance(step, str):
+                step = {"command": step}
+            steps.append(_scene_step(step["command"], commands, step.get("timeout_ms", timeout_ms),
+                                     step.get("retries", retries)))
+        scene_keys[key] = len(scenes)
+        scenes.append((name, steps))
+
+    power_off = [key for key, name in keys.items() if name == "PWR_OFF"]
+    return {
+        "key_count": key_count,
+        "key_commands": [("!" + commands[keys[k]] + "\r").encode("ascii") if k in keys else None
+                         for k in range(key_count)],
+        "key_names": [keys.get(k) for k in range(key_count)],
+        "status_keys": status_keys,
+        "dim_levels": levels,
+        "power_off_key": power_off[0] if power_off else -1,
+        "power_off": commands.get("PWR_OFF", ""),
+        "volume_up": volume.get("up", -1),
+        "volume_down": volume.get("down", -1),
+        "volume_max": volume_max,
+        "scenes": scenes,
+        "scene_keys": scene_keys,
+    }
+
+
+# b"1SLI12" -> ("SLI", 0x12). Status frames the keypad reacts to need a two-digit hex
+# parameter so they can be looked up as ints.
+def _split_status(frame):
+    code, param = frame[1:4], frame[4:]
+    try:
+        value = int(param, 16)
+    except ValueError:
+        value = -1
+    if frame[:1] != "1" or len(param) != 2 or value < 0:
+        raise ValueError("status {} needs a two-digit hex parameter".format(frame))
+    return code, value
+
+
+# One step of a scene: a name from [commands] or a raw command like "1LMD01". Returns
+# (label, command, code, value, base, timeout_ms, retries), where value is what the
+# acknowledging status has to say, or -1 for commands like MVLUP that don't set a value.
+def _scene_step(name, commands, timeout_ms, retries):
+    frame = commands.get(name, name)
+    code, param = frame[1:4], frame[4:]
+    if frame[:1] != "1" or not code.isalpha() or not code.isupper() or not param:
+        raise ValueError("scene step {} isn't a command name or an ISCP command".format(name))
+    base = 10 if code == "TUN" else 16
+    try:
+        value = int(param, base)
+    except ValueError:
+        value = -1
+    return (name, ("!" + frame + "\r").encode("ascii"), code, value, base, timeout_ms, retries)
+
+
+def _code_key(code):
+    return (ord(code[0]) << 16) | (ord(code[1]) << 8) | ord(code[2])
+
+
+def render(table, source):
+    out = ["# Generated by tools/build_keymap.py from {}. Don't edit by hand.".format(source), "",
+           "import iscp", ""]
+    out.append("KEY_COUNT = {}".format(table["key_count"]))
+    out.append("DIM_COUNT = {}".format(len(table["dim_levels"][0])))
+    out.append("")
+    out.append("# Key number -> command to send, ready to write to the UART")
+    out.append("KEY_COMMANDS = (")
+    for key, command in enumerate(table["key_commands"]):
+        out.append("    {!r},  # {} {}".format(command, key, table["key_names"][key] or ""))
+    out.append(")")
+    out.append("")
+    out.append("# Status message -> key whose LED it lights, as {code_key: {parameter: key}}")
+    out.append("STATUS_KEYS = {")
+    by_code = {}
+    for frame, key in table["status_keys"].items():
+        code, param = _split_status(frame)
+        by_code.setdefault(code, []).append((param, key, frame))
+    for code, entries in by_code.items():
+        out.append("    0x{:06X}: {{  # {}".format(_code_key(code), code))
+        for param, key, frame in entries:
+            out.append("        0x{:02X}: {},  # {}".format(param, key, frame))
+        out.append("    },")
+    out.append("}")
+    out.append("")
+    out.append("# Key number -> LED level at each dim setting")
+    out.append("DIM_LEVELS = (")
+    for key, levels in enumerate(table["dim_levels"]):
+        out.append("    {!r},  # {}".format(levels, key))
+    out.append(")")
+    out.append("")
+    out.append("# The off key, and the status message that means the receiver turned off")
+    out.append("POWER_OFF_KEY = {}".format(table["power_off_key"]))
+    if table["power_off"]:
+        code, param = _split_status(table["power_off"])
+        out.append("POWER_OFF_CODE = 0x{:06X}  # {}".format(_code_key(code), code))
+        out.append("POWER_OFF_PARAM = 0x{:02X}".format(param))
+    else:
+        out.append("POWER_OFF_CODE = -1")
+        out.append("POWER_OFF_PARAM = -1")
+    out.append("")
+    out.append("# Keys that change the volume while they're held (-1 if none), and the highest level")
+    out.append("VOLUME_UP_KEY = {}".format(table["volume_up"]))
+    out.append("VOLUME_DOWN_KEY = {}".format(table["volume_down"]))
+    out.append("VOLUME_MAX = 0x{:02X}".format(table["volume_max"]))
+    out.append("")
+    out.append("# Scenes, each a tuple of steps as (command, code_key, value, base, timeout_ms,")
+    out.append("# retries). See lib/scenes.py.")
+    out.append("SCENES = (")
+    for i, (name, steps) in enumerate(table["scenes"]):
+        out.append("    (  # {} {}".format(i, name))
+        for label, command, code, value, base, timeout_ms, retries in steps:
+            out.append("        ({!r}, 0x{:06X}, {}, {}, {}, {}),  # {}".format(
+                command, _code_key(code), "0x{:02X}".format(value) if value >= 0 and base == 16
+                else value, base, timeout_ms, retries, label))
+        out.append("    ),")
+    out.append(")")
+    out.append("")
+    out.append("# Key number -> scene it runs")
+    out.append("SCENE_KEYS = {")
+    for key, scene in sorted(table["scene_keys"].items()):
+        out.append("    {}: {},  # {}".format(key, scene, table["scenes"][scene][0]))
+    out.append("}")
+    out.append("")
+    out.append("")
+    out.append("# Key whose LED a status frame from the parser (e.g. b\"1SLI12\") lights, or -1.")
+    out.append("def status_key(frame):")
+    out.append("    if len(frame) != 6:")
+    out.append("        return -1")
+    out.append("    params = STATUS_KEYS.get(iscp.code_key(frame, 1))")
+    out.append("    if params is None:")
+    out.append("        return -1")
+    out.append("    return params.get(iscp.param_int(frame, 4), -1)")
+    out.append("")
+    out.append("")
+    out.append("# True if a status frame says the receiver turned off.")
+    out.append("def is_power_off(frame):")
+    out.append("    return len(frame) == 6 and iscp.code_key(frame, 1) == POWER_OFF_CODE and \\")
+    out.append("        iscp.param_int(frame, 4) == POWER_OFF_PARAM")
+    out.append("")
+    return "\n".join(out)
+
+
+def main(argv):
+    source = argv[0] if argv else os.path.join(REPO_DIR, "layout.toml")
+    target = argv[1] if len(argv) > 1 else os.path.join(REPO_DIR, "lib", "keymap.py")
+    with open(source, "rb") as f:
+        layout = tomllib.load(f)
+    with open(target, "w") as f:
+        f.write(render(build(layout), os.path.basename(source)))
+    print("wrote " + target)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
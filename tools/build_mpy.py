@@ -0,0 +1,69 @@
+# Precompile the modules in lib to .mpy for the CIRCUITPY drive.
+#
+# CircuitPython compiles every .py it imports when the board starts, and on the M4 that's
+# most of the time main.py takes to get going (the boot report on the console shows it). A
+# .mpy is already compiled, so it loads quicker and the compiler doesn't need RAM for it.
+# main.py itself has to stay a .py.
+#
+# mpy-cross has to come from the same CircuitPython version the board runs, since the .mpy
+# format changes between versions. Download it from the CircuitPython site and put it on the
+# PATH or pass --mpy-cross.
+#
+# With --dest the .mpy files are copied to the board's lib folder and any .py of the same
+# name there is deleted, since CircuitPython would import the .py instead.
+#
+#   python tools/build_mpy.py [--mpy-cross path] [--out build/lib] [--dest /Volumes/CIRCUITPY/lib]
+
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build(mpy_cross, out):
+    os.makedirs(out, exist_ok=True)
+    built = []
+    for source in sorted(glob.glob(os.path.join(REPO_DIR, "lib", "*.py"))):
+        name = os.path.splitext(os.path.basename(source))[0]
+        target = os.path.join(out, name + ".mpy")
+        subprocess.run([mpy_cross, "-o", target, source], check=True)
+        built.append(target)
+        print("{:<20}{:>8} -> {:>7} bytes".format(
+            name, os.path.getsize(source), os.path.getsize(target)))
+    return built
+
+
+def install(built, dest):
+    for target in built:
+        name = os.path.splitext(os.path.basename(target))[0]
+        stale = os.path.join(dest, name + ".py")
+        if os.path.exists(stale):
+            os.remove(stale)
+            print("removed", stale)
+        shutil.copy(target, dest)
+    print("copied {} modules to {}".format(len(built), dest))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Precompile lib/*.py to .mpy.")
+    parser.add_argument("--mpy-cross", default="mpy-cross",
+                        help="mpy-cross for the board's CircuitPython version")
+    parser.add_argument("--out", default=os.path.join(REPO_DIR, "build", "lib"))
+    parser.add_argument("--dest", help="the board's lib folder, e.g. /Volumes/CIRCUITPY/lib")
+    args = parser.parse_args(argv)
+    if shutil.which(args.mpy_cross) is None:
+        print("can't find {}. Get the mpy-cross for the board's CircuitPython version and "
+              "pass it with --mpy-cross.".format(args.mpy_cross), file=sys.stderr)
+        return 1
+    built = build(args.mpy_cross, args.out)
+    if args.dest:
+        install(built, args.dest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,69 @@
+# Record what the receiver sends into a fixture file for tools/bench_replay.py.
+#
+# Connects to the receiver over serial or eISCP, optionally sends some commands a gap apart,
+# and saves every byte that comes back, exactly as it came off the serial port (eISCP
+# headers are taken off, the ISCP bytes inside are kept as they are). For example, to catch
+# the flurry of status messages the receiver sends when it turns on:
+#
+#   python tools/capture_iscp.py --serial /dev/ttyUSB0 --send '!1PWR01' sim/fixtures/power_on.iscp
+#
+# The same works against tools/fake_onkyo.py, which is how the fixtures that come with the
+# repo were made.
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "lib"))
+sys.path.insert(0, os.path.join(REPO_DIR, "tools"))
+
+import transport  # noqa: E402
+from iscp_bridge import SerialUpstream, EiscpUpstream  # noqa: E402
+
+
+async def capture(upstream, commands, gap_s, seconds):
+    data = bytearray()
+    await upstream.open(lambda buf, n: data.extend(buf[:n]))
+    for command in commands:
+        command = command.encode("ascii")
+        if not command.endswith(b"\r"):
+            command += b"\r"
+        upstream.write(command)
+        await asyncio.sleep(gap_s)
+    await asyncio.sleep(seconds)
+    return bytes(data)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Record the receiver's ISCP traffic.")
+    link = parser.add_mutually_exclusive_group(required=True)
+    link.add_argument("--serial", help="serial port the receiver is on")
+    link.add_argument("--eiscp", help="receiver's network address")
+    parser.add_argument("--eiscp-port", type=int, default=transport.EISCP_PORT)
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--send", action="append", default=[],
+                        help="command to send, e.g. '!1PWR01'. Can be repeated.")
+    parser.add_argument("--gap", type=float, default=0.5, help="seconds between commands")
+    parser.add_argument("--seconds", type=float, default=3.0,
+                        help="how long to keep listening after the last command")
+    parser.add_argument("output")
+    args = parser.parse_args(argv)
+
+    if args.serial:
+        upstream = SerialUpstream(args.serial, args.baud)
+    else:
+        upstream = EiscpUpstream(args.eiscp, args.eiscp_port)
+    start = time.monotonic()
+    data = asyncio.run(capture(upstream, args.send, args.gap, args.seconds))
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print("{} bytes in {:.1f} s written to {}".format(len(data), time.monotonic() - start,
+                                                     args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
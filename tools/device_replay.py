@@ -0,0 +1,105 @@
+# Replay the recorded receiver traffic on the keypad itself and count what it allocates.
+#
+# tools/bench_replay.py measures the receive path on a computer, but only the board can say
+# how much memory it allocates, since CPython allocates completely differently. This script
+# runs the same replay on CircuitPython with the garbage collector off, so gc.mem_alloc()
+# goes up by exactly what the parser and the per-frame work in main.py allocated.
+#
+# Copy this file to the CIRCUITPY drive as code.py, along with the lib folder and the
+# fixtures from sim/fixtures in a folder called fixtures, and watch the USB console. Put
+# main.py back as code.py when you're done.
+#
+# (c) Doug Gaff 2023, All Rights Reserved
+
+import gc
+import time
+import iscp
+import keymap
+import receiver
+
+FIXTURES = ("power_on", "session", "noisy")
+CHUNKS = (("bytes", 1), ("partial", 5), ("64-byte", 64))
+REPEAT = 20
+
+
+# Some builds leave gc.mem_alloc() out, in which case only the speed gets reported.
+def mem_alloc():
+    return gc.mem_alloc() if hasattr(gc, "mem_alloc") else None
+
+
+class NullLink:
+    def write(self, frame):
+        pass
+
+
+# main.py's status handlers, minus the LEDs: find the key to light.
+def status_handler(keys):
+    def on_status(params, now):
+        if len(params) == 2:
+            keys.get(iscp.param_int(params, 0), -1)
+    return on_status
+
+
+parser = iscp.FrameParser()
+tx_queue = iscp.TxQueue(NullLink())
+state = receiver.ReceiverState()
+dispatcher = iscp.Dispatcher(parser)
+state.subscribe(dispatcher)
+for code, keys in keymap.STATUS_KEYS.items():
+    dispatcher.subscribe(code, status_handler(keys))
+frames = 0
+
+
+# The per-frame work main.py's handle_status() does before touching the LEDs.
+def on_frame(frame):
+    global frames
+    frames += 1
+    tx_queue.acknowledge(frame)
+    dispatcher.dispatch(frame)
+
+
+def replay(data, size):
+    global frames
+    parser.reset()
+    buf = bytearray(64)
+    length = len(data)
+    frames = 0
+    gc.collect()
+    gc.disable()
+    start = time.monotonic_ns()
+    allocated = mem_alloc()
+    # Plain while loops and a copy by hand, since range() objects and slices would allocate
+    # and count against the parser.
+    repeat = 0
+    while repeat < REPEAT:
+        i = 0
+        while i < length:
+            n = min(size, length - i)
+            j = 0
+            while j < n:
+                buf[j] = data[i + j]
+                j += 1
+            parser.feed(buf, n, on_frame)
+            i += n
+        repeat += 1
+    if allocated is not None:
+        allocated = mem_alloc() - allocated
+    elapsed = time.monotonic_ns() - start
+    gc.enable()
+    return frames, elapsed, allocated
+
+
+print("{:<12}{:<10}{:>8}{:>12}{:>16}".format("fixture", "chunks", "frames", "frames/s",
+                                             "alloc B/frame"))
+for name in FIXTURES:
+    try:
+        with open("fixtures/" + name + ".iscp", "rb") as f:
+            data = f.read()
+    except OSError:
+        print(name + ": not found, copy it to the fixtures folder")
+        continue
+    for chunking, size in CHUNKS:
+        count, elapsed, allocated = replay(data, size)
+        print("{:<12}{:<10}{:>8}{:>12}{:>16}".format(
+            name, chunking, count // REPEAT, count * 1000000000 // elapsed if elapsed else 0,
+            "-" if allocated is None else "{:.1f}".format(allocated / count if count else 0)))
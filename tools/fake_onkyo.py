@@ -0,0 +1,144 @@
+# Stand-in for the receiver that runs in real time on a computer.
+#
+# It uses the same receiver model as the simulator (sim/receiver.py) and answers ISCP on a
+# pseudo-terminal, paced like the receiver's 9600 baud serial port, and eISCP on a TCP port
+# like the receiver's network interface. Status messages go out on every connection, the way
+# the receiver reports changes to everyone that's listening. Handy for trying the transports
+# and the bench tools without a receiver on the desk.
+#
+#   python tools/fake_onkyo.py [--port 60128] [--pty] [--response-ms 30] [--switch-ms 250]
+
+import argparse
+import asyncio
+import os
+import sys
+import tty
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "lib"))
+
+import transport  # noqa: E402
+from sim.receiver import ReceiverModel, split_commands, encode_reply  # noqa: E402
+
+BAUD = 9600
+
+
+class FakeOnkyo:
+    def __init__(self, model=None, response_ms=30, switch_ms=250):
+        self.model = model or ReceiverModel()
+        self.response_ms = response_ms
+        self.switch_ms = switch_ms
+        self.outputs = []   # one send(message) function per connection
+        self.queue = None
+        self.connections = 0
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        return asyncio.get_running_loop().create_task(self._worker())
+
+    # Commands are handled one at a time, in order, like on the receiver.
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await self.queue.get()
+            await asyncio.sleep(self.model.busy_ms(command, self.response_ms, self.switch_ms) / 1000)
+            for message in self.model.execute(command, int(loop.time() * 1e9)):
+                self.announce(message)
+
+    # Send a status message on every connection without being asked, like the receiver does
+    # when someone turns a knob on the front panel.
+    def announce(self, message):
+        for send in list(self.outputs):
+            send(message)
+
+    def received(self, pending, data):
+        for command in split_commands(pending, data):
+            self.queue.put_nowait(command)
+
+    async def serve_tcp(self, host="127.0.0.1", port=60128):
+        return await asyncio.start_server(self._client, host, port)
+
+    async def _client(self, reader, writer):
+        self.connections += 1
+        eiscp = transport.EiscpReader()
+        pending = bytearray()
+
+        def send(message):
+            reply = encode_reply(message)
+            writer.write(transport.eiscp_header(len(reply)) + reply)
+
+        self.outputs.append(send)
+        try:
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                payload = bytearray(len(data))
+                count = eiscp.unwrap(data, len(data), payload)
+                if count < 0:
+                    break
+                self.received(pending, payload[:count])
+        except ConnectionError:
+            pass
+        finally:
+            self.outputs.remove(send)
+            writer.close()
+
+    # Opens a pseudo-terminal and returns the path of its far end, which behaves like the
+    # receiver's serial port: raw bytes in both directions and replies paced at 9600 baud.
+    def serve_pty(self):
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        pending = bytearray()
+        out = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        def readable():
+            try:
+                data = os.read(master, 1024)
+            except BlockingIOError:
+                return
+            self.received(pending, data)
+
+        async def writer():
+            byte_s = 10 / BAUD   # start bit, 8 data bits, stop bit
+            while True:
+                reply = await out.get()
+                for i in range(0, len(reply), 8):
+                    piece = reply[i:i + 8]
+                    await asyncio.sleep(len(piece) * byte_s)
+                    os.write(master, piece)
+
+        loop.add_reader(master, readable)
+        self.outputs.append(lambda message: out.put_nowait(encode_reply(message)))
+        self._pty_writer = loop.create_task(writer())
+        # Keep the slave open so the pty doesn't hang up between clients.
+        self._pty_fds = (master, slave)
+        return os.ttyname(slave)
+
+
+async def main(args):
+    onkyo = FakeOnkyo(ReceiverModel(power=not args.standby), args.response_ms, args.switch_ms)
+    onkyo.start()
+    server = await onkyo.serve_tcp(args.host, args.port)
+    print("eISCP on {}:{}".format(args.host, args.port))
+    if args.pty:
+        print("ISCP serial on", onkyo.serve_pty())
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Onkyo receiver for trying things without one.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=60128)
+    parser.add_argument("--pty", action="store_true", help="also serve serial ISCP on a pty")
+    parser.add_argument("--standby", action="store_true", help="start with the power off")
+    parser.add_argument("--response-ms", type=int, default=30)
+    parser.add_argument("--switch-ms", type=int, default=250)
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
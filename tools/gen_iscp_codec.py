@@ -0,0 +1,408 @@
+# Generate lib/iscp_codec.py, a complete ISCP command encoder/decoder, from the ISCP
+# spreadsheets in the datasheets folder.
+#
+# The spreadsheets list every command code (PWR, SLI, MVL, ...) with the parameters it
+# takes, either as literal values ("00", "QSTN"), ranges ("00"-"64") or free-form patterns
+# ("Bxx"). The generated module packs all of that into a handful of bytes objects: the
+# command codes are one sorted 3-bytes-per-code string, and each command's parameters are
+# sorted entries in a single blob with a table of offsets. Lookups are binary searches
+# straight over those bytes, so the whole table is a handful of objects on the M4 (and stays
+# in flash as a frozen .mpy) and finding a code allocates nothing, instead of a dict of
+# strings that would eat the heap.
+#
+#   python tools/gen_iscp_codec.py [--no-text] [--out lib/iscp_codec.py] [spreadsheet ...]
+#
+# By default it reads both spreadsheets in the datasheets folder. The 1.34 sheet comes
+# first and wins for every code it has, and the 1.18 sheet adds the older commands it
+# dropped (mostly for RI-linked gear like CD players, tape decks and iPod docks).
+# Spreadsheets given on the command line are merged the same way, first one first.
+#
+# With the parameter descriptions the tables come to about 48 kB. --no-text leaves them
+# out, which brings it down to about 18 kB, and decode() then returns empty descriptions.
+#
+# .xlsx files are read with the standard library. The older .xls files need xlrd
+# (pip install xlrd).
+
+import argparse
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCES = (os.path.join(REPO_DIR, "datasheets", "ISCP_AVR_134.xlsx"),
+                   os.path.join(REPO_DIR, "datasheets", "ISCP_AVR_118.xls"))
+DEFAULT_TARGET = os.path.join(REPO_DIR, "lib", "iscp_codec.py")
+
+# Command sheets to read, in order. If a code shows up on more than one sheet, the first
+# one wins.
+COMMAND_SHEETS = ("CMND(MAIN)", "CMND(ZONE2)", "CMND(ZONE3)", "CMND(ZONE4)", "CMND(NET USB)")
+
+# Longest parameter description kept in the table. Longer ones are cut at the last whole
+# word that fits.
+MAX_TEXT = 60
+
+# Entry kinds
+LITERAL = b"L"   # exact parameter, e.g. "QSTN"
+RANGE = b"R"     # "lo"-"hi", both the same width
+SIGNED = b"S"    # "-lo"-"0"-"+hi"
+PATTERN = b"P"   # anything else, e.g. "Bxx"
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_HEADER = re.compile(r'^\s*((?:"[A-Z0-9]{3}"\s*/?\s*)+)-?\s*(.*?)\s*$')
+_QUOTED = re.compile(r'"([^"]*)"')
+
+
+# Reading the spreadsheets. Both readers return {sheet name: [[column A, column B], ...]}.
+
+def read_xlsx(path, wanted):
+    z = zipfile.ZipFile(path)
+    strings = []
+    if "xl/sharedStrings.xml" in z.namelist():
+        for si in ET.fromstring(z.read("xl/sharedStrings.xml")):
+            strings.append("".join(t.text or "" for t in si.iter(_NS + "t")))
+    targets = {}
+    for rel in ET.fromstring(z.read("xl/_rels/workbook.xml.rels")):
+        targets[rel.get("Id")] = rel.get("Target")
+    sheets = {}
+    for sheet in ET.fromstring(z.read("xl/workbook.xml")).iter(_NS + "sheet"):
+        name = sheet.get("name")
+        if name not in wanted:
+            continue
+        rows = []
+        root = ET.fromstring(z.read("xl/" + targets[sheet.get(_REL)].lstrip("/")))
+        for row in root.iter(_NS + "row"):
+            cells = {}
+            for c in row.iter(_NS + "c"):
+                column = re.match(r"[A-Z]+", c.get("r")).group()
+                if column not in ("A", "B"):
+                    continue
+                v = c.find(_NS + "v")
+                if v is not None:
+                    cells[column] = strings[int(v.text)] if c.get("t") == "s" else v.text
+                elif c.find(_NS + "is") is not None:
+                    cells[column] = "".join(t.text or "" for t in c.find(_NS + "is").iter(_NS + "t"))
+            rows.append([cells.get("A", ""), cells.get("B", "")])
+        sheets[name] = rows
+    return sheets
+
+
+def read_xls(path, wanted):
+    try:
+        import xlrd
+    except ImportError:
+        sys.exit("reading .xls files needs xlrd (pip install xlrd)")
+    book = xlrd.open_workbook(path)
+    sheets = {}
+    for sheet in book.sheets():
+        if sheet.name in wanted:
+            sheets[sheet.name] = [[str(sheet.cell_value(r, c)) if c < sheet.ncols else ""
+                                   for c in (0, 1)] for r in range(sheet.nrows)]
+    return sheets
+
+
+# Turning rows into commands.
+
+def _clean(text):
+    text = text.replace("“", '"').replace("”", '"').replace("＂", '"')
+    return text.replace("~", "-").strip()
+
+
+def _ascii(text):
+    text = " ".join(text.split("\n")[0].split()).replace("–", "-")
+    text = text.encode("ascii", "replace").decode("ascii")
+    if len(text) > MAX_TEXT:
+        text = text[:MAX_TEXT + 1].rsplit(" ", 1)[0].rstrip(" (-,:;/")
+    return text
+
+
+def parse_entry(param):
+    quoted = _QUOTED.findall(param)
+    # Lower case letters are placeholders ("Bxx"), so those are patterns.
+    if re.fullmatch(r'"[\x21\x23-\x60\x7b-\x7e]+"', param):
+        return LITERAL, quoted[0].encode("ascii")
+    if re.fullmatch(r'"[0-9A-F]+"-"[0-9A-F]+"', param) and len(quoted[0]) == len(quoted[1]):
+        return RANGE, (quoted[0] + "-" + quoted[1]).encode("ascii")
+    if len(quoted) == 3 and quoted[0][:1] == "-" and quoted[2][:1] == "+":
+        return SIGNED, "-".join(quoted).encode("ascii")
+    return PATTERN, param.encode("ascii", "replace")
+
+
+def parse_commands(sheets, text=True):
+    commands = {}
+    for sheet in COMMAND_SHEETS:
+        current = []
+        for a, b in sheets.get(sheet, ()):
+            a = _clean(a)
+            header = _HEADER.match(a) if not b else None
+            if header:
+                codes = _QUOTED.findall(header.group(1))
+                name = _ascii(header.group(2)).replace(" Command", "").strip(" -") or codes[0]
+                current = []
+                for code in codes:
+                    if code not in commands:
+                        commands[code] = {"name": name, "entries": current}
+                continue
+            if not b or not a or a == "Code":
+                continue
+            kind, param = parse_entry(a)
+            entry = (kind, param, _ascii(b).encode("ascii") if text else b"")
+            if entry[:2] not in [e[:2] for e in current]:
+                current.append(entry)
+    return commands
+
+
+# Packing.
+
+def _offsets(values):
+    width = 2 if values[-1] < 0x10000 else 4
+    return width, b"".join(v.to_bytes(width, "little") for v in values)
+
+
+def pack(commands):
+    codes = sorted(commands)
+    names = []
+    entries = []
+    first = [0]
+    literal_counts = []
+    for code in codes:
+        command = commands[code]
+        names.append(command["name"].encode("ascii"))
+        literals = sorted((e for e in command["entries"] if e[0] == LITERAL), key=lambda e: e[1])
+        others = [e for e in command["entries"] if e[0] != LITERAL]
+        literal_counts.append(len(literals))
+        for kind, param, text in literals + others:
+            entries.append(kind + param + b"\0" + text)
+        first.append(len(entries))
+
+    name_at = [0]
+    for name in names:
+        name_at.append(name_at[-1] + len(name))
+    entry_at = [0]
+    for entry in entries:
+        entry_at.append(entry_at[-1] + len(entry))
+    entry_width, entry_offsets = _offsets(entry_at)
+    return {
+        "codes": "".join(codes).encode("ascii"),
+        "names": b"".join(names),
+        "name_at": _offsets(name_at)[1],
+        "entries": b"".join(entries),
+        "entry_at": entry_offsets,
+        "entry_width": entry_width,
+        "first": _offsets(first)[1],
+        "literals": bytes(literal_counts),
+        "count": len(codes),
+        "entry_count": len(entries),
+    }
+
+
+TEMPLATE = '''# Generated by tools/gen_iscp_codec.py from {source}.
+# Don't edit by hand.
+#
+# Every ISCP command in the spreadsheets, packed into a handful of bytes objects instead of
+# thousands of strings. Look up a code with find(), describe a status message with
+# decode() and build a command with encode(). Code and literal parameter lookups are
+# binary searches straight over the bytes and don't allocate.
+#
+#   >>> iscp_codec.decode(b"1PWR01")
+#   ('System Power', 'sets System On')
+#   >>> iscp_codec.encode(b"SLI", b"2B")
+#   b'!1SLI2B\\r'
+
+COUNT = {count}
+
+# Command codes, 3 bytes each, sorted
+CODES = {codes!r}
+
+# Command names and their offsets (16-bit little endian, COUNT + 1 of them)
+NAMES = {names!r}
+NAME_AT = {name_at!r}
+
+# Parameter entries: kind ({literal!r} literal, {range!r} range, {signed!r} signed
+# range, {pattern!r} pattern), the parameter, a zero byte and the description. Command i's
+# entries run from FIRST[i] to FIRST[i + 1] (16-bit), with its LITERALS[i] literal
+# parameters first, sorted.
+ENTRIES = {entries!r}
+ENTRY_AT = {entry_at!r}
+_ENTRY_WIDTH = {entry_width}
+FIRST = {first!r}
+LITERALS = {literals!r}
+
+
+def _u16(table, i):
+    return table[2 * i] | (table[2 * i + 1] << 8)
+
+
+def _entry_at(i):
+    if _ENTRY_WIDTH == 2:
+        return _u16(ENTRY_AT, i)
+    i *= 4
+    return ENTRY_AT[i] | (ENTRY_AT[i + 1] << 8) | (ENTRY_AT[i + 2] << 16) | (ENTRY_AT[i + 3] << 24)
+
+
+# Compare data[i:j] with the parameter of entry e: <0, 0 or >0.
+def _compare(e, data, i, j):
+    k = _entry_at(e) + 1
+    while True:
+        a = ENTRIES[k]
+        if a == 0:
+            return 0 if i == j else 1
+        if i == j:
+            return -1
+        if data[i] != a:
+            return data[i] - a
+        i += 1
+        k += 1
+
+
+# Index of the 3-letter command code at data[i:], or -1.
+def find(data, i=0):
+    key = (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+    lo = 0
+    hi = COUNT
+    while lo < hi:
+        mid = (lo + hi) // 2
+        k = mid * 3
+        code = (CODES[k] << 16) | (CODES[k + 1] << 8) | CODES[k + 2]
+        if code == key:
+            return mid
+        if code < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return -1
+
+
+def name(index):
+    return NAMES[_u16(NAME_AT, index):_u16(NAME_AT, index + 1)].decode()
+
+
+def code(index):
+    return CODES[index * 3:index * 3 + 3]
+
+
+# Does data[i:j] (same width, digits or capital hex) fall between the two bounds?
+def _between(data, i, j, low, high):
+    if j - i != len(low):
+        return False
+    ge = le = True
+    for k in range(j - i):
+        c = data[i + k]
+        if ge and c != low[k]:
+            if c < low[k]:
+                return False
+            ge = False
+        if le and c != high[k]:
+            if c > high[k]:
+                return False
+            le = False
+    return True
+
+
+# Entry index for the parameter data[i:j] of command index, or -1 if the spreadsheet
+# doesn't allow it. Literals are found with a binary search, then ranges and patterns are
+# checked in order.
+def find_param(index, data, i, j):
+    first = _u16(FIRST, index)
+    lo = first
+    hi = first + LITERALS[index]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        c = _compare(mid, data, i, j)
+        if c == 0:
+            return mid
+        if c < 0:
+            hi = mid
+        else:
+            lo = mid + 1
+    for e in range(first + LITERALS[index], _u16(FIRST, index + 1)):
+        start = _entry_at(e)
+        kind = ENTRIES[start]
+        if kind == 0x50:   # pattern: can't check it, so take it
+            return e
+        bounds = ENTRIES[start + 1:ENTRIES.index(b"\\0", start)].split(b"-")
+        if kind == 0x52 and _between(data, i, j, bounds[0], bounds[1]):
+            return e
+        if kind == 0x53 and j > i:
+            # bounds are b"", b"1E", b"000", b"+18" for "-1E"-"000"-"+18"
+            if data[i] == 0x2D and _between(data, i + 1, j, b"0" * len(bounds[1]), bounds[1]):
+                return e
+            if data[i] == 0x2B and _between(data, i + 1, j, b"0" * (len(bounds[3]) - 1), bounds[3][1:]):
+                return e
+            if _between(data, i, j, bounds[2], bounds[2]):
+                return e
+    return -1
+
+
+# Parameter and description of an entry.
+def param(entry):
+    start = _entry_at(entry)
+    end = ENTRIES.index(b"\\0", start)
+    return ENTRIES[start + 1:end], ENTRIES[end + 1:_entry_at(entry + 1)].decode()
+
+
+# (command name, parameter description) for a status message like b"1MVL28", with None
+# for the description if the parameter isn't in the spreadsheet. None if the command isn't.
+def decode(frame):
+    if len(frame) < 4:
+        return None
+    index = find(frame, 1)
+    if index < 0:
+        return None
+    entry = find_param(index, frame, 4, len(frame))
+    return name(index), (param(entry)[1] if entry >= 0 else None)
+
+
+# Complete command ready for the UART, e.g. encode(b"MVL", b"28") == b"!1MVL28\\r".
+# Raises ValueError if the spreadsheet doesn't have the command or the parameter.
+def encode(code, parameter):
+    index = find(code)
+    if index < 0:
+        raise ValueError("unknown ISCP command")
+    if find_param(index, parameter, 0, len(parameter)) < 0:
+        raise ValueError("bad parameter for " + name(index))
+    return b"!1" + bytes(code) + bytes(parameter) + b"\\r"
+'''
+
+
+def render(packed, source):
+    return TEMPLATE.format(source=source, literal=LITERAL, range=RANGE, signed=SIGNED,
+                           pattern=PATTERN, **packed)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Generate lib/iscp_codec.py from the ISCP "
+                                                 "spreadsheets.")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES,
+                        help="ISCP spreadsheets (.xlsx, or .xls with xlrd), newest first")
+    parser.add_argument("--out", default=DEFAULT_TARGET)
+    parser.add_argument("--no-text", action="store_true",
+                        help="leave out the parameter descriptions to save RAM")
+    args = parser.parse_args(argv)
+    target = args.out
+    text = not args.no_text
+    commands = {}
+    for source in args.sources:
+        reader = read_xls if source.lower().endswith(".xls") else read_xlsx
+        found = parse_commands(reader(source, COMMAND_SHEETS), text)
+        if not found:
+            sys.exit("no commands found in " + source)
+        added = 0
+        for code, command in found.items():
+            if code not in commands:
+                commands[code] = command
+                added += 1
+        print("{}: {} commands, {} new".format(os.path.basename(source), len(found), added))
+    packed = pack(commands)
+    with open(target, "w") as f:
+        f.write(render(packed, " and ".join(os.path.basename(source) for source in args.sources)))
+    size = sum(len(packed[k]) for k in ("codes", "names", "name_at", "entries", "entry_at",
+                                        "first", "literals"))
+    print("wrote {}: {} commands, {} parameters, {} bytes of tables".format(
+        target, packed["count"], packed["entry_count"], size))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,255 @@
+# Share one link to the receiver between any number of network clients.
+#
+# The receiver only has the one serial port, and whatever is plugged into it is the only
+# thing that can see its status messages. This daemon runs on a computer that owns the link
+# (a serial port, or the receiver's own eISCP port) and lets phone apps, home automation and
+# anything else connect to it over TCP instead:
+#
+#  * Every status message from the receiver is parsed once with the keypad's FrameParser,
+#    encoded once, and written to every client.
+#  * Commands from all the clients go through one TxQueue, the same one the keypad uses, so
+#    they're merged and paced the way the receiver likes instead of piling up on it.
+#  * Queries are answered from the last status message seen for that command when there is
+#    one, without bothering the receiver.
+#
+# Clients speak eISCP on --port (60128, same as the receiver, so existing apps work) or plain
+# ISCP on --raw-port, e.g. "printf '!1SLI12\r' | nc localhost 60129".
+#
+#   python tools/iscp_bridge.py --serial /dev/ttyUSB0
+#   python tools/iscp_bridge.py --eiscp 192.168.1.20
+
+import argparse
+import asyncio
+import os
+import sys
+import termios
+import time
+import tty
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "lib"))
+
+import iscp  # noqa: E402
+import transport  # noqa: E402
+
+QSTN = b"QSTN"
+
+
+# The receiver's serial port. on_data(buf, n) gets whatever arrives, and on_reset() is
+# called if the link had to be reopened.
+class SerialUpstream:
+    def __init__(self, path, baud=9600):
+        self.path = path
+        self.baud = baud
+        self.fd = None
+        self.buf = bytearray(256)
+
+    async def open(self, on_data, on_reset=None):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        tty.setraw(self.fd)
+        speed = getattr(termios, "B%d" % self.baud)
+        attrs = termios.tcgetattr(self.fd)
+        attrs[4] = attrs[5] = speed
+        termios.tcsetattr(self.fd, termios.TCSANOW, attrs)
+
+        def readable():
+            try:
+                n = os.readv(self.fd, [self.buf])
+            except BlockingIOError:
+                return
+            if n:
+                on_data(self.buf, n)
+
+        asyncio.get_running_loop().add_reader(self.fd, readable)
+
+    def write(self, frame):
+        os.write(self.fd, frame)
+
+
+# The receiver's eISCP port. Reconnects every reconnect_s if the connection drops.
+class EiscpUpstream:
+    def __init__(self, host, port=transport.EISCP_PORT, reconnect_s=5.0):
+        self.host = host
+        self.port = port
+        self.reconnect_s = reconnect_s
+        self.writer = None
+        self.reconnects = 0
+
+    async def open(self, on_data, on_reset=None):
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        asyncio.get_running_loop().create_task(self._read(reader, on_data, on_reset))
+
+    async def _read(self, reader, on_data, on_reset):
+        eiscp = transport.EiscpReader()
+        buf = bytearray(4096)
+        while True:
+            data = await reader.read(len(buf))
+            n = eiscp.unwrap(data, len(data), buf) if data else -1
+            if n < 0:
+                self.writer.close()
+                self.writer = None
+                while self.writer is None:
+                    await asyncio.sleep(self.reconnect_s)
+                    try:
+                        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+                    except OSError:
+                        continue
+                self.reconnects += 1
+                eiscp.reset()
+                if on_reset is not None:
+                    on_reset()
+            elif n:
+                on_data(buf, n)
+
+    def write(self, frame):
+        if self.writer is not None:
+            self.writer.write(transport.eiscp_header(len(frame)) + frame)
+
+
+class Client:
+    def __init__(self, bridge, writer, eiscp):
+        self.bridge = bridge
+        self.writer = writer
+        self.eiscp = transport.EiscpReader() if eiscp else None
+        self.parser = iscp.FrameParser()
+
+    def send(self, raw, wrapped):
+        self.writer.write(wrapped if self.eiscp is not None else raw)
+
+    async def run(self, reader):
+        buf = bytearray(4096)
+        while True:
+            data = await reader.read(len(buf))
+            if not data:
+                return
+            if self.eiscp is None:
+                self.parser.feed(data, len(data), self.command)
+                continue
+            n = self.eiscp.unwrap(data, len(data), buf)
+            if n < 0:
+                return
+            self.parser.feed(buf, n, self.command)
+
+    # A command from this client, e.g. b"1SLI12" or b"1PWRQSTN".
+    def command(self, frame):
+        bridge = self.bridge
+        bridge.commands += 1
+        query = frame[4:] == QSTN
+        if query:
+            cached = bridge.cache.get(iscp.code_key(frame, 1))
+            if cached is not None:
+                bridge.cache_hits += 1
+                self.send(*cached)
+                return
+        bridge.tx_queue.put(b"!" + bytes(frame) + b"\r", urgent=not query)
+
+
+class Bridge:
+    def __init__(self, upstream, gap_ms=50, ack_timeout_ms=500, queue_size=32,
+                 max_backlog=65536):
+        self.upstream = upstream
+        self.max_backlog = max_backlog
+        self.clients = []
+        # Last status message for each 3-letter code, as (raw, eISCP) ready to send.
+        self.cache = {}
+        self.parser = iscp.FrameParser()
+        self.tx_event = asyncio.Event()
+        self.tx_queue = iscp.TxQueue(upstream, size=queue_size, gap_ms=gap_ms,
+                                     ack_timeout_ms=ack_timeout_ms, on_ready=self.tx_event.set)
+        self.frames = 0
+        self.commands = 0
+        self.cache_hits = 0
+        self.clients_dropped = 0
+
+    async def start(self, host="0.0.0.0", port=transport.EISCP_PORT, raw_port=None):
+        await self.upstream.open(self.received, self.reset)
+        servers = [await asyncio.start_server(self._serve_eiscp, host, port)]
+        if raw_port is not None:
+            servers.append(await asyncio.start_server(self._serve_raw, host, raw_port))
+        asyncio.get_running_loop().create_task(self._tx())
+        return servers
+
+    # Whatever the receiver did while the link was down, the cached answers can't be trusted.
+    def reset(self):
+        self.cache.clear()
+        self.parser.reset()
+
+    def received(self, buf, n):
+        self.parser.feed(buf, n, self._status)
+
+    # A status message from the receiver, e.g. b"1SLI12".
+    def _status(self, frame):
+        self.frames += 1
+        self.tx_queue.acknowledge(frame)
+        raw = b"!" + bytes(frame) + b"\x1a\r\n"
+        message = (raw, transport.eiscp_header(len(raw)) + raw)
+        self.cache[iscp.code_key(frame, 1)] = message
+        for client in self.clients:
+            # A client that stops reading would have the messages pile up here forever.
+            if client.writer.transport.get_write_buffer_size() > self.max_backlog:
+                self.clients_dropped += 1
+                client.writer.transport.abort()
+                continue
+            client.send(*message)
+
+    async def _serve_eiscp(self, reader, writer):
+        await self._serve(reader, writer, True)
+
+    async def _serve_raw(self, reader, writer):
+        await self._serve(reader, writer, False)
+
+    async def _serve(self, reader, writer, eiscp):
+        client = Client(self, writer, eiscp)
+        self.clients.append(client)
+        try:
+            await client.run(reader)
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.remove(client)
+            writer.close()
+
+    # Send queued commands as the receiver is ready for them. An acknowledgement wakes this
+    # up early.
+    async def _tx(self):
+        queue = self.tx_queue
+        while True:
+            self.tx_event.clear()
+            delay_ns = queue.service(time.monotonic_ns())
+            if not queue:
+                await self.tx_event.wait()
+            elif delay_ns:
+                try:
+                    await asyncio.wait_for(self.tx_event.wait(), delay_ns / 1000000000)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def main(args):
+    if args.serial:
+        upstream = SerialUpstream(args.serial, args.baud)
+    else:
+        upstream = EiscpUpstream(args.eiscp, args.eiscp_port)
+    bridge = Bridge(upstream, gap_ms=args.gap_ms)
+    servers = await bridge.start(args.host, args.port, args.raw_port)
+    print("bridging {} to eISCP port {}{}".format(
+        args.serial or args.eiscp, args.port,
+        "" if args.raw_port is None else " and ISCP port {}".format(args.raw_port)))
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share one receiver link with many clients.")
+    link = parser.add_mutually_exclusive_group(required=True)
+    link.add_argument("--serial", help="serial port the receiver is on")
+    link.add_argument("--eiscp", help="receiver's network address")
+    parser.add_argument("--eiscp-port", type=int, default=transport.EISCP_PORT)
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=transport.EISCP_PORT)
+    parser.add_argument("--raw-port", type=int, default=None)
+    parser.add_argument("--gap-ms", type=int, default=50)
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass